@@ -0,0 +1,60 @@
+"""Add user directory for hash-sharded users
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: str | None = '0002'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def on_user_shard() -> bool:
+    """Whether this run migrates a user shard, which has no user directory."""
+    return bool(context.config.attributes.get('user_shard'))
+
+
+def upgrade() -> None:
+    if on_user_shard():
+        return
+    op.create_table(
+        'user_directory',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_user_directory_email'), 'user_directory', ['email'], unique=True)
+    op.create_index(
+        op.f('ix_user_directory_username'), 'user_directory', ['username'], unique=True
+    )
+
+    # Seed the directory with existing users so their IDs stay reserved.
+    # Nothing keeps it current until sharding is on: the cut-over
+    # (src.presentation.cli.rebalance_users) rebuilds it from all users
+    op.execute(
+        'INSERT INTO user_directory (id, email, username) '
+        'SELECT id, email, username FROM users'
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "SELECT setval(pg_get_serial_sequence('user_directory', 'id'), "
+            "COALESCE((SELECT MAX(id) FROM user_directory), 0) + 1, false)"
+        )
+
+
+def downgrade() -> None:
+    if on_user_shard():
+        return
+    op.drop_index(op.f('ix_user_directory_username'), table_name='user_directory')
+    op.drop_index(op.f('ix_user_directory_email'), table_name='user_directory')
+    op.drop_table('user_directory')
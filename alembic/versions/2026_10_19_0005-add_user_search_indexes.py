@@ -0,0 +1,83 @@
+"""Add prefix and trigram search indexes on email and username
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: str | None = '0004'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COLUMNS = ('email', 'username')
+
+
+def tables() -> tuple[str, ...]:
+    """Tables to index; user shards have no user directory."""
+    if context.config.attributes.get('user_shard'):
+        return ('users',)
+    return ('users', 'user_directory')
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        # Build without blocking writes on large tables
+        with op.get_context().autocommit_block():
+            for table in tables():
+                for column in COLUMNS:
+                    op.create_index(
+                        f'ix_{table}_{column}_prefix',
+                        table,
+                        [sa.text(f'lower({column}) text_pattern_ops')],
+                        postgresql_concurrently=True,
+                        if_not_exists=True,
+                    )
+                    op.create_index(
+                        f'ix_{table}_{column}_trgm',
+                        table,
+                        [column],
+                        postgresql_using='gin',
+                        postgresql_ops={column: 'gin_trgm_ops'},
+                        postgresql_concurrently=True,
+                        if_not_exists=True,
+                    )
+    elif dialect == 'sqlite':
+        # No trigram indexes: NOCASE indexes serve case-insensitive prefix LIKE
+        for table in tables():
+            for column in COLUMNS:
+                op.create_index(
+                    f'ix_{table}_{column}_nocase',
+                    table,
+                    [sa.text(f'{column} COLLATE NOCASE')],
+                )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            for table in tables():
+                for column in COLUMNS:
+                    for kind in ('prefix', 'trgm'):
+                        op.drop_index(
+                            f'ix_{table}_{column}_{kind}',
+                            table_name=table,
+                            postgresql_concurrently=True,
+                            if_exists=True,
+                        )
+    elif dialect == 'sqlite':
+        for table in tables():
+            for column in COLUMNS:
+                op.drop_index(f'ix_{table}_{column}_nocase', table_name=table)
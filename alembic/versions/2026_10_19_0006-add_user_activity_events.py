@@ -0,0 +1,59 @@
+"""Add users.last_login_at and the user activity event log
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: str | None = '0005'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def on_user_shard() -> bool:
+    """Whether this run migrates a user shard, which has no activity log."""
+    return bool(context.config.attributes.get('user_shard'))
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('last_login_at', sa.DateTime(), nullable=True))
+    if on_user_shard():
+        return
+
+    op.create_table(
+        'user_activity_events',
+        sa.Column(
+            'id',
+            sa.BigInteger().with_variant(sa.Integer(), 'sqlite'),
+            autoincrement=True,
+            nullable=False,
+        ),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('event_type', sa.String(length=20), nullable=False),
+        sa.Column('client_ip', sa.String(length=45), nullable=True),
+        sa.Column('occurred_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_user_activity_events_user_id_occurred_at',
+        'user_activity_events',
+        ['user_id', 'occurred_at'],
+    )
+
+
+def downgrade() -> None:
+    if not on_user_shard():
+        op.drop_index(
+            'ix_user_activity_events_user_id_occurred_at', table_name='user_activity_events'
+        )
+        op.drop_table('user_activity_events')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('last_login_at')
@@ -1,17 +1,40 @@
 """Data Transfer Objects for application layer."""
 
+from src.application.dto.activity import ActivityEventDTO, ActivityEventType
+from src.application.dto.login_throttle import LoginAttemptDTO
 from src.application.dto.math import (
     PrimesListRequestDTO,
     PrimesListResponseDTO,
 )
-from src.application.dto.token import TokenDTO, TokenPayloadDTO
-from src.application.dto.user import UserCreateDTO, UserResponseDTO
+from src.application.dto.token import TokenDTO, TokenIntrospectionDTO, TokenPayloadDTO
+from src.application.dto.user import (
+    AvailabilityDTO,
+    UserCreateDTO,
+    UserCredentialsDTO,
+    UserImportErrorDTO,
+    UserImportProgressDTO,
+    UserImportResultDTO,
+    UserImportRowDTO,
+    UserPageDTO,
+    UserResponseDTO,
+)
 
 __all__ = [
     "UserCreateDTO",
     "UserResponseDTO",
+    "UserCredentialsDTO",
+    "UserPageDTO",
+    "UserImportRowDTO",
+    "UserImportErrorDTO",
+    "UserImportProgressDTO",
+    "UserImportResultDTO",
+    "AvailabilityDTO",
     "TokenDTO",
     "TokenPayloadDTO",
+    "TokenIntrospectionDTO",
     "PrimesListRequestDTO",
     "PrimesListResponseDTO",
+    "ActivityEventDTO",
+    "ActivityEventType",
+    "LoginAttemptDTO",
 ]
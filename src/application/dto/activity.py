@@ -0,0 +1,23 @@
+"""Activity-related Data Transfer Objects."""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
+
+
+class ActivityEventType(StrEnum):
+    """Kinds of account activity that are logged."""
+
+    REGISTER = "register"
+    LOGIN = "login"
+    REFRESH = "refresh"
+
+
+@dataclass(frozen=True)
+class ActivityEventDTO:
+    """DTO for one account activity event."""
+
+    user_id: int
+    type: ActivityEventType
+    client_ip: str | None = None
+    occurred_at: datetime = field(default_factory=datetime.utcnow)
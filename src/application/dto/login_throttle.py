@@ -0,0 +1,11 @@
+"""Login throttle Data Transfer Objects."""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class LoginAttemptDTO:
+    """DTO for the throttle's answer to one login attempt."""
+
+    attempt_id: str  # Identifies the counted attempt, to take it back later
+    retry_after: int | None = None  # Seconds to wait if throttled (then not counted)
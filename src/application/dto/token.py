@@ -18,4 +18,19 @@ class TokenPayloadDTO:
     sub: int  # user id
     exp: int  # expiration timestamp
     type: str  # "access" or "refresh"
+    jti: str | None = None  # unique token id
+    family: str | None = None  # id shared by all tokens rotated from one login
+    iat: int | None = None  # issued-at timestamp
 
+
+@dataclass(frozen=True)
+class TokenIntrospectionDTO:
+    """DTO for the introspection result of a single token."""
+
+    active: bool
+    sub: int | None = None
+    exp: int | None = None
+    type: str | None = None
+    username: str | None = None
+    email: str | None = None
+    error: str | None = None
@@ -22,3 +22,65 @@ class UserResponseDTO:
     username: str
     created_at: datetime
 
+
+@dataclass(frozen=True)
+class UserPageDTO:
+    """DTO for one page of a keyset-paginated user listing."""
+
+    items: list[UserResponseDTO]
+    next_cursor: str | None  # opaque; None on the last page
+
+
+@dataclass(frozen=True)
+class UserCredentialsDTO:
+    """DTO with just the fields needed to authenticate a user."""
+
+    id: int
+    email: str
+    hashed_password: str
+
+
+@dataclass(frozen=True)
+class UserImportRowDTO:
+    """DTO for one user of a bulk import; exactly one password field is set."""
+
+    row: int  # 1-based position in the import source
+    email: str
+    username: str
+    password: str | None = None
+    hashed_password: str | None = None  # bcrypt hash, stored as is
+
+
+@dataclass(frozen=True)
+class UserImportErrorDTO:
+    """DTO for a row a bulk import rejected."""
+
+    row: int
+    email: str | None
+    error: str
+
+
+@dataclass(frozen=True)
+class UserImportProgressDTO:
+    """DTO reporting a bulk import after each committed batch."""
+
+    batches: int
+    imported: int  # Users created so far
+    skipped: int  # Rows rejected so far, excluding those invalid before hashing
+    last_row: int  # Highest row number handled so far
+
+
+@dataclass(frozen=True)
+class UserImportResultDTO:
+    """DTO summarizing a bulk import."""
+
+    imported: int
+    errors: list[UserImportErrorDTO]
+
+
+@dataclass(frozen=True)
+class AvailabilityDTO:
+    """DTO for an availability check; None for fields that were not asked about."""
+
+    email: bool | None = None
+    username: bool | None = None
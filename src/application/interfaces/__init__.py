@@ -1,8 +1,20 @@
 """Interfaces (abstractions) for infrastructure services."""
 
+from src.application.interfaces.activity_log import IActivityLog
+from src.application.interfaces.availability_filter import IAvailabilityFilter
+from src.application.interfaces.login_throttle import ILoginThrottle
 from src.application.interfaces.password_hasher import IPasswordHasher
+from src.application.interfaces.token_denylist import ITokenDenylist
 from src.application.interfaces.token_service import ITokenService
 from src.application.interfaces.user_repository import IUserRepository
 
-__all__ = ["IUserRepository", "ITokenService", "IPasswordHasher"]
+__all__ = [
+    "IUserRepository",
+    "ITokenService",
+    "ITokenDenylist",
+    "IPasswordHasher",
+    "ILoginThrottle",
+    "IActivityLog",
+    "IAvailabilityFilter",
+]
 
@@ -0,0 +1,22 @@
+"""Activity log interface."""
+
+from abc import ABC, abstractmethod
+
+from src.application.dto.activity import ActivityEventDTO
+
+
+class IActivityLog(ABC):
+    """Abstract interface for recording account activity."""
+
+    @abstractmethod
+    def record(self, event: ActivityEventDTO) -> None:
+        """
+        Record an activity event without waiting for it to be stored.
+
+        Implementations may persist events later and drop them under
+        overload; recording must never fail the caller's operation.
+
+        Args:
+            event: Event to record
+        """
+        ...
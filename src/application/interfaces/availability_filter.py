@@ -0,0 +1,42 @@
+"""Availability filter interface."""
+
+from abc import ABC, abstractmethod
+
+
+class IAvailabilityFilter(ABC):
+    """Abstract interface for a probabilistic set of taken emails and usernames."""
+
+    @abstractmethod
+    def might_be_taken(self, field: str, value: str) -> bool:
+        """
+        Check whether a value may already be in use.
+
+        Args:
+            field: "email" or "username"
+            value: Value to check
+
+        Returns:
+            False only if the value is certainly free; True if it may be taken
+        """
+        ...
+
+    @abstractmethod
+    async def add(self, email: str, username: str) -> None:
+        """
+        Mark the email and username of a new user as taken.
+
+        Args:
+            email: Email of the new user
+            username: Username of the new user
+        """
+        ...
+
+    @abstractmethod
+    async def add_many(self, users: list[tuple[str, str]]) -> None:
+        """
+        Mark the emails and usernames of many new users as taken.
+
+        Args:
+            users: (email, username) pairs
+        """
+        ...
@@ -0,0 +1,41 @@
+"""Login throttle interface."""
+
+from abc import ABC, abstractmethod
+
+from src.application.dto.login_throttle import LoginAttemptDTO
+
+
+class ILoginThrottle(ABC):
+    """Abstract interface for rate limiting failed login attempts."""
+
+    @abstractmethod
+    async def attempt(self, account: str, client_ip: str | None) -> LoginAttemptDTO:
+        """
+        Count a login attempt as failed unless throttled, in one atomic step.
+
+        Attempts are counted before the password is checked, so concurrent
+        attempts cannot all pass the limit before any failure is recorded.
+        A successful attempt is uncounted again by ``reset``.
+
+        Args:
+            account: Account identifier being logged into (email)
+            client_ip: Address the attempt comes from, if known
+
+        Returns:
+            The attempt's ID and, if throttled, the seconds to wait before
+            retrying (the attempt is then not counted)
+        """
+        ...
+
+    @abstractmethod
+    async def reset(self, account: str, client_ip: str | None, attempt_id: str) -> None:
+        """
+        Clear failed attempts for an account after a successful login.
+
+        Args:
+            account: Account identifier (email)
+            client_ip: Address the attempt came from
+            attempt_id: ID of the successful attempt, taken back from the
+                client's count; concurrent attempts stay counted
+        """
+        ...
@@ -33,3 +33,28 @@ class IPasswordHasher(ABC):
         """
         ...
 
+    @abstractmethod
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """
+        Hash many plain text passwords in parallel.
+
+        Args:
+            passwords: Plain text passwords
+
+        Returns:
+            Hashed password strings, in input order
+        """
+        ...
+
+    @abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Check whether a stored hash should be upgraded to current parameters.
+
+        Args:
+            hashed_password: Previously hashed password
+
+        Returns:
+            True if the hash was made with outdated parameters, False otherwise
+        """
+        ...
@@ -0,0 +1,34 @@
+"""Token denylist interface."""
+
+from abc import ABC, abstractmethod
+
+
+class ITokenDenylist(ABC):
+    """Abstract interface for revoked token and token family storage."""
+
+    @abstractmethod
+    async def is_revoked(self, *token_ids: str | None) -> bool:
+        """
+        Check whether any of the given token or family IDs is revoked.
+
+        Args:
+            token_ids: Token IDs (jti) or family IDs; None values are ignored
+
+        Returns:
+            True if any ID is revoked, False otherwise
+        """
+        ...
+
+    @abstractmethod
+    async def revoke(self, token_id: str, expires_at: int) -> bool:
+        """
+        Revoke a token or family ID until it would have expired anyway.
+
+        Args:
+            token_id: Token ID (jti) or family ID
+            expires_at: Unix timestamp after which the entry can be dropped
+
+        Returns:
+            True if the ID was newly revoked, False if it already was
+        """
+        ...
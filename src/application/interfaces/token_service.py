@@ -9,12 +9,13 @@ class ITokenService(ABC):
     """Abstract interface for JWT token operations."""
 
     @abstractmethod
-    def create_access_token(self, user_id: int) -> str:
+    def create_access_token(self, user_id: int, family: str | None = None) -> str:
         """
         Create an access token for a user.
 
         Args:
             user_id: The user's unique identifier
+            family: Token family to join; a new one is started if omitted
 
         Returns:
             Encoded JWT access token
@@ -22,12 +23,13 @@ class ITokenService(ABC):
         ...
 
     @abstractmethod
-    def create_refresh_token(self, user_id: int) -> str:
+    def create_refresh_token(self, user_id: int, family: str | None = None) -> str:
         """
         Create a refresh token for a user.
 
         Args:
             user_id: The user's unique identifier
+            family: Token family to join; a new one is started if omitted
 
         Returns:
             Encoded JWT refresh token
@@ -35,18 +37,29 @@ class ITokenService(ABC):
         ...
 
     @abstractmethod
-    def create_token_pair(self, user_id: int) -> TokenDTO:
+    def create_token_pair(self, user_id: int, family: str | None = None) -> TokenDTO:
         """
         Create both access and refresh tokens for a user.
 
         Args:
             user_id: The user's unique identifier
+            family: Token family to continue (rotation); a new one is started if omitted
 
         Returns:
             TokenDTO containing both tokens
         """
         ...
 
+    @abstractmethod
+    def refresh_token_expires_at(self) -> int:
+        """
+        Get the expiry of a refresh token issued now.
+
+        Returns:
+            Unix timestamp no earlier than any existing refresh token's expiry
+        """
+        ...
+
     @abstractmethod
     def decode_token(self, token: str) -> TokenPayloadDTO:
         """
@@ -1,7 +1,10 @@
 """User repository interface."""
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from datetime import datetime
 
+from src.application.dto.user import UserCredentialsDTO, UserResponseDTO
 from src.domain.models.user import User
 
 
@@ -21,6 +24,36 @@ class IUserRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    async def create_unique(self, user: User) -> User:
+        """
+        Persist a new user in a single statement, rejecting duplicates.
+
+        Args:
+            user: User domain entity to persist
+
+        Returns:
+            The persisted user with its assigned ID
+
+        Raises:
+            UserAlreadyExistsError: If the email or username is already taken
+        """
+        ...
+
+    @abstractmethod
+    async def import_many(self, users: list[User]) -> set[str]:
+        """
+        Persist many new users at once, skipping those that already exist.
+
+        Args:
+            users: User domain entities with distinct emails and usernames
+
+        Returns:
+            Emails of the users that were inserted; a user whose email or
+            username is already taken is left out
+        """
+        ...
+
     @abstractmethod
     async def get_by_id(self, user_id: int) -> User | None:
         """
@@ -34,6 +67,19 @@ class IUserRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    async def get_many_by_ids(self, user_ids: list[int]) -> list[User]:
+        """
+        Retrieve all users with the given IDs in one query.
+
+        Args:
+            user_ids: The users' unique identifiers
+
+        Returns:
+            Users found, in no particular order; missing IDs are skipped
+        """
+        ...
+
     @abstractmethod
     async def get_by_email(self, email: str) -> User | None:
         """
@@ -60,6 +106,160 @@ class IUserRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    async def get_many_by_emails(self, emails: list[str]) -> list[User]:
+        """
+        Retrieve all users with the given emails in one query.
+
+        Args:
+            emails: Email addresses to look up
+
+        Returns:
+            Users found, in no particular order; missing emails are skipped
+        """
+        ...
+
+    @abstractmethod
+    async def get_many_by_usernames(self, usernames: list[str]) -> list[User]:
+        """
+        Retrieve all users with the given usernames in one query.
+
+        Args:
+            usernames: Usernames to look up
+
+        Returns:
+            Users found, in no particular order; missing usernames are skipped
+        """
+        ...
+
+    @abstractmethod
+    async def get_by_email_or_username(self, email: str, username: str) -> User | None:
+        """
+        Retrieve a user matching either the email or the username.
+
+        Args:
+            email: The email address to match
+            username: The username to match
+
+        Returns:
+            User if found, None otherwise
+        """
+        ...
+
+    @abstractmethod
+    async def get_profile_by_id(self, user_id: int) -> UserResponseDTO | None:
+        """
+        Retrieve only the public profile columns of a user.
+
+        Args:
+            user_id: The user's unique identifier
+
+        Returns:
+            Profile if found, None otherwise
+        """
+        ...
+
+    @abstractmethod
+    async def get_profiles_by_ids(self, user_ids: list[int]) -> list[UserResponseDTO]:
+        """
+        Retrieve the public profile columns of many users in one query.
+
+        Args:
+            user_ids: The users' unique identifiers
+
+        Returns:
+            Profiles found, in no particular order; missing IDs are skipped
+        """
+        ...
+
+    @abstractmethod
+    async def list_profiles(
+        self, limit: int, after: tuple[datetime, int] | None = None
+    ) -> list[UserResponseDTO]:
+        """
+        Retrieve one page of public profiles by keyset pagination.
+
+        Profiles are ordered by ``(created_at, id)``; the page starts right
+        after the given key, so its cost does not grow with the page number.
+
+        Args:
+            limit: Maximum number of profiles to return
+            after: ``(created_at, id)`` of the last profile of the previous page
+
+        Returns:
+            Up to ``limit`` profiles in key order
+        """
+        ...
+
+    @abstractmethod
+    async def search_profiles(self, query: str, limit: int) -> list[UserResponseDTO]:
+        """
+        Find users whose email or username starts with or contains a string.
+
+        Matching is case-insensitive. Prefix matches come first; substring
+        matches are only looked for with queries of at least three
+        characters, the shortest a trigram index can serve.
+
+        Args:
+            query: Text to look for
+            limit: Maximum number of profiles to return
+
+        Returns:
+            Up to ``limit`` profiles, prefix matches first, each group
+            ordered by username
+        """
+        ...
+
+    @abstractmethod
+    def stream_profiles(self, batch_size: int = 1000) -> AsyncIterator[UserResponseDTO]:
+        """
+        Iterate over all public profiles through a server-side cursor.
+
+        Rows are fetched ``batch_size`` at a time, so memory use does not
+        depend on the number of users.
+
+        Args:
+            batch_size: Rows fetched from the database per round-trip
+
+        Returns:
+            Async iterator over every profile
+        """
+        ...
+
+    @abstractmethod
+    async def get_credentials_by_email(self, email: str) -> UserCredentialsDTO | None:
+        """
+        Retrieve only the columns needed to authenticate a user.
+
+        Args:
+            email: The user's email address
+
+        Returns:
+            Credentials if found, None otherwise
+        """
+        ...
+
+    @abstractmethod
+    async def update_password(self, user_id: int, hashed_password: str) -> None:
+        """
+        Replace a user's stored password hash.
+
+        Args:
+            user_id: The user's unique identifier
+            hashed_password: New password hash
+        """
+        ...
+
+    @abstractmethod
+    async def update_last_login_many(self, last_logins: dict[int, datetime]) -> None:
+        """
+        Set the last login time of many users in one write.
+
+        Args:
+            last_logins: Login time by user ID; unknown IDs are ignored
+        """
+        ...
+
     @abstractmethod
     async def update(self, user: User) -> User:
         """
@@ -70,6 +270,25 @@ class IUserRepository(ABC):
 
         Returns:
             The updated user
+
+        Raises:
+            ValueError: If no user with the entity's ID exists
+        """
+        ...
+
+    @abstractmethod
+    async def update_many(self, users: list[User]) -> list[User]:
+        """
+        Update many existing users in one statement.
+
+        Args:
+            users: User domain entities with updated fields
+
+        Returns:
+            The updated users, in no particular order
+
+        Raises:
+            ValueError: If any of the entities' IDs does not exist
         """
         ...
 
@@ -86,3 +305,15 @@ class IUserRepository(ABC):
         """
         ...
 
+    @abstractmethod
+    async def delete_many(self, user_ids: list[int]) -> list[int]:
+        """
+        Delete many users in one statement.
+
+        Args:
+            user_ids: The users' unique identifiers
+
+        Returns:
+            IDs that were deleted; missing IDs are skipped
+        """
+        ...
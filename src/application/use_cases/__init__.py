@@ -1,18 +1,34 @@
 """Application use cases - business logic orchestration."""
 
 from src.application.use_cases.auth import (
+    CheckAvailabilityUseCase,
     GetCurrentUserUseCase,
+    IntrospectTokensUseCase,
     LoginUserUseCase,
+    LogoutUseCase,
     RefreshTokenUseCase,
     RegisterUserUseCase,
 )
 from src.application.use_cases.math import MathUseCase
+from src.application.use_cases.users import (
+    ExportUsersUseCase,
+    ImportUsersUseCase,
+    ListUsersUseCase,
+    SearchUsersUseCase,
+)
 
 __all__ = [
     "RegisterUserUseCase",
     "LoginUserUseCase",
     "RefreshTokenUseCase",
+    "LogoutUseCase",
     "GetCurrentUserUseCase",
+    "IntrospectTokensUseCase",
+    "CheckAvailabilityUseCase",
+    "ListUsersUseCase",
+    "SearchUsersUseCase",
+    "ExportUsersUseCase",
+    "ImportUsersUseCase",
     "MathUseCase",
 ]
 
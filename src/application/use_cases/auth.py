@@ -1,12 +1,19 @@
 """Authentication use cases."""
 
-from src.application.dto.token import TokenDTO
-from src.application.dto.user import UserCreateDTO, UserResponseDTO
+from src.application.dto.activity import ActivityEventDTO, ActivityEventType
+from src.application.dto.token import TokenDTO, TokenIntrospectionDTO, TokenPayloadDTO
+from src.application.dto.user import AvailabilityDTO, UserCreateDTO, UserResponseDTO
+from src.application.interfaces.activity_log import IActivityLog
+from src.application.interfaces.availability_filter import IAvailabilityFilter
+from src.application.interfaces.login_throttle import ILoginThrottle
 from src.application.interfaces.password_hasher import IPasswordHasher
+from src.application.interfaces.token_denylist import ITokenDenylist
 from src.application.interfaces.token_service import ITokenService
 from src.application.interfaces.user_repository import IUserRepository
 from src.domain.exceptions import (
     InvalidCredentialsError,
+    InvalidTokenError,
+    TooManyLoginAttemptsError,
     UserAlreadyExistsError,
     UserNotFoundError,
 )
@@ -21,31 +28,38 @@ class RegisterUserUseCase:
         user_repository: IUserRepository,
         password_hasher: IPasswordHasher,
         token_service: ITokenService,
+        activity_log: IActivityLog | None = None,
+        availability_filter: IAvailabilityFilter | None = None,
     ):
         self._user_repository = user_repository
         self._password_hasher = password_hasher
         self._token_service = token_service
+        self._activity_log = activity_log
+        self._availability_filter = availability_filter
 
-    async def execute(self, dto: UserCreateDTO) -> TokenDTO:
+    async def execute(self, dto: UserCreateDTO, client_ip: str | None = None) -> TokenDTO:
         """
         Register a new user and return tokens.
 
         Args:
             dto: User creation data
+            client_ip: Address the registration comes from, for the activity log
 
         Returns:
             Token pair (access + refresh)
 
         Raises:
-            UserAlreadyExistsError: If email already exists
+            UserAlreadyExistsError: If email or username already exists
         """
-        existing_user = await self._user_repository.get_by_email(dto.email)
+        # Cheap pre-check so the expensive hash only runs when the insert
+        # is likely to succeed; create_unique still guards against races.
+        existing_user = await self._user_repository.get_by_email_or_username(
+            dto.email, dto.username
+        )
         if existing_user:
-            raise UserAlreadyExistsError(dto.email)
-
-        existing_username = await self._user_repository.get_by_username(dto.username)
-        if existing_username:
-            raise UserAlreadyExistsError(dto.username)
+            raise UserAlreadyExistsError(
+                dto.email if existing_user.email == dto.email else dto.username
+            )
 
         hashed_password = self._password_hasher.hash(dto.password)
 
@@ -55,11 +69,60 @@ class RegisterUserUseCase:
             hashed_password=hashed_password,
         )
 
-        created_user = await self._user_repository.create(user)
+        created_user = await self._user_repository.create_unique(user)
+        if created_user.id is None:
+            raise ValueError("Repository returned the new user without an ID")
+
+        if self._availability_filter:
+            await self._availability_filter.add(created_user.email, created_user.username)
+        if self._activity_log:
+            self._activity_log.record(
+                ActivityEventDTO(created_user.id, ActivityEventType.REGISTER, client_ip)
+            )
 
         return self._token_service.create_token_pair(created_user.id)
 
 
+class CheckAvailabilityUseCase:
+    """Use case for telling whether an email or username is still free."""
+
+    def __init__(
+        self, user_repository: IUserRepository, availability_filter: IAvailabilityFilter
+    ):
+        self._user_repository = user_repository
+        self._availability_filter = availability_filter
+
+    async def execute(
+        self, email: str | None = None, username: str | None = None
+    ) -> AvailabilityDTO:
+        """
+        Check the availability of an email and/or a username.
+
+        Values the filter has never seen are reported free without a query;
+        only probable hits are confirmed with an indexed lookup.
+
+        Args:
+            email: Email to check, if any
+            username: Username to check, if any
+
+        Returns:
+            Availability per checked field
+        """
+        email_available = None
+        if email is not None:
+            email_available = not (
+                self._availability_filter.might_be_taken("email", email)
+                and await self._user_repository.get_by_email(email)
+            )
+        username_available = None
+        if username is not None:
+            username_available = not (
+                self._availability_filter.might_be_taken("username", username)
+                and await self._user_repository.get_by_username(username)
+            )
+        return AvailabilityDTO(email=email_available, username=username_available)
+
+
 class LoginUserUseCase:
     """Use case for user login."""
 
@@ -68,67 +131,144 @@ class LoginUserUseCase:
         user_repository: IUserRepository,
         password_hasher: IPasswordHasher,
         token_service: ITokenService,
+        login_throttle: ILoginThrottle | None = None,
+        activity_log: IActivityLog | None = None,
     ):
         self._user_repository = user_repository
         self._password_hasher = password_hasher
         self._token_service = token_service
+        self._login_throttle = login_throttle
+        self._activity_log = activity_log
 
-    async def execute(self, email: str, password: str) -> TokenDTO:
+    async def execute(self, email: str, password: str, client_ip: str | None = None) -> TokenDTO:
         """
         Authenticate user and return tokens.
 
         Args:
             email: User's email
             password: User's password
+            client_ip: Address the attempt comes from, used for throttling
 
         Returns:
             Token pair (access + refresh)
 
         Raises:
+            TooManyLoginAttemptsError: If the account or IP is throttled
             InvalidCredentialsError: If credentials are invalid
         """
-        user = await self._user_repository.get_by_email(email)
-        if not user:
+        # Count the attempt as failed up front, so a concurrent burst is
+        # throttled before any DB or hashing work rather than after it
+        attempt = None
+        if self._login_throttle:
+            attempt = await self._login_throttle.attempt(email, client_ip)
+            if attempt.retry_after is not None:
+                raise TooManyLoginAttemptsError(attempt.retry_after)
+
+        user = await self._user_repository.get_credentials_by_email(email)
+        if not user or not self._password_hasher.verify(password, user.hashed_password):
             raise InvalidCredentialsError()
 
-        if not self._password_hasher.verify(password, user.hashed_password):
-            raise InvalidCredentialsError()
+        if self._login_throttle and attempt is not None:
+            await self._login_throttle.reset(email, client_ip, attempt.attempt_id)
+
+        # Transparently move the stored hash to the current cost factor
+        if self._password_hasher.needs_rehash(user.hashed_password):
+            await self._user_repository.update_password(
+                user.id, self._password_hasher.hash(password)
+            )
+
+        # Written behind: the audit row and last_login_at cost the login no round-trip
+        if self._activity_log:
+            self._activity_log.record(
+                ActivityEventDTO(user.id, ActivityEventType.LOGIN, client_ip)
+            )
 
         return self._token_service.create_token_pair(user.id)
 
 
 class RefreshTokenUseCase:
-    """Use case for refreshing access token."""
+    """Use case for rotating a refresh token into a new token pair."""
 
     def __init__(
         self,
         user_repository: IUserRepository,
         token_service: ITokenService,
+        token_denylist: ITokenDenylist,
+        activity_log: IActivityLog | None = None,
     ):
         self._user_repository = user_repository
         self._token_service = token_service
+        self._token_denylist = token_denylist
+        self._activity_log = activity_log
 
-    async def execute(self, refresh_token: str) -> TokenDTO:
+    async def execute(self, refresh_token: str, client_ip: str | None = None) -> TokenDTO:
         """
-        Refresh access token using a valid refresh token.
+        Exchange a valid refresh token for a new token pair.
+
+        Each refresh token can be used once. Presenting an already used
+        token revokes its whole family, since it means the token leaked.
 
         Args:
             refresh_token: Valid refresh token
+            client_ip: Address the refresh comes from, for the activity log
 
         Returns:
-            New token pair
+            New token pair in the same family
 
         Raises:
-            InvalidTokenError: If refresh token is invalid
+            InvalidTokenError: If refresh token is invalid, revoked or reused
             UserNotFoundError: If user no longer exists
         """
         payload = self._token_service.verify_refresh_token(refresh_token)
+        if payload.jti is None or payload.family is None:
+            raise InvalidTokenError("Refresh token cannot be rotated")
 
-        user = await self._user_repository.get_by_id(payload.sub)
+        if await self._token_denylist.is_revoked(payload.family):
+            raise InvalidTokenError("Refresh token has been revoked")
+
+        if not await self._token_denylist.revoke(payload.jti, payload.exp):
+            await self._token_denylist.revoke(
+                payload.family, self._token_service.refresh_token_expires_at()
+            )
+            raise InvalidTokenError("Refresh token reuse detected")
+
+        user = await self._user_repository.get_profile_by_id(payload.sub)
         if not user:
             raise UserNotFoundError(str(payload.sub))
 
-        return self._token_service.create_token_pair(user.id)
+        if self._activity_log:
+            self._activity_log.record(
+                ActivityEventDTO(user.id, ActivityEventType.REFRESH, client_ip)
+            )
+
+        return self._token_service.create_token_pair(user.id, family=payload.family)
+
+
+class LogoutUseCase:
+    """Use case for revoking a login session."""
+
+    def __init__(self, token_service: ITokenService, token_denylist: ITokenDenylist):
+        self._token_service = token_service
+        self._token_denylist = token_denylist
+
+    async def execute(self, refresh_token: str) -> None:
+        """
+        Revoke every token issued from the same login as a refresh token.
+
+        Args:
+            refresh_token: Refresh token of the session to end
+
+        Raises:
+            InvalidTokenError: If refresh token is invalid
+        """
+        payload = self._token_service.verify_refresh_token(refresh_token)
+        revoke_id = payload.family or payload.jti
+        if revoke_id is None:
+            raise InvalidTokenError("Refresh token cannot be revoked")
+
+        await self._token_denylist.revoke(
+            revoke_id, self._token_service.refresh_token_expires_at()
+        )
 
 
 class GetCurrentUserUseCase:
@@ -150,14 +290,70 @@ class GetCurrentUserUseCase:
         Raises:
             UserNotFoundError: If user not found
         """
-        user = await self._user_repository.get_by_id(user_id)
+        user = await self._user_repository.get_profile_by_id(user_id)
         if not user:
             raise UserNotFoundError(str(user_id))
 
-        return UserResponseDTO(
-            id=user.id,
-            email=user.email,
-            username=user.username,
-            created_at=user.created_at,
-        )
+        return user
+
+
+class IntrospectTokensUseCase:
+    """Use case for validating many tokens at once."""
 
+    def __init__(
+        self,
+        user_repository: IUserRepository,
+        token_service: ITokenService,
+        token_denylist: ITokenDenylist,
+    ):
+        self._user_repository = user_repository
+        self._token_service = token_service
+        self._token_denylist = token_denylist
+
+    async def execute(self, tokens: list[str]) -> list[TokenIntrospectionDTO]:
+        """
+        Validate tokens and resolve their users with a single lookup.
+
+        Args:
+            tokens: Encoded JWT tokens of any type
+
+        Returns:
+            One introspection result per token, in input order
+        """
+        payloads: list[TokenPayloadDTO | str] = []
+        for token in tokens:
+            try:
+                decoded = self._token_service.decode_token(token)
+            except InvalidTokenError as e:
+                payloads.append(e.message)
+                continue
+            if await self._token_denylist.is_revoked(decoded.jti, decoded.family):
+                payloads.append("Token has been revoked")
+            else:
+                payloads.append(decoded)
+
+        user_ids = [p.sub for p in payloads if isinstance(p, TokenPayloadDTO)]
+        users = {user.id: user for user in await self._user_repository.get_many_by_ids(user_ids)}
+
+        results = []
+        for payload in payloads:
+            if not isinstance(payload, TokenPayloadDTO):
+                results.append(TokenIntrospectionDTO(active=False, error=payload))
+                continue
+            user = users.get(payload.sub)
+            if user is None:
+                results.append(
+                    TokenIntrospectionDTO(active=False, sub=payload.sub, error="User not found")
+                )
+                continue
+            results.append(
+                TokenIntrospectionDTO(
+                    active=True,
+                    sub=payload.sub,
+                    exp=payload.exp,
+                    type=payload.type,
+                    username=user.username,
+                    email=user.email,
+                )
+            )
+        return results
@@ -5,12 +5,15 @@ from src.application.dto.math import (
     PrimesListResponseDTO,
 )
 from src.domain.exceptions import MathOperationError
-from src.domain.models.math_operations import primes_up_to
+from src.domain.models.math_operations import PrimeSieve, primes_up_to
 
 
 class MathUseCase:
     """Use case for mathematical operations."""
 
+    def __init__(self, sieve: PrimeSieve | None = None):
+        self._sieve = sieve
+
     def get_primes_list(self, dto: PrimesListRequestDTO) -> PrimesListResponseDTO:
         """
         Get all prime numbers up to a given limit.
@@ -25,7 +28,10 @@ class MathUseCase:
             MathOperationError: If calculation fails
         """
         try:
-            primes = primes_up_to(dto.limit)
+            if self._sieve is not None:
+                primes = self._sieve.primes_up_to(dto.limit)
+            else:
+                primes = primes_up_to(dto.limit)
             return PrimesListResponseDTO(limit=dto.limit, primes=primes, count=len(primes))
         except ValueError as e:
             raise MathOperationError(str(e))
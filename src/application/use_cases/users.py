@@ -0,0 +1,217 @@
+"""User administration use cases."""
+
+import asyncio
+import base64
+import json
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator, Awaitable, Callable
+from datetime import datetime
+
+from src.application.dto.user import (
+    UserImportErrorDTO,
+    UserImportProgressDTO,
+    UserImportResultDTO,
+    UserImportRowDTO,
+    UserPageDTO,
+    UserResponseDTO,
+)
+from src.application.interfaces.availability_filter import IAvailabilityFilter
+from src.application.interfaces.password_hasher import IPasswordHasher
+from src.application.interfaces.user_repository import IUserRepository
+from src.domain.exceptions import InvalidCursorError
+from src.domain.models.user import User
+
+
+def _encode_cursor(profile: UserResponseDTO) -> str:
+    key = json.dumps([profile.created_at.isoformat(), profile.id])
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, user_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(user_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError() from e
+
+
+class ListUsersUseCase:
+    """Use case for paging through users with an opaque cursor."""
+
+    def __init__(self, user_repository: IUserRepository):
+        self._user_repository = user_repository
+
+    async def execute(self, limit: int, cursor: str | None = None) -> UserPageDTO:
+        """
+        Return the page of users following the cursor.
+
+        Args:
+            limit: Maximum number of users on the page
+            cursor: ``next_cursor`` of the previous page; None for the first page
+
+        Returns:
+            The page and the cursor of the next one
+
+        Raises:
+            InvalidCursorError: If the cursor was not issued by this endpoint
+        """
+        after = _decode_cursor(cursor) if cursor else None
+        # One extra row tells whether another page follows
+        profiles = await self._user_repository.list_profiles(limit + 1, after)
+        items = profiles[:limit]
+        next_cursor = _encode_cursor(items[-1]) if len(profiles) > limit else None
+        return UserPageDTO(items=items, next_cursor=next_cursor)
+
+
+class SearchUsersUseCase:
+    """Use case for finding users by part of their email or username."""
+
+    def __init__(self, user_repository: IUserRepository):
+        self._user_repository = user_repository
+
+    async def execute(self, query: str, limit: int) -> list[UserResponseDTO]:
+        """
+        Search users.
+
+        Args:
+            query: Start or part of an email or username
+            limit: Maximum number of users to return
+
+        Returns:
+            Matching profiles, prefix matches first
+        """
+        query = query.strip()
+        if not query:
+            return []
+        return await self._user_repository.search_profiles(query, limit)
+
+
+class ExportUsersUseCase:
+    """Use case for exporting every user without loading them all at once."""
+
+    def __init__(self, user_repository: IUserRepository):
+        self._user_repository = user_repository
+
+    def execute(self, batch_size: int = 1000) -> AsyncIterator[UserResponseDTO]:
+        """
+        Stream all users.
+
+        Args:
+            batch_size: Rows fetched from the database per round-trip
+
+        Returns:
+            Async iterator over every user profile
+        """
+        return self._user_repository.stream_profiles(batch_size)
+
+
+class ImportUsersUseCase:
+    """
+    Use case for creating many users at once.
+
+    Rows are hashed in batches on the hasher's worker pool while the
+    previous batch is being inserted, so hashing and database writes overlap.
+    ``commit_batch`` is awaited after each batch is inserted, so a large
+    import is not one transaction: batches committed before a failure stay
+    imported.
+    """
+
+    def __init__(
+        self,
+        user_repository: IUserRepository,
+        password_hasher: IPasswordHasher,
+        batch_size: int = 1000,
+        availability_filter: IAvailabilityFilter | None = None,
+        commit_batch: Callable[[UserImportProgressDTO], Awaitable[None]] | None = None,
+    ):
+        self._user_repository = user_repository
+        self._password_hasher = password_hasher
+        self._batch_size = batch_size
+        self._availability_filter = availability_filter
+        self._commit_batch = commit_batch
+
+    async def _to_users(self, rows: list[UserImportRowDTO]) -> list[User]:
+        plain = [row.password for row in rows if row.password is not None]
+        hashed = iter(await self._password_hasher.hash_many(plain))
+        return [
+            User(
+                email=row.email,
+                username=row.username,
+                hashed_password=row.hashed_password or next(hashed),
+            )
+            for row in rows
+        ]
+
+    async def _batches(
+        self, rows: AsyncIterable[UserImportRowDTO], errors: list[UserImportErrorDTO]
+    ) -> AsyncGenerator[list[UserImportRowDTO], None]:
+        emails: set[str] = set()
+        usernames: set[str] = set()
+        batch: list[UserImportRowDTO] = []
+        async for row in rows:
+            if row.email in emails or row.username in usernames:
+                errors.append(
+                    UserImportErrorDTO(row.row, row.email, "Duplicate email or username in import")
+                )
+                continue
+            emails.add(row.email)
+            usernames.add(row.username)
+            batch.append(row)
+            if len(batch) == self._batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def execute(self, rows: AsyncIterable[UserImportRowDTO]) -> UserImportResultDTO:
+        """
+        Import users, skipping duplicates instead of failing the whole import.
+
+        Rows are consumed as they arrive: the next batch is read while the
+        current one is hashed, and hashed while the current one is inserted.
+
+        Args:
+            rows: Validated rows, each with a password or a bcrypt hash
+
+        Returns:
+            Number of users created and the rows that were skipped
+        """
+        errors: list[UserImportErrorDTO] = []
+        batches = self._batches(rows, errors)
+        imported = committed = 0
+        batch = await anext(batches, None)
+        hashing = asyncio.ensure_future(self._to_users(batch)) if batch is not None else None
+        try:
+            while batch is not None and hashing is not None:
+                next_batch = await anext(batches, None)
+                users = await hashing
+                hashing = (
+                    asyncio.ensure_future(self._to_users(next_batch))
+                    if next_batch is not None
+                    else None
+                )
+                inserted = await self._user_repository.import_many(users)
+                imported += len(inserted)
+                errors.extend(
+                    UserImportErrorDTO(row.row, row.email, "Email or username already exists")
+                    for row in batch
+                    if row.email not in inserted
+                )
+                if self._commit_batch:
+                    committed += 1
+                    await self._commit_batch(
+                        UserImportProgressDTO(committed, imported, len(errors), batch[-1].row)
+                    )
+                # Published once committed, like the registrations of other users
+                if self._availability_filter:
+                    await self._availability_filter.add_many(
+                        [(user.email, user.username) for user in users if user.email in inserted]
+                    )
+                batch = next_batch
+        finally:
+            if hashing is not None:
+                hashing.cancel()
+            await batches.aclose()
+
+        errors.sort(key=lambda error: error.row)
+        return UserImportResultDTO(imported=imported, errors=errors)
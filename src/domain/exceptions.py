@@ -30,6 +30,14 @@ class InvalidCredentialsError(DomainException):
         super().__init__("Invalid email or password")
 
 
+class TooManyLoginAttemptsError(DomainException):
+    """Raised when login attempts exceed the allowed rate."""
+
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__(f"Too many login attempts, retry in {retry_after} seconds")
+
+
 class InvalidTokenError(DomainException):
     """Raised when a token is invalid or expired."""
 
@@ -37,6 +45,13 @@ class InvalidTokenError(DomainException):
         super().__init__(message)
 
 
+class InvalidCursorError(DomainException):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    def __init__(self) -> None:
+        super().__init__("Invalid pagination cursor")
+
+
 class MathOperationError(DomainException):
     """Raised when a math operation fails."""
 
@@ -1,5 +1,7 @@
 """Pure domain functions for mathematical operations."""
 
+from bisect import bisect_right
+
 
 def primes_up_to(n: int) -> list[int]:
     """
@@ -30,3 +32,51 @@ def primes_up_to(n: int) -> list[int]:
                 sieve[j] = False
 
     return [i for i, is_prime in enumerate(sieve) if is_prime]
+
+
+class PrimeSieve:
+    """
+    Prime lookup that keeps its largest sieve and answers lower limits from it.
+
+    Limits above ``max_cached_limit`` are computed but not kept, bounding
+    memory to the primes below that limit.
+    """
+
+    def __init__(self, max_cached_limit: int):
+        self._max_cached_limit = max_cached_limit
+        self._limit = 1
+        self._primes: list[int] = []
+
+    @property
+    def limit(self) -> int:
+        """Largest limit answered from the cache."""
+        return self._limit
+
+    @property
+    def cached_primes(self) -> list[int]:
+        """The cached primes, up to ``limit``; do not modify."""
+        return self._primes
+
+    def primes_up_to(self, n: int) -> list[int]:
+        """
+        Get all prime numbers from 1 to n (inclusive).
+
+        Args:
+            n: Upper limit (inclusive)
+
+        Returns:
+            New list of all prime numbers from 1 to n
+
+        Raises:
+            ValueError: If n is less than 1
+        """
+        if n < 1:
+            raise ValueError("Input must be at least 1")
+        if n <= self._limit:
+            return self._primes[: bisect_right(self._primes, n)]
+        primes = primes_up_to(n)
+        if n <= self._max_cached_limit:
+            self._limit, self._primes = n, primes
+            # Callers own the result: hand out a copy, never the cache itself
+            return primes.copy()
+        return primes
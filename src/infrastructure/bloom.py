@@ -0,0 +1,78 @@
+"""Bloom filter for fast probabilistic set membership."""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Membership tests never return false negatives; false positives occur at
+    roughly ``error_rate`` once ``capacity`` items have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("Error rate must be between 0 and 1")
+        self._size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self.count = 0
+
+    def positions(self, item: str) -> list[int]:
+        """Bit positions set for an item; bit ``p`` is bit ``p % 8`` of byte ``p // 8``."""
+        # Double hashing: k positions derived from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self._size for i in range(self._hashes)]
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+        for pos in self.positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self.positions(item))
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self._bits)
+
+    def merge(self, bits: bytes) -> None:
+        """
+        OR in the bit array of a filter with the same geometry.
+
+        The items behind the merged bits are unknown, so ``count`` becomes
+        the number of items estimated from the bits set, if that is higher.
+        """
+        if len(bits) != len(self._bits):
+            raise ValueError("Bloom filters differ in size")
+        merged = int.from_bytes(self._bits, "little") | int.from_bytes(bits, "little")
+        self._bits = bytearray(merged.to_bytes(len(self._bits), "little"))
+        self.count = max(self.count, self._estimated_count(merged.bit_count()))
+
+    def _estimated_count(self, bits_set: int) -> int:
+        # Swamidass & Baldi: n = -(m / k) * ln(1 - X / m) for X of m bits set
+        if bits_set >= self._size:
+            return self.count
+        return round(-self._size / self._hashes * math.log1p(-bits_set / self._size))
+
+    def to_bytes(self) -> bytes:
+        """Copy of the bit array."""
+        return bytes(self._bits)
+
+    @property
+    def geometry(self) -> tuple[int, int]:
+        """Number of bits and of hash functions; filters can only merge if equal."""
+        return self._size, self._hashes
+
+    @property
+    def size_bytes(self) -> int:
+        """Memory used by the bit array."""
+        return len(self._bits)
@@ -1,12 +1,43 @@
 """Celery application configuration and tasks."""
 
-from celery import Celery
+import time
+from typing import Any
+
+from celery import Celery, Task
+from celery.signals import before_task_publish, task_postrun, task_prerun, worker_process_init
 
 from src.domain.models.math_operations import primes_up_to
+from src.infrastructure import metrics
 from src.infrastructure.config import get_settings
+from src.infrastructure.prime_cache import SIEVE_DURATION, limit_bucket
 
 settings = get_settings()
 
+CELERY_TASKS_SUBMITTED = metrics.registry.counter(
+    "celery_tasks_submitted_total", "Tasks published to the broker", ["task"]
+)
+CELERY_TASKS_STARTED = metrics.registry.counter(
+    "celery_tasks_started_total", "Tasks taken off the queue by a worker", ["task"]
+)
+CELERY_TASKS_FINISHED = metrics.registry.counter(
+    "celery_tasks_finished_total", "Tasks that finished, by final state", ["task", "state"]
+)
+CELERY_TASKS_RUNNING = metrics.registry.gauge(
+    "celery_tasks_running", "Tasks being executed", ["task"], multiprocess_mode="sum"
+)
+CELERY_QUEUE_WAIT = metrics.registry.histogram(
+    "celery_task_queue_wait_seconds",
+    "Time from publishing a task until a worker started it",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+CELERY_TASK_DURATION = metrics.registry.histogram(
+    "celery_task_duration_seconds", "Time a worker spent executing a task", ["task"]
+)
+
+# Task ID -> start time of tasks running in this worker process
+_running: dict[str, float] = {}
+
 # Create Celery app
 app = Celery(
     "katharsis",
@@ -37,10 +68,54 @@ def primes_list_task(limit: int) -> dict:
     Returns:
         Dictionary with limit, primes list, and count
     """
+    started = time.perf_counter()
     primes = primes_up_to(limit)
+    SIEVE_DURATION.observe(
+        time.perf_counter() - started, limit_bucket=limit_bucket(limit), source="sieve"
+    )
     return {
         "limit": limit,
         "primes": primes,
         "count": len(primes),
     }
 
+
+def _on_publish(
+    sender: str | None = None, headers: dict[str, Any] | None = None, **_kw: Any
+) -> None:
+    CELERY_TASKS_SUBMITTED.inc(task=sender or "unknown")
+    if headers is not None:
+        # Wall clock: the worker reading it is another process, maybe another host
+        headers["published_at"] = time.time()
+
+
+def _on_task_start(task_id: str, task: Task, **_kw: Any) -> None:
+    CELERY_TASKS_STARTED.inc(task=task.name)
+    CELERY_TASKS_RUNNING.inc(task=task.name)
+    published_at = getattr(task.request, "published_at", None)
+    if published_at is not None:
+        CELERY_QUEUE_WAIT.observe(max(time.time() - published_at, 0.0), task=task.name)
+    _running[task_id] = time.perf_counter()
+
+
+def _on_task_end(task_id: str, task: Task, state: str | None = None, **_kw: Any) -> None:
+    CELERY_TASKS_RUNNING.dec(task=task.name)
+    CELERY_TASKS_FINISHED.inc(task=task.name, state=state or "UNKNOWN")
+    started = _running.pop(task_id, None)
+    if started is not None:
+        CELERY_TASK_DURATION.observe(time.perf_counter() - started, task=task.name)
+
+
+def _on_worker_process_init(**_kw: Any) -> None:
+    # Worker metrics reach the API's /metrics through the shared directory
+    if settings.metrics_multiproc_dir:
+        metrics.enable_multiprocess(
+            settings.metrics_multiproc_dir, settings.metrics_multiproc_interval_seconds
+        )
+
+
+# Connected by call, not as decorators: Signal.connect is untyped
+before_task_publish.connect(_on_publish)
+task_prerun.connect(_on_task_start)
+task_postrun.connect(_on_task_end)
+worker_process_init.connect(_on_worker_process_init)
@@ -1,6 +1,44 @@
 """Database infrastructure."""
 
-from src.infrastructure.db.session import AsyncSessionLocal, engine, get_async_session
+from src.infrastructure.db.query_stats import QueryStats, current_query_stats, track_queries
+from src.infrastructure.db.routing import (
+    ReplicaRouter,
+    RoutingSession,
+    is_pinned_to_primary,
+    pin_to_primary,
+)
+from src.infrastructure.db.session import (
+    Database,
+    ReadOnlyAsyncSession,
+    close_database,
+    create_database,
+    get_async_session,
+    get_database,
+    get_readonly_session,
+    get_readonly_session_factory,
+    get_session_factory,
+)
+from src.infrastructure.db.sharding import DIRECTORY_SHARD, HashRing, sharded_sessionmaker
 
-__all__ = ["get_async_session", "AsyncSessionLocal", "engine"]
+__all__ = [
+    "get_async_session",
+    "get_readonly_session",
+    "get_session_factory",
+    "get_readonly_session_factory",
+    "Database",
+    "create_database",
+    "get_database",
+    "close_database",
+    "ReadOnlyAsyncSession",
+    "ReplicaRouter",
+    "RoutingSession",
+    "pin_to_primary",
+    "is_pinned_to_primary",
+    "QueryStats",
+    "track_queries",
+    "current_query_stats",
+    "HashRing",
+    "DIRECTORY_SHARD",
+    "sharded_sessionmaker",
+]
 
@@ -0,0 +1,184 @@
+"""Write-behind activity log flushing events to the database in batches."""
+
+import asyncio
+import contextlib
+import contextvars
+import logging
+import time
+from collections import deque
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.application.dto.activity import ActivityEventDTO, ActivityEventType
+from src.application.interfaces.activity_log import IActivityLog
+from src.infrastructure.config import get_settings
+from src.infrastructure.db.repositories.activity_event import ActivityEventRepository
+from src.infrastructure.db.repositories.sharded_user import user_repository_for
+from src.infrastructure.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_EVENTS = registry.counter(
+    "activity_events_total", "Activity events by what became of them", ["outcome"]
+)
+ACTIVITY_PENDING = registry.gauge(
+    "activity_events_pending", "Activity events waiting for a flush", multiprocess_mode="sum"
+)
+ACTIVITY_FLUSH_SECONDS = registry.histogram(
+    "activity_flush_seconds", "Time to write one batch of activity events"
+)
+
+
+class WriteBehindActivityLog(IActivityLog):
+    """
+    Activity log that queues events in memory and writes them in batches.
+
+    A background task flushes when ``batch_size`` events are queued or
+    every ``flush_seconds``, whichever comes first. Logins also update
+    ``users.last_login_at``; repeated logins of a user between two flushes
+    are coalesced into one update.
+
+    Memory is bounded by ``max_pending``: once that many events wait, new
+    events are dropped (and counted) rather than slowing down logins. A
+    batch that fails to write is dropped as well, so a database outage
+    cannot make the queue grow.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = 500,
+        flush_seconds: float = 1.0,
+        max_pending: int = 10_000,
+    ):
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._flush_seconds = flush_seconds
+        self._max_pending = max_pending
+        self._events: deque[ActivityEventDTO] = deque()
+        self._last_logins: dict[int, datetime] = {}
+        self._batch_ready = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._worker: asyncio.Task[None] | None = None
+
+    def record(self, event: ActivityEventDTO) -> None:
+        """Queue an event; drops it if the queue is full."""
+        if len(self._events) >= self._max_pending:
+            ACTIVITY_EVENTS.inc(outcome="dropped_overflow")
+            return
+        self._events.append(event)
+        ACTIVITY_EVENTS.inc(outcome="recorded")
+        ACTIVITY_PENDING.set(len(self._events))
+
+        if event.type is ActivityEventType.LOGIN:
+            previous = self._last_logins.get(event.user_id)
+            if previous is None or event.occurred_at > previous:
+                self._last_logins[event.user_id] = event.occurred_at
+
+        if len(self._events) >= self._batch_size:
+            self._batch_ready.set()
+        self._ensure_worker()
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            # Primitives are bound to the loop they are first used on
+            self._batch_ready = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            # A fresh context, so the worker doesn't inherit the query stats
+            # and primary pin of the request that happened to start it
+            self._worker = loop.create_task(self._run(), context=contextvars.Context())
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._batch_ready.wait(), self._flush_seconds)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write every queued event and pending last login update."""
+        async with self._flush_lock:
+            while self._events or self._last_logins:
+                count = min(len(self._events), self._batch_size)
+                events = [self._events.popleft() for _ in range(count)]
+                last_logins, self._last_logins = self._last_logins, {}
+                self._batch_ready.clear()
+                ACTIVITY_PENDING.set(len(self._events))
+
+                started = time.perf_counter()
+                try:
+                    async with self._session_factory() as session:
+                        await ActivityEventRepository(session).add_many(events)
+                        await user_repository_for(session).update_last_login_many(last_logins)
+                        await session.commit()
+                except Exception:
+                    logger.exception("Dropped %d activity events: flush failed", len(events))
+                    ACTIVITY_EVENTS.inc(len(events), outcome="dropped_error")
+                    return
+                ACTIVITY_FLUSH_SECONDS.observe(time.perf_counter() - started)
+                ACTIVITY_EVENTS.inc(len(events), outcome="written")
+
+    async def close(self) -> None:
+        """Stop the background task and write what is still queued."""
+        worker, self._worker = self._worker, None
+        if worker is not None and worker.get_loop() is asyncio.get_running_loop():
+            # Holding the lock lets a flush in progress finish before cancelling
+            async with self._flush_lock:
+                worker.cancel()
+        await self.flush()
+
+
+class AfterCommitActivityLog(IActivityLog):
+    """
+    Activity log that holds events until a session's transaction commits.
+
+    Events recorded while the session's writes are pending are passed on
+    only once they are committed, and discarded on rollback, so no event
+    describes a change that never happened.
+    """
+
+    def __init__(self, session: AsyncSession, activity_log: IActivityLog):
+        self._activity_log = activity_log
+        self._pending: list[ActivityEventDTO] = []
+        event.listen(session.sync_session, "after_commit", self._committed)
+        event.listen(session.sync_session, "after_rollback", self._rolled_back)
+
+    def record(self, event: ActivityEventDTO) -> None:
+        """Hold an event until the transaction commits."""
+        self._pending.append(event)
+
+    def _committed(self, _session: Session) -> None:
+        pending, self._pending = self._pending, []
+        for activity in pending:
+            self._activity_log.record(activity)
+
+    def _rolled_back(self, _session: Session) -> None:
+        if self._pending:
+            ACTIVITY_EVENTS.inc(len(self._pending), outcome="dropped_rollback")
+            self._pending = []
+
+
+_activity_logs: dict[async_sessionmaker[AsyncSession], WriteBehindActivityLog] = {}
+
+
+def get_activity_log(session_factory: async_sessionmaker[AsyncSession]) -> WriteBehindActivityLog:
+    """Get the process-wide activity log writing through a session factory."""
+    activity_log = _activity_logs.get(session_factory)
+    if activity_log is None:
+        settings = get_settings()
+        activity_log = _activity_logs[session_factory] = WriteBehindActivityLog(
+            session_factory,
+            batch_size=settings.activity_log_batch_size,
+            flush_seconds=settings.activity_log_flush_seconds,
+            max_pending=settings.activity_log_max_pending,
+        )
+    return activity_log
+
+
+async def close_activity_logs() -> None:
+    """Flush every activity log; called on application shutdown."""
+    for activity_log in _activity_logs.values():
+        await activity_log.close()
@@ -2,6 +2,7 @@
 
 from src.infrastructure.db.models.base import Base
 from src.infrastructure.db.models.user import UserModel
+from src.infrastructure.db.models.user_activity import UserActivityEventModel
+from src.infrastructure.db.models.user_directory import UserDirectoryModel
 
-__all__ = ["Base", "UserModel"]
-
+__all__ = ["Base", "UserModel", "UserDirectoryModel", "UserActivityEventModel"]
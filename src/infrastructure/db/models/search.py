@@ -0,0 +1,39 @@
+"""Indexes serving prefix and substring search on email and username."""
+
+from sqlalchemy import Index, text
+
+
+def search_indexes(table: str) -> tuple[Index, ...]:
+    """
+    Build the search indexes of a table with ``email`` and ``username`` columns.
+
+    PostgreSQL gets ``lower(...) text_pattern_ops`` indexes for prefix
+    ``LIKE`` and ``pg_trgm`` GIN indexes for ``ILIKE '%...%'``. SQLite has
+    no trigram index, so it only gets ``NOCASE`` indexes, which let its
+    case-insensitive ``LIKE 'x%'`` use an index range scan.
+
+    Args:
+        table: Table name, used to name the indexes
+
+    Returns:
+        Indexes for the table's ``__table_args__``
+    """
+    indexes: list[Index] = []
+    for column in ("email", "username"):
+        indexes += [
+            Index(
+                f"ix_{table}_{column}_prefix",
+                text(f"lower({column}) text_pattern_ops"),
+            ).ddl_if(dialect="postgresql"),
+            Index(
+                f"ix_{table}_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql"),
+            Index(
+                f"ix_{table}_{column}_nocase",
+                text(f"{column} COLLATE NOCASE"),
+            ).ddl_if(dialect="sqlite"),
+        ]
+    return tuple(indexes)
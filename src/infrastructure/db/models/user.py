@@ -2,16 +2,22 @@
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Integer, String
+from sqlalchemy import DateTime, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.infrastructure.db.models.base import Base
+from src.infrastructure.db.models.search import search_indexes
 
 
 class UserModel(Base):
     """SQLAlchemy model for users table."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Seek index for keyset pagination and ordered exports
+        Index("ix_users_created_at_id", "created_at", "id"),
+        *search_indexes("users"),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer,
@@ -45,6 +51,12 @@ class UserModel(Base):
         onupdate=datetime.utcnow,
         nullable=True,
     )
+    # Written in batches by the activity log, so it may lag by a few seconds
+    last_login_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        default=None,
+        nullable=True,
+    )
 
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email={self.email}, username={self.username})>"
@@ -0,0 +1,49 @@
+"""User activity event SQLAlchemy model."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.db.models.base import Base
+
+
+class UserActivityEventModel(Base):
+    """
+    SQLAlchemy model for the login/refresh/register audit trail.
+
+    Append-only and written in batches by the activity log. It has no
+    foreign key to users, so it can live on the directory database when
+    users are sharded and keeps the trail of deleted users.
+    """
+
+    __tablename__ = "user_activity_events"
+    __table_args__ = (
+        Index("ix_user_activity_events_user_id_occurred_at", "user_id", "occurred_at"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        # SQLite only auto-increments INTEGER primary keys
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    user_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+    event_type: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+    )
+    client_ip: Mapped[str | None] = mapped_column(
+        String(45),
+        nullable=True,
+    )
+    occurred_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<UserActivityEvent(user_id={self.user_id}, event_type={self.event_type})>"
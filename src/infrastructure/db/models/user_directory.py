@@ -0,0 +1,40 @@
+"""User directory SQLAlchemy model."""
+
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infrastructure.db.models.base import Base
+from src.infrastructure.db.models.search import search_indexes
+
+
+class UserDirectoryModel(Base):
+    """
+    SQLAlchemy model for the global user directory.
+
+    With sharding enabled it lives on the directory database only: it hands
+    out user IDs and enforces email/username uniqueness across shards.
+    """
+
+    __tablename__ = "user_directory"
+    __table_args__ = search_indexes("user_directory")
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+    )
+    email: Mapped[str] = mapped_column(
+        String(255),
+        unique=True,
+        nullable=False,
+        index=True,
+    )
+    username: Mapped[str] = mapped_column(
+        String(50),
+        unique=True,
+        nullable=False,
+        index=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<UserDirectory(id={self.id}, email={self.email}, username={self.username})>"
@@ -0,0 +1,181 @@
+"""Connection pool configuration and telemetry."""
+
+import time
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.infrastructure.config import Settings
+from src.infrastructure.metrics import registry
+
+POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection, including connects",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+POOL_CHECKOUT_TIMEOUTS = registry.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout", ["pool"]
+)
+POOL_IN_USE = registry.gauge(
+    "db_pool_connections_in_use", "Connections checked out", ["pool"], multiprocess_mode="sum"
+)
+POOL_IDLE = registry.gauge(
+    "db_pool_connections_idle", "Connections idle in the pool", ["pool"], multiprocess_mode="sum"
+)
+POOL_OVERFLOW = registry.gauge(
+    "db_pool_overflow", "Connections open beyond pool_size", ["pool"], multiprocess_mode="sum"
+)
+POOL_SIZE = registry.gauge(
+    "db_pool_size",
+    "Configured number of persistent connections",
+    ["pool"],
+    multiprocess_mode="sum",
+)
+POOL_CONNECTS = registry.counter("db_pool_connects_total", "New database connections", ["pool"])
+POOL_INVALIDATIONS = registry.counter(
+    "db_pool_invalidations_total", "Connections invalidated after errors", ["pool"]
+)
+POOL_CONNECTION_LIFETIME = registry.histogram(
+    "db_pool_connection_lifetime_seconds",
+    "Age of pooled connections when they are closed",
+    ["pool"],
+    buckets=(1.0, 10.0, 60.0, 300.0, 900.0, 1800.0, 3600.0, 7200.0, 21600.0),
+)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records checkout waits and its own occupancy.
+
+    Pool events fire only once a connection has been obtained (and
+    ``checkin`` before it is back in the queue), so the wait and the
+    in-use/idle/overflow counts are taken around the queue operations
+    themselves. The pool's ``logging_name`` doubles as the metrics label.
+    """
+
+    @property
+    def _label(self) -> str:
+        return self.logging_name or "default"
+
+    def _publish_usage(self) -> None:
+        POOL_IN_USE.set(self.checkedout(), pool=self._label)
+        POOL_IDLE.set(self.checkedin(), pool=self._label)
+        POOL_OVERFLOW.set(max(self.overflow(), 0), pool=self._label)
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc(pool=self._label)
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start, pool=self._label)
+            self._publish_usage()
+
+    def _do_return_conn(self, record: Any) -> None:
+        try:
+            super()._do_return_conn(record)
+        finally:
+            self._publish_usage()
+
+
+def engine_options(settings: Settings, url: str, name: str) -> dict[str, Any]:
+    """
+    Build ``create_async_engine`` keyword arguments for a database URL.
+
+    Args:
+        settings: Application settings with the pool configuration
+        url: Database URL the engine connects to
+        name: Pool name used as the metrics label
+
+    Returns:
+        Engine keyword arguments
+    """
+    backend = make_url(url)
+    if backend.get_backend_name() == "sqlite":
+        # SQLite picks its own pool class (file vs :memory:); size limits don't apply
+        return {"echo": settings.debug}
+
+    options: dict[str, Any] = {
+        "echo": settings.debug,
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_logging_name": name,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+    if backend.get_driver_name() == "asyncpg":
+        if settings.db_pgbouncer_mode:
+            # Transaction pooling hands each transaction to any server backend:
+            # prepared statements must neither be cached nor reuse names
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4().hex}__",
+            }
+        else:
+            options["connect_args"] = {
+                "statement_cache_size": settings.db_statement_cache_size,
+                "prepared_statement_cache_size": settings.db_statement_cache_size,
+            }
+
+    return options
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """
+    Publish connects, invalidations and connection lifetimes of an engine.
+
+    Listeners are attached to the engine, so they survive ``dispose()``
+    replacing its pool.
+
+    Args:
+        engine: Engine whose pool to instrument
+        name: Pool name used as the metrics label
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(_dbapi_connection: Any, connection_record: Any) -> None:
+        connection_record.info["connected_at"] = time.monotonic()
+        POOL_CONNECTS.inc(pool=name)
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(_dbapi_connection: Any, _record: Any, _exception: Any) -> None:
+        POOL_INVALIDATIONS.inc(pool=name)
+
+    @event.listens_for(sync_engine, "close")
+    def _on_close(_dbapi_connection: Any, connection_record: Any) -> None:
+        connected_at = connection_record.info.pop("connected_at", None)
+        if connected_at is not None:
+            POOL_CONNECTION_LIFETIME.observe(time.monotonic() - connected_at, pool=name)
+
+    if isinstance(sync_engine.pool, AsyncAdaptedQueuePool):
+        POOL_SIZE.set(sync_engine.pool.size(), pool=name)
+
+
+def create_pooled_engine(settings: Settings, url: str, name: str) -> AsyncEngine:
+    """
+    Create an async engine with the configured, instrumented pool.
+
+    Args:
+        settings: Application settings with the pool configuration
+        url: Database URL the engine connects to
+        name: Pool name used as the metrics label
+
+    Returns:
+        The new engine
+    """
+    engine = create_async_engine(url, **engine_options(settings, url, name))
+    instrument_engine(engine, name)
+    return engine
@@ -0,0 +1,152 @@
+"""Per-request SQL accounting, slow-query log and repeated-statement detection."""
+
+import logging
+import re
+import time
+from collections import Counter as ShapeCounter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+from src.infrastructure.config import get_settings
+from src.infrastructure.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERIES = registry.counter("db_slow_queries_total", "Statements slower than the threshold")
+REPEATED_STATEMENTS = registry.counter(
+    "db_repeated_statement_warnings_total",
+    "Requests that repeated one statement shape beyond the threshold",
+)
+
+# Collapses placeholder lists so "IN (?, ?, ?)" and "IN (?)" count as the
+# same statement shape
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|\$\d+|%s|%\(\w+\)s|:\w+)\s*,?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    """SQL statements issued on behalf of one request."""
+
+    label: str
+    count: int = 0
+    total_seconds: float = 0.0
+    shapes: ShapeCounter[str] = field(default_factory=ShapeCounter)
+    repeated: set[str] = field(default_factory=set)
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries(label: str) -> Iterator[QueryStats]:
+    """
+    Account every statement executed in the current context to one request.
+
+    Tasks spawned inside inherit the same stats object, so statements they
+    run are counted as well.
+
+    Args:
+        label: Request description used in warnings, e.g. "GET /api/v1/auth/me"
+
+    Yields:
+        The stats being filled in
+    """
+    stats = QueryStats(label)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def current_query_stats() -> QueryStats | None:
+    """Return the stats of the request being handled in this context, if any."""
+    return _current_stats.get()
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so executions differing only in bound values match."""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Replace bound values by their type names, keeping the parameter layout."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, list | tuple):
+        return [redact_parameters(value) for value in parameters]
+    return type(parameters).__name__
+
+
+def _explain(conn: Connection, statement: str, parameters: Any) -> str | None:
+    if not statement.lstrip().lower().startswith(("select", "with")):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    conn.info["explaining"] = True
+    try:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+    except Exception:  # noqa: BLE001 - diagnostics must never fail the query
+        logger.debug("EXPLAIN failed", exc_info=True)
+        return None
+    finally:
+        conn.info["explaining"] = False
+    return "\n".join(" | ".join(str(column) for column in row) for row in rows)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(
+    _conn: Connection, _cursor: Any, _statement: str, _parameters: Any, context: Any, _many: bool
+) -> None:
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn: Connection, _cursor: Any, statement: str, parameters: Any, context: Any, many: bool
+) -> None:
+    started = getattr(context, "_query_started", None)
+    if started is None or conn.info.get("explaining"):
+        return
+    elapsed = time.perf_counter() - started
+    settings = get_settings()
+    stats = _current_stats.get()
+
+    if stats is not None:
+        stats.count += 1
+        stats.total_seconds += elapsed
+        shape = statement_shape(statement)
+        stats.shapes[shape] += 1
+        if (
+            stats.shapes[shape] > settings.db_repeated_statement_threshold
+            and shape not in stats.repeated
+        ):
+            stats.repeated.add(shape)
+            REPEATED_STATEMENTS.inc()
+            logger.warning(
+                "%s ran the same statement more than %d times (possible N+1): %s",
+                stats.label,
+                settings.db_repeated_statement_threshold,
+                shape,
+            )
+
+    if elapsed * 1000 >= settings.db_slow_query_ms:
+        SLOW_QUERIES.inc()
+        plan = None
+        if settings.db_slow_query_explain and not many:
+            plan = _explain(conn, statement, parameters)
+        logger.warning(
+            "Slow query (%.1f ms)%s: %s params=%s%s",
+            elapsed * 1000,
+            f" in {stats.label}" if stats is not None else "",
+            statement,
+            redact_parameters(parameters),
+            f"\n{plan}" if plan else "",
+        )
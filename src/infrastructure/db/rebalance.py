@@ -0,0 +1,171 @@
+"""Cut-over to sharded users and rebalancing after shards are added."""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, cast
+
+from sqlalchemy import Row, Table, delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.infrastructure.db.models.user import UserModel
+from src.infrastructure.db.models.user_directory import UserDirectoryModel
+from src.infrastructure.db.repositories.user import _UPSERT_INSERTS
+from src.infrastructure.db.sharding import HashRing
+
+logger = logging.getLogger(__name__)
+
+_users = cast(Table, UserModel.__table__)
+_directory = cast(Table, UserDirectoryModel.__table__)
+
+
+@dataclass
+class RebalanceResult:
+    """Outcome of a rebalance run."""
+
+    directory_entries: int
+    moved: int
+    # Rows the owning shard refused (email or username held by another ID)
+    conflicts: int
+
+
+def _insert_ignoring_duplicates(conn: AsyncConnection, table: Table) -> Any:
+    dialect_insert = _UPSERT_INSERTS.get(conn.dialect.name)
+    if dialect_insert is None:
+        return insert(table)
+    return dialect_insert(table).on_conflict_do_nothing()
+
+
+async def _rebuild_directory(
+    directory: AsyncEngine, sources: list[AsyncEngine], batch_size: int
+) -> int:
+    """Replace the directory with the email and username of every stored user."""
+    columns = (_users.c.id, _users.c.email, _users.c.username)
+    entries = 0
+    async with directory.begin() as conn:
+        stmt = _insert_ignoring_duplicates(conn, _directory)
+
+        async def copy_from(source_conn: AsyncConnection) -> None:
+            nonlocal entries
+            result = await source_conn.stream(select(*columns))
+            async for rows in result.partitions(batch_size):
+                await conn.execute(stmt, [row._asdict() for row in rows])
+                entries += len(rows)
+
+        await conn.execute(delete(_directory))
+        for source in sources:
+            # The directory database's own users are read in its transaction
+            if source is directory:
+                await copy_from(conn)
+                continue
+            async with source.connect() as source_conn:
+                await copy_from(source_conn)
+        if conn.dialect.name == "postgresql":
+            # IDs handed out from now on must not collide with existing users
+            await conn.execute(
+                text(
+                    "SELECT setval(pg_get_serial_sequence('user_directory', 'id'), "
+                    "COALESCE((SELECT MAX(id) FROM user_directory), 0) + 1, false)"
+                )
+            )
+    return entries
+
+
+async def _move_misplaced(
+    source: AsyncEngine,
+    source_shard: str | None,
+    shards: dict[str, AsyncEngine],
+    ring: HashRing,
+    batch_size: int,
+) -> tuple[int, int]:
+    """Copy users not owned by a database to their shard, then delete them there."""
+    moved = conflicts = 0
+    last_id = 0
+    while True:
+        async with source.connect() as conn:
+            page = (
+                select(_users).where(_users.c.id > last_id).order_by(_users.c.id).limit(batch_size)
+            )
+            rows = (await conn.execute(page)).all()
+        if not rows:
+            return moved, conflicts
+        last_id = rows[-1].id
+
+        by_shard: dict[str, list[Row[Any]]] = {}
+        for row in rows:
+            owner = ring.shard_for(row.id)
+            if owner != source_shard:
+                by_shard.setdefault(owner, []).append(row)
+
+        # Copied first and deleted after: a run stopped in between leaves a
+        # duplicate that the next run skips inserting and then deletes
+        copied: list[int] = []
+        for shard_id, shard_rows in by_shard.items():
+            ids = [row.id for row in shard_rows]
+            async with shards[shard_id].begin() as target:
+                await target.execute(
+                    _insert_ignoring_duplicates(target, _users),
+                    [row._asdict() for row in shard_rows],
+                )
+                present = set(
+                    (await target.execute(select(_users.c.id).where(_users.c.id.in_(ids))))
+                    .scalars()
+                )
+            copied.extend(present)
+            if len(present) < len(ids):
+                missing = sorted(set(ids) - present)
+                logger.error(
+                    "Users %s kept in place: their email or username is taken on %s",
+                    missing,
+                    shard_id,
+                )
+                conflicts += len(missing)
+        if copied:
+            async with source.begin() as conn:
+                await conn.execute(delete(_users).where(_users.c.id.in_(copied)))
+            moved += len(copied)
+
+
+async def rebalance_users(
+    directory: AsyncEngine,
+    shards: dict[str, AsyncEngine],
+    ring: HashRing,
+    batch_size: int = 1000,
+) -> RebalanceResult:
+    """
+    Put every user on the shard owning its ID and rebuild the user directory.
+
+    Run with the application stopped: when sharding is first enabled, to
+    move the users of the former single database (the directory database)
+    to their shards, and after shards are appended to the ring, to move
+    the users the new shards now own. The directory is rebuilt from all
+    user rows first, since nothing kept it current without sharding.
+    Re-running after an interruption is safe.
+
+    Args:
+        directory: Engine of the directory database, formerly the only one
+        shards: Engines of the user shards by shard id
+        ring: Hash ring over the shard ids
+        batch_size: Users copied per transaction
+
+    Returns:
+        Counts of directory entries written, users moved and users left in
+        place because their owning shard holds a conflicting row
+    """
+    sources = [directory, *shards.values()]
+    entries = await _rebuild_directory(directory, sources, batch_size)
+    moved = conflicts = 0
+    for source_shard, source in [(None, directory), *shards.items()]:
+        source_moved, source_conflicts = await _move_misplaced(
+            source, source_shard, shards, ring, batch_size
+        )
+        moved += source_moved
+        conflicts += source_conflicts
+        if source_moved:
+            logger.info("Moved %d users off %s", source_moved, source_shard or "the directory")
+    return RebalanceResult(entries, moved, conflicts)
+
+
+async def unplaced_users(directory: AsyncEngine) -> int:
+    """Count users still stored in the directory database, i.e. not on a shard."""
+    async with directory.connect() as conn:
+        return int((await conn.execute(select(func.count()).select_from(_users))).scalar_one())
@@ -1,6 +1,23 @@
 """Repository implementations."""
 
+from src.infrastructure.db.repositories.activity_event import ActivityEventRepository
+from src.infrastructure.db.repositories.loader import (
+    CoalescingUserRepository,
+    UserLoader,
+    get_user_loader,
+)
+from src.infrastructure.db.repositories.sharded_user import (
+    ShardedUserRepository,
+    user_repository_for,
+)
 from src.infrastructure.db.repositories.user import UserRepository
 
-__all__ = ["UserRepository"]
-
+__all__ = [
+    "UserRepository",
+    "ShardedUserRepository",
+    "user_repository_for",
+    "UserLoader",
+    "CoalescingUserRepository",
+    "get_user_loader",
+    "ActivityEventRepository",
+]
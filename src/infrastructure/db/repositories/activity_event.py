@@ -0,0 +1,57 @@
+"""User activity event repository implementation."""
+
+from typing import Any, cast
+
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.dto.activity import ActivityEventDTO
+from src.infrastructure.db.models.user_activity import UserActivityEventModel
+from src.infrastructure.db.sharding import DIRECTORY_SHARD
+
+_events = cast(Table, UserActivityEventModel.__table__)
+_COLUMNS = ("user_id", "event_type", "client_ip", "occurred_at")
+
+
+class ActivityEventRepository:
+    """
+    Append-only store of activity events.
+
+    With sharded sessions the events go to the directory database, next to
+    the other cross-shard user data.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+        self._bind_arguments: dict[str, Any] = (
+            {"shard_id": DIRECTORY_SHARD} if "shard_ring" in session.info else {}
+        )
+
+    async def add_many(self, events: list[ActivityEventDTO]) -> None:
+        """
+        Append events with as few round trips as the driver allows.
+
+        asyncpg streams them with COPY; other drivers get a multi-row
+        INSERT through SQLAlchemy's batched executemany.
+
+        Args:
+            events: Events to store
+        """
+        if not events:
+            return
+        records = [
+            (event.user_id, event.type.value, event.client_ip, event.occurred_at)
+            for event in events
+        ]
+        conn = await self._session.connection(bind_arguments=self._bind_arguments)
+
+        if conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg":
+            raw = await conn.get_raw_connection()
+            driver_connection: Any = raw.driver_connection
+            await driver_connection.copy_records_to_table(
+                _events.name, records=records, columns=list(_COLUMNS)
+            )
+            return
+
+        rows = [dict(zip(_COLUMNS, record, strict=True)) for record in records]
+        await conn.execute(insert(_events), rows)
@@ -0,0 +1,253 @@
+"""Request-coalescing loader for user point lookups."""
+
+import asyncio
+import contextvars
+import dataclasses
+from collections.abc import AsyncIterator, Hashable
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, cast
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.dto.user import UserCredentialsDTO, UserResponseDTO
+from src.application.interfaces.user_repository import IUserRepository
+from src.domain.models.user import User
+from src.infrastructure.db.repositories.sharded_user import user_repository_for
+from src.infrastructure.db.routing import is_pinned_to_primary, pin_to_primary
+from src.infrastructure.metrics import registry
+
+LOADER_QUERIES = registry.counter(
+    "user_loader_queries_total", "Batched user queries issued by the loader", ["field"]
+)
+LOADER_KEYS = registry.counter(
+    "user_loader_keys_total", "Distinct keys resolved by the loader", ["field"]
+)
+LOADER_COALESCED = registry.counter(
+    "user_loader_coalesced_total", "Lookups that joined a queued or in-flight load", ["field"]
+)
+
+# Lookup kind -> (repository batch method, attribute to match results on)
+_FETCHERS = {
+    "id": ("get_many_by_ids", "id"),
+    "email": ("get_many_by_emails", "email"),
+    "username": ("get_many_by_usernames", "username"),
+    "profile": ("get_profiles_by_ids", "id"),
+}
+_MAX_BATCH_SIZE = 500
+
+
+class UserLoader:
+    """
+    Coalesces user lookups made within one event-loop tick.
+
+    Lookups are queued per key type and dispatched with ``call_soon``, so
+    every lookup made by tasks that run in the same tick lands in one
+    ``IN (...)`` query. Concurrent lookups of the same key share a single
+    future while it is queued or in flight; each caller still gets its own
+    copy of a mutable ``User``. Each batch runs in its own
+    short-lived session, so only committed data is visible.
+
+    Batches run in a fresh context rather than the first caller's, so the
+    query accounting and primary pin of one request don't spill into the
+    others sharing the batch. A batch reads from the primary if any of its
+    keys was queued by a caller pinned to it.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self._session_factory = session_factory
+        self._queued: dict[str, dict[Hashable, asyncio.Future[Any]]] = {
+            field: {} for field in _FETCHERS
+        }
+        self._in_flight: dict[str, dict[Hashable, asyncio.Future[Any]]] = {
+            field: {} for field in _FETCHERS
+        }
+        # Queued keys asked for by callers pinned to the primary
+        self._pinned: dict[str, set[Hashable]] = {field: set() for field in _FETCHERS}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, field: str, key: Hashable) -> Any:
+        """Load one user by ``id``, ``email`` or ``username``, or a ``profile`` by id."""
+        pinned = is_pinned_to_primary()
+        future = self._queued[field].get(key)
+        # An in-flight load may be reading a replica, too stale for a pinned caller
+        if future is None and not pinned:
+            future = self._in_flight[field].get(key)
+        if future is not None:
+            LOADER_COALESCED.inc(field=field)
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            if not self._queued[field]:
+                loop.call_soon(self._dispatch, field, context=contextvars.Context())
+            self._queued[field][key] = future
+        if pinned:
+            self._pinned[field].add(key)
+        # Shield so one cancelled waiter doesn't cancel the shared result
+        result = await asyncio.shield(future)
+        # Don't let one request's changes to a shared User leak into another's
+        return dataclasses.replace(result) if isinstance(result, User) else result
+
+    async def load_user(self, field: str, key: Hashable) -> User | None:
+        """Load one user by ``id``, ``email`` or ``username``."""
+        return cast(User | None, await self.load(field, key))
+
+    async def load_profile(self, user_id: int) -> UserResponseDTO | None:
+        """Load the public profile of one user."""
+        return cast(UserResponseDTO | None, await self.load("profile", user_id))
+
+    def _dispatch(self, field: str) -> None:
+        batch = self._queued[field]
+        pinned = self._pinned[field]
+        self._queued[field] = {}
+        self._pinned[field] = set()
+        self._in_flight[field].update(batch)
+        keys = list(batch)
+        for start in range(0, len(keys), _MAX_BATCH_SIZE):
+            chunk = {key: batch[key] for key in keys[start : start + _MAX_BATCH_SIZE]}
+            # Each task copies the fresh context, so a pin stays within its chunk
+            task = asyncio.ensure_future(self._run(field, chunk, not pinned.isdisjoint(chunk)))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(
+        self, field: str, batch: dict[Hashable, asyncio.Future[Any]], pinned: bool
+    ) -> None:
+        if pinned:
+            pin_to_primary()
+        LOADER_QUERIES.inc(field=field)
+        LOADER_KEYS.inc(len(batch), field=field)
+        method, attribute = _FETCHERS[field]
+        try:
+            async with self._session_factory() as session:
+                fetch = getattr(user_repository_for(session), method)
+                rows = await fetch(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            found = {getattr(row, attribute): row for row in rows}
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(found.get(key))
+        finally:
+            for key in batch:
+                self._in_flight[field].pop(key, None)
+
+
+class CoalescingUserRepository(IUserRepository):
+    """
+    Repository that routes point reads through a shared UserLoader.
+
+    Requests pinned to the primary bypass the loader: its shared batches run
+    on their own sessions and may be routed to a lagging replica.
+    """
+
+    def __init__(self, loader: UserLoader, repository: IUserRepository):
+        self._loader = loader
+        self._repository = repository
+
+    async def create(self, user: User) -> User:
+        """Persist a new user."""
+        return await self._repository.create(user)
+
+    async def create_unique(self, user: User) -> User:
+        """Persist a new user in a single statement, rejecting duplicates."""
+        return await self._repository.create_unique(user)
+
+    async def import_many(self, users: list[User]) -> set[str]:
+        """Persist many new users at once, skipping existing ones."""
+        return await self._repository.import_many(users)
+
+    async def get_by_id(self, user_id: int) -> User | None:
+        """Retrieve a user by their ID through the loader."""
+        if is_pinned_to_primary():
+            return await self._repository.get_by_id(user_id)
+        return await self._loader.load_user("id", user_id)
+
+    async def get_many_by_ids(self, user_ids: list[int]) -> list[User]:
+        """Retrieve all users with the given IDs in one query."""
+        return await self._repository.get_many_by_ids(user_ids)
+
+    async def get_by_email(self, email: str) -> User | None:
+        """Retrieve a user by their email through the loader."""
+        if is_pinned_to_primary():
+            return await self._repository.get_by_email(email)
+        return await self._loader.load_user("email", email)
+
+    async def get_many_by_emails(self, emails: list[str]) -> list[User]:
+        """Retrieve all users with the given emails in one query."""
+        return await self._repository.get_many_by_emails(emails)
+
+    async def get_by_username(self, username: str) -> User | None:
+        """Retrieve a user by their username through the loader."""
+        if is_pinned_to_primary():
+            return await self._repository.get_by_username(username)
+        return await self._loader.load_user("username", username)
+
+    async def get_many_by_usernames(self, usernames: list[str]) -> list[User]:
+        """Retrieve all users with the given usernames in one query."""
+        return await self._repository.get_many_by_usernames(usernames)
+
+    async def get_by_email_or_username(self, email: str, username: str) -> User | None:
+        """Retrieve a user matching either the email or the username."""
+        return await self._repository.get_by_email_or_username(email, username)
+
+    async def get_profile_by_id(self, user_id: int) -> UserResponseDTO | None:
+        """Retrieve the public profile columns of a user through the loader."""
+        if is_pinned_to_primary():
+            return await self._repository.get_profile_by_id(user_id)
+        return await self._loader.load_profile(user_id)
+
+    async def get_profiles_by_ids(self, user_ids: list[int]) -> list[UserResponseDTO]:
+        """Retrieve the public profile columns of many users in one query."""
+        return await self._repository.get_profiles_by_ids(user_ids)
+
+    async def search_profiles(self, query: str, limit: int) -> list[UserResponseDTO]:
+        """Find profiles by email or username prefix, then by substring."""
+        return await self._repository.search_profiles(query, limit)
+
+    async def list_profiles(
+        self, limit: int, after: tuple[datetime, int] | None = None
+    ) -> list[UserResponseDTO]:
+        """Retrieve one page of public profiles ordered by (created_at, id)."""
+        return await self._repository.list_profiles(limit, after)
+
+    def stream_profiles(self, batch_size: int = 1000) -> AsyncIterator[UserResponseDTO]:
+        """Iterate over all public profiles through a server-side cursor."""
+        return self._repository.stream_profiles(batch_size)
+
+    async def get_credentials_by_email(self, email: str) -> UserCredentialsDTO | None:
+        """Retrieve only the columns needed to authenticate a user."""
+        return await self._repository.get_credentials_by_email(email)
+
+    async def update_password(self, user_id: int, hashed_password: str) -> None:
+        """Replace a user's stored password hash."""
+        await self._repository.update_password(user_id, hashed_password)
+
+    async def update_last_login_many(self, last_logins: dict[int, datetime]) -> None:
+        """Set the last login time of many users in one write."""
+        await self._repository.update_last_login_many(last_logins)
+
+    async def update(self, user: User) -> User:
+        """Update an existing user."""
+        return await self._repository.update(user)
+
+    async def update_many(self, users: list[User]) -> list[User]:
+        """Update many existing users in one statement."""
+        return await self._repository.update_many(users)
+
+    async def delete(self, user_id: int) -> bool:
+        """Delete a user by their ID."""
+        return await self._repository.delete(user_id)
+
+    async def delete_many(self, user_ids: list[int]) -> list[int]:
+        """Delete many users in one statement."""
+        return await self._repository.delete_many(user_ids)
+
+
+@lru_cache
+def get_user_loader(session_factory: async_sessionmaker[AsyncSession]) -> UserLoader:
+    """Get the process-wide loader for a session factory."""
+    return UserLoader(session_factory)
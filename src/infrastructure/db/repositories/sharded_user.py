@@ -0,0 +1,355 @@
+"""Hash-sharded user repository implementation."""
+
+import heapq
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, cast
+
+from sqlalchemy import (
+    Executable,
+    Result,
+    Table,
+    bindparam,
+    case,
+    delete,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.dto.user import UserCredentialsDTO, UserResponseDTO
+from src.application.interfaces.user_repository import IUserRepository
+from src.domain.exceptions import UserAlreadyExistsError
+from src.domain.models.user import User
+from src.infrastructure.db.models.user_directory import UserDirectoryModel
+from src.infrastructure.db.repositories.user import (
+    _UPSERT_INSERTS,
+    UserRepository,
+    _persisted_id,
+    _search_rows,
+)
+from src.infrastructure.db.sharding import DIRECTORY_SHARD, HashRing
+
+_directory = cast(Table, UserDirectoryModel.__table__)
+
+_ID_BY_EMAIL = select(_directory.c.id).where(_directory.c.email == bindparam("email"))
+_ID_BY_USERNAME = select(_directory.c.id).where(_directory.c.username == bindparam("username"))
+_IDS_BY_EMAILS = select(_directory.c.id).where(
+    _directory.c.email.in_(bindparam("emails", expanding=True))
+)
+_IDS_BY_USERNAMES = select(_directory.c.id).where(
+    _directory.c.username.in_(bindparam("usernames", expanding=True))
+)
+_ID_BY_EMAIL_OR_USERNAME = (
+    select(_directory.c.id)
+    .where(
+        or_(
+            _directory.c.email == bindparam("email"),
+            _directory.c.username == bindparam("username"),
+        )
+    )
+    .limit(1)
+)
+
+
+class ShardedUserRepository(IUserRepository):
+    """
+    User repository spreading users over shards by a hash of their ID.
+
+    The directory database hands out IDs and maps emails and usernames to
+    IDs, so every lookup is at most one directory query plus one query on
+    the owning shard. Writes touch the directory first, so a statement
+    failing on the shard rolls both back with the session. The session
+    commits the directory and the shards one after the other, though, not
+    atomically: if a commit fails after the directory's went through, a
+    new user's email and username stay reserved without a user row, and
+    a deleted user's row outlives its directory entry.
+    """
+
+    def __init__(self, session: AsyncSession, ring: HashRing):
+        self._session = session
+        self._ring = ring
+        self._shards = {shard_id: UserRepository(session, shard_id) for shard_id in ring.shard_ids}
+
+    def _shard(self, user_id: int) -> UserRepository:
+        return self._shards[self._ring.shard_for(user_id)]
+
+    async def _directory_execute(
+        self, statement: Executable, parameters: Any = None
+    ) -> Result[Any]:
+        return await self._session.execute(
+            statement, parameters, bind_arguments={"shard_id": DIRECTORY_SHARD}
+        )
+
+    async def _reserve_id(self, user: User) -> int | None:
+        """Insert the directory entry of a new user; None if email or username is taken."""
+        values = {"email": user.email, "username": user.username}
+        dialect = self._session.get_bind(shard_id=DIRECTORY_SHARD).dialect
+        dialect_insert = _UPSERT_INSERTS.get(dialect.name)
+
+        if dialect_insert is not None:
+            stmt = (
+                dialect_insert(_directory)
+                .values(**values)
+                .on_conflict_do_nothing()
+                .returning(_directory.c.id)
+            )
+            return (await self._directory_execute(stmt)).scalar_one_or_none()
+
+        try:
+            async with self._session.begin_nested():
+                stmt = insert(_directory).values(**values).returning(_directory.c.id)
+                user_id: int = (await self._directory_execute(stmt)).scalar_one()
+                return user_id
+        except IntegrityError:
+            return None
+
+    async def create(self, user: User) -> User:
+        """Persist a new user on the shard owning its newly reserved ID."""
+        stmt = (
+            insert(_directory)
+            .values(email=user.email, username=user.username)
+            .returning(_directory.c.id)
+        )
+        user_id = (await self._directory_execute(stmt)).scalar_one()
+        return await self._shard(user_id).create(replace(user, id=user_id))
+
+    async def create_unique(self, user: User) -> User:
+        """Reserve email, username and ID in the directory, then insert on the shard."""
+        user_id = await self._reserve_id(user)
+
+        if user_id is None:
+            taken = (await self._directory_execute(_ID_BY_EMAIL, {"email": user.email})).first()
+            raise UserAlreadyExistsError(user.email if taken else user.username)
+
+        return await self._shard(user_id).create_unique(replace(user, id=user_id))
+
+    async def import_many(self, users: list[User]) -> set[str]:
+        """Reserve directory entries in one statement, then import per shard."""
+        if not users:
+            return set()
+        rows = [{"email": user.email, "username": user.username} for user in users]
+        dialect = self._session.get_bind(shard_id=DIRECTORY_SHARD).dialect
+        dialect_insert = _UPSERT_INSERTS.get(dialect.name)
+
+        if dialect_insert is not None:
+            stmt = (
+                dialect_insert(_directory)
+                .values(rows)
+                .on_conflict_do_nothing()
+                .returning(_directory.c.id, _directory.c.email)
+            )
+            result = await self._directory_execute(stmt)
+            ids = {row.email: row.id for row in result}
+        else:
+            ids = {}
+            for user in users:
+                user_id = await self._reserve_id(user)
+                if user_id is not None:
+                    ids[user.email] = user_id
+
+        by_shard: dict[str, list[User]] = {}
+        for user in users:
+            if user.email in ids:
+                user_id = ids[user.email]
+                by_shard.setdefault(self._ring.shard_for(user_id), []).append(
+                    replace(user, id=user_id)
+                )
+
+        inserted: set[str] = set()
+        for shard_id, shard_users in by_shard.items():
+            inserted |= await self._shards[shard_id].import_many(shard_users)
+
+        # Release entries whose user the shard skipped, or they would block
+        # the email and username while pointing at no user
+        orphaned = [user_id for email, user_id in ids.items() if email not in inserted]
+        if orphaned:
+            await self._directory_execute(
+                delete(_directory).where(_directory.c.id.in_(orphaned))
+            )
+        return inserted
+
+    async def get_by_id(self, user_id: int) -> User | None:
+        """Retrieve a user from the shard owning the ID."""
+        return await self._shard(user_id).get_by_id(user_id)
+
+    async def get_many_by_ids(self, user_ids: list[int]) -> list[User]:
+        """Retrieve users with one query per shard involved."""
+        users: list[User] = []
+        for shard_id, ids in self._ring.group(set(user_ids)).items():
+            users.extend(await self._shards[shard_id].get_many_by_ids(ids))
+        return users
+
+    async def get_by_email(self, email: str) -> User | None:
+        """Resolve the email in the directory, then read the owning shard."""
+        user_id = (await self._directory_execute(_ID_BY_EMAIL, {"email": email})).scalar()
+        return await self.get_by_id(user_id) if user_id is not None else None
+
+    async def get_by_username(self, username: str) -> User | None:
+        """Resolve the username in the directory, then read the owning shard."""
+        result = await self._directory_execute(_ID_BY_USERNAME, {"username": username})
+        user_id = result.scalar()
+        return await self.get_by_id(user_id) if user_id is not None else None
+
+    async def get_many_by_emails(self, emails: list[str]) -> list[User]:
+        """Resolve emails in one directory query, then read the owning shards."""
+        if not emails:
+            return []
+        result = await self._directory_execute(_IDS_BY_EMAILS, {"emails": list(set(emails))})
+        return await self.get_many_by_ids(list(result.scalars()))
+
+    async def get_many_by_usernames(self, usernames: list[str]) -> list[User]:
+        """Resolve usernames in one directory query, then read the owning shards."""
+        if not usernames:
+            return []
+        result = await self._directory_execute(
+            _IDS_BY_USERNAMES, {"usernames": list(set(usernames))}
+        )
+        return await self.get_many_by_ids(list(result.scalars()))
+
+    async def get_by_email_or_username(self, email: str, username: str) -> User | None:
+        """Retrieve a user matching either the email or the username."""
+        result = await self._directory_execute(
+            _ID_BY_EMAIL_OR_USERNAME, {"email": email, "username": username}
+        )
+        user_id = result.scalar()
+        return await self.get_by_id(user_id) if user_id is not None else None
+
+    async def get_profile_by_id(self, user_id: int) -> UserResponseDTO | None:
+        """Retrieve the public profile columns from the shard owning the ID."""
+        return await self._shard(user_id).get_profile_by_id(user_id)
+
+    async def get_profiles_by_ids(self, user_ids: list[int]) -> list[UserResponseDTO]:
+        """Retrieve public profiles with one query per shard involved."""
+        profiles: list[UserResponseDTO] = []
+        for shard_id, ids in self._ring.group(set(user_ids)).items():
+            profiles.extend(await self._shards[shard_id].get_profiles_by_ids(ids))
+        return profiles
+
+    async def search_profiles(self, query: str, limit: int) -> list[UserResponseDTO]:
+        """Search the directory, then read the matching profiles from their shards."""
+        dialect = self._session.get_bind(shard_id=DIRECTORY_SHARD).dialect
+        rows = await _search_rows(
+            self._directory_execute,
+            _directory,
+            (_directory.c.id, _directory.c.username),
+            query,
+            limit,
+            dialect.name,
+        )
+        profiles = {
+            profile.id: profile
+            for profile in await self.get_profiles_by_ids([row.id for row in rows])
+        }
+        return [profiles[row.id] for row in rows if row.id in profiles]
+
+    async def list_profiles(
+        self, limit: int, after: tuple[datetime, int] | None = None
+    ) -> list[UserResponseDTO]:
+        """Merge the next page of every shard and keep the first ``limit`` profiles."""
+        pages = [await shard.list_profiles(limit, after) for shard in self._shards.values()]
+        merged = heapq.merge(*pages, key=lambda profile: (profile.created_at, profile.id))
+        return list(merged)[:limit]
+
+    async def stream_profiles(self, batch_size: int = 1000) -> AsyncIterator[UserResponseDTO]:
+        """Iterate over all public profiles, one shard after the other."""
+        for shard in self._shards.values():
+            async for profile in shard.stream_profiles(batch_size):
+                yield profile
+
+    async def get_credentials_by_email(self, email: str) -> UserCredentialsDTO | None:
+        """Resolve the email in the directory, then read credentials from the shard."""
+        user_id = (await self._directory_execute(_ID_BY_EMAIL, {"email": email})).scalar()
+        if user_id is None:
+            return None
+        return await self._shard(user_id).get_credentials_by_email(email)
+
+    async def update_password(self, user_id: int, hashed_password: str) -> None:
+        """Replace a user's stored password hash on its shard."""
+        await self._shard(user_id).update_password(user_id, hashed_password)
+
+    async def update_last_login_many(self, last_logins: dict[int, datetime]) -> None:
+        """Set last login times with one statement per shard involved."""
+        for shard_id, ids in self._ring.group(last_logins).items():
+            await self._shards[shard_id].update_last_login_many(
+                {user_id: last_logins[user_id] for user_id in ids}
+            )
+
+    async def update(self, user: User) -> User:
+        """Update the directory entry and the user row on its shard."""
+        user_id = _persisted_id(user)
+        stmt = (
+            update(_directory)
+            .where(_directory.c.id == user_id)
+            .values(email=user.email, username=user.username)
+            .returning(_directory.c.id)
+        )
+        if (await self._directory_execute(stmt)).first() is None:
+            raise ValueError(f"User with id {user_id} not found")
+        return await self._shard(user_id).update(user)
+
+    async def update_many(self, users: list[User]) -> list[User]:
+        """Update directory entries in one statement, then users per shard."""
+        if not users:
+            return []
+        by_id = {_persisted_id(user): user for user in users}
+        values = {
+            column: case(
+                {user_id: getattr(user, column) for user_id, user in by_id.items()},
+                value=_directory.c.id,
+            )
+            for column in ("email", "username")
+        }
+        stmt = (
+            update(_directory)
+            .where(_directory.c.id.in_(list(by_id)))
+            .values(**values)
+            .returning(_directory.c.id)
+        )
+        missing = set(by_id) - set((await self._directory_execute(stmt)).scalars())
+        if missing:
+            raise ValueError(f"Users with ids {sorted(missing)} not found")
+
+        updated: list[User] = []
+        for shard_id, ids in self._ring.group(by_id).items():
+            updated.extend(
+                await self._shards[shard_id].update_many([by_id[user_id] for user_id in ids])
+            )
+        return updated
+
+    async def delete(self, user_id: int) -> bool:
+        """Delete the user from its shard and release its directory entry."""
+        stmt = delete(_directory).where(_directory.c.id == user_id)
+        await self._directory_execute(stmt)
+        return await self._shard(user_id).delete(user_id)
+
+    async def delete_many(self, user_ids: list[int]) -> list[int]:
+        """Delete users shard by shard and release their directory entries."""
+        if not user_ids:
+            return []
+        stmt = delete(_directory).where(_directory.c.id.in_(set(user_ids)))
+        await self._directory_execute(stmt)
+        deleted: list[int] = []
+        for shard_id, ids in self._ring.group(set(user_ids)).items():
+            deleted.extend(await self._shards[shard_id].delete_many(ids))
+        return deleted
+
+
+def user_repository_for(session: AsyncSession) -> IUserRepository:
+    """
+    Build the user repository matching how a session is bound.
+
+    Args:
+        session: Plain session, or one from ``sharded_sessionmaker``
+
+    Returns:
+        ShardedUserRepository for sharded sessions, else UserRepository
+    """
+    ring: HashRing | None = session.info.get("shard_ring")
+    if ring is None:
+        return UserRepository(session)
+    return ShardedUserRepository(session, ring)
@@ -1,18 +1,169 @@
 """User repository implementation."""
 
-from sqlalchemy import select
+from collections.abc import AsyncIterator, Callable
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, cast
+
+from sqlalchemy import (
+    BindParameter,
+    Column,
+    Executable,
+    Result,
+    Table,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import Insert as SQLiteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.application.dto.user import UserCredentialsDTO, UserResponseDTO
 from src.application.interfaces.user_repository import IUserRepository
+from src.domain.exceptions import UserAlreadyExistsError
 from src.domain.models.user import User
 from src.infrastructure.db.models.user import UserModel
 
+# Dialects that support INSERT ... ON CONFLICT DO NOTHING
+_UPSERT_INSERTS: dict[str, Callable[[Any], PostgresqlInsert | SQLiteInsert]] = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+_users = cast(Table, UserModel.__table__)
+
+# Hot-path statements are built once at import: every call reuses the same
+# compiled SQL and returns plain rows with only the needed columns, skipping
+# ORM identity hydration and the hashed_password column where unused.
+_PROFILE_COLUMNS = (_users.c.id, _users.c.email, _users.c.username, _users.c.created_at)
+_PROFILE_BY_ID = select(*_PROFILE_COLUMNS).where(_users.c.id == bindparam("user_id"))
+_PROFILES_BY_IDS = select(*_PROFILE_COLUMNS).where(
+    _users.c.id.in_(bindparam("user_ids", expanding=True))
+)
+# Keyset pagination: seek past the last (created_at, id) instead of OFFSET
+_PROFILES_FIRST_PAGE = (
+    select(*_PROFILE_COLUMNS)
+    .order_by(_users.c.created_at, _users.c.id)
+    .limit(bindparam("limit"))
+)
+_PROFILES_PAGE_AFTER = _PROFILES_FIRST_PAGE.where(
+    tuple_(_users.c.created_at, _users.c.id)
+    > tuple_(bindparam("after_created_at"), bindparam("after_id"))
+)
+_ALL_PROFILES = select(*_PROFILE_COLUMNS).order_by(_users.c.created_at, _users.c.id)
+_CREDENTIALS_BY_EMAIL = select(_users.c.id, _users.c.email, _users.c.hashed_password).where(
+    _users.c.email == bindparam("email")
+)
+# Bulk import on asyncpg: COPY rows into a session-local staging table, then
+# move them over with one INSERT ... SELECT that skips conflicting users
+_IMPORT_COLUMNS = ("email", "username", "hashed_password", "created_at", "updated_at")
+_CREATE_IMPORT_TABLE = text(
+    "CREATE TEMPORARY TABLE IF NOT EXISTS users_import (id integer, email varchar(255), "
+    "username varchar(50), hashed_password varchar(255), created_at timestamp, "
+    "updated_at timestamp) ON COMMIT DELETE ROWS"
+)
+_CLEAR_IMPORT_TABLE = text("DELETE FROM users_import")
+
+
+def _import_from_staging(columns: tuple[str, ...]) -> Any:
+    column_list = ", ".join(columns)
+    return text(
+        f"INSERT INTO users ({column_list}) SELECT {column_list} FROM users_import "
+        "ON CONFLICT DO NOTHING RETURNING email"
+    )
+
+
+# Shortest query a trigram index can serve; shorter ones only match prefixes
+SEARCH_MIN_SUBSTRING = 3
+
+
+def _persisted_id(user: User) -> int:
+    if user.id is None:
+        raise ValueError("User has no ID; only persisted users can be updated")
+    return user.id
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def _search_rows(
+    execute: Any,
+    table: Table,
+    columns: tuple[Column[Any], ...],
+    query: str,
+    limit: int,
+    dialect_name: str,
+) -> list[Any]:
+    """
+    Run a prefix search, then a substring search for the remaining slots.
+
+    Neither statement has an ORDER BY, so each stops after ``limit`` index
+    hits instead of sorting every match. Patterns are rendered inline: with
+    a bound parameter a prepared generic plan cannot use the indexes.
+    """
+    escaped = _escape_like(query.lower())
+    prefix: BindParameter[str] = bindparam("prefix", escaped + "%", literal_execute=True)
+    searched = (table.c.email, table.c.username)
+    if dialect_name == "postgresql":
+        # Served by the lower(...) text_pattern_ops indexes
+        prefix_matches = [func.lower(column).like(prefix, escape="\\") for column in searched]
+    else:
+        # SQLite LIKE is case-insensitive and served by the NOCASE indexes
+        prefix_matches = [column.like(prefix, escape="\\") for column in searched]
+    stmt = select(*columns).where(or_(*prefix_matches)).limit(limit)
+    rows = sorted(await execute(stmt), key=lambda row: row.username)
+
+    if len(rows) < limit and len(query) >= SEARCH_MIN_SUBSTRING:
+        substring: BindParameter[str] = bindparam(
+            "substring", f"%{escaped}%", literal_execute=True
+        )
+        stmt = (
+            select(*columns)
+            .where(
+                or_(*(column.ilike(substring, escape="\\") for column in searched)),
+                table.c.id.not_in([row.id for row in rows]),
+            )
+            .limit(limit - len(rows))
+        )
+        rows += sorted(await execute(stmt), key=lambda row: row.username)
+    return rows
+
+
+_UPDATE_PASSWORD = (
+    update(_users)
+    .where(_users.c.id == bindparam("user_id"))
+    .values(hashed_password=bindparam("new_hash"))
+)
+
 
 class UserRepository(IUserRepository):
-    """SQLAlchemy implementation of user repository."""
+    """
+    SQLAlchemy implementation of user repository.
 
-    def __init__(self, session: AsyncSession):
+    With a ``shard_id`` every statement is bound to that shard of a sharded
+    session; see ShardedUserRepository.
+    """
+
+    def __init__(self, session: AsyncSession, shard_id: str | None = None):
         self._session = session
+        self._bind_arguments: dict[str, Any] = {"shard_id": shard_id} if shard_id else {}
+
+    async def _execute(self, statement: Executable, parameters: Any = None) -> Result[Any]:
+        return await self._session.execute(
+            statement, parameters, bind_arguments=self._bind_arguments
+        )
 
     def _to_domain(self, model: UserModel) -> User:
         """Convert SQLAlchemy model to domain entity."""
@@ -46,54 +197,293 @@ class UserRepository(IUserRepository):
         await self._session.refresh(model)
         return self._to_domain(model)
 
+    async def create_unique(self, user: User) -> User:
+        """Persist a new user with INSERT ... ON CONFLICT DO NOTHING RETURNING."""
+        values: dict[str, Any] = {
+            "email": user.email,
+            "username": user.username,
+            "hashed_password": user.hashed_password,
+            "created_at": user.created_at,
+            "updated_at": user.updated_at,
+        }
+        if user.id is not None:
+            values["id"] = user.id
+        dialect = self._session.get_bind(**self._bind_arguments).dialect
+        dialect_insert = _UPSERT_INSERTS.get(dialect.name)
+
+        if dialect_insert is not None:
+            stmt = (
+                dialect_insert(UserModel)
+                .values(**values)
+                .on_conflict_do_nothing()
+                .returning(UserModel.id)
+            )
+            result = await self._execute(stmt)
+            user_id = result.scalar_one_or_none()
+        else:
+            try:
+                async with self._session.begin_nested():
+                    stmt = insert(UserModel).values(**values).returning(UserModel.id)
+                    result = await self._execute(stmt)
+                    user_id = result.scalar_one()
+            except IntegrityError:
+                user_id = None
+
+        if user_id is None:
+            # Lost a race (or skipped the pre-check): report which field collided
+            existing = await self.get_by_email(user.email)
+            raise UserAlreadyExistsError(user.email if existing else user.username)
+
+        return replace(user, id=user_id)
+
+    async def import_many(self, users: list[User]) -> set[str]:
+        """
+        Persist many users with as few round trips as the driver allows.
+
+        asyncpg streams the rows with COPY into a staging table; other
+        dialects with ON CONFLICT get one multi-row INSERT; the rest fall
+        back to create_unique per user.
+        """
+        if not users:
+            return set()
+        columns = ("id", *_IMPORT_COLUMNS) if users[0].id is not None else _IMPORT_COLUMNS
+        dialect = self._session.get_bind(**self._bind_arguments).dialect
+
+        if dialect.name == "postgresql" and dialect.driver == "asyncpg":
+            conn = await self._session.connection(bind_arguments=self._bind_arguments)
+            await conn.execute(_CREATE_IMPORT_TABLE)
+            raw = await conn.get_raw_connection()
+            driver_connection: Any = raw.driver_connection
+            await driver_connection.copy_records_to_table(
+                "users_import",
+                records=[tuple(getattr(user, column) for column in columns) for user in users],
+                columns=list(columns),
+            )
+            result = await conn.execute(_import_from_staging(columns))
+            inserted = set(result.scalars())
+            await conn.execute(_CLEAR_IMPORT_TABLE)
+            return inserted
+
+        dialect_insert = _UPSERT_INSERTS.get(dialect.name)
+        if dialect_insert is not None:
+            rows = [{column: getattr(user, column) for column in columns} for user in users]
+            stmt = (
+                dialect_insert(_users)
+                .values(rows)
+                .on_conflict_do_nothing()
+                .returning(_users.c.email)
+            )
+            return set((await self._execute(stmt)).scalars())
+
+        inserted = set()
+        for user in users:
+            try:
+                await self.create_unique(user)
+            except UserAlreadyExistsError:
+                continue
+            inserted.add(user.email)
+        return inserted
+
     async def get_by_id(self, user_id: int) -> User | None:
         """Retrieve a user by their ID."""
         stmt = select(UserModel).where(UserModel.id == user_id)
-        result = await self._session.execute(stmt)
+        result = await self._execute(stmt)
         model = result.scalar_one_or_none()
         return self._to_domain(model) if model else None
 
+    async def get_many_by_ids(self, user_ids: list[int]) -> list[User]:
+        """Retrieve all users with the given IDs in one query."""
+        if not user_ids:
+            return []
+        stmt = select(UserModel).where(UserModel.id.in_(set(user_ids)))
+        result = await self._execute(stmt)
+        return [self._to_domain(model) for model in result.scalars()]
+
     async def get_by_email(self, email: str) -> User | None:
         """Retrieve a user by their email."""
         stmt = select(UserModel).where(UserModel.email == email)
-        result = await self._session.execute(stmt)
+        result = await self._execute(stmt)
         model = result.scalar_one_or_none()
         return self._to_domain(model) if model else None
 
     async def get_by_username(self, username: str) -> User | None:
         """Retrieve a user by their username."""
         stmt = select(UserModel).where(UserModel.username == username)
-        result = await self._session.execute(stmt)
+        result = await self._execute(stmt)
         model = result.scalar_one_or_none()
         return self._to_domain(model) if model else None
 
-    async def update(self, user: User) -> User:
-        """Update an existing user."""
-        stmt = select(UserModel).where(UserModel.id == user.id)
-        result = await self._session.execute(stmt)
+    async def get_many_by_emails(self, emails: list[str]) -> list[User]:
+        """Retrieve all users with the given emails in one query."""
+        if not emails:
+            return []
+        stmt = select(UserModel).where(UserModel.email.in_(set(emails)))
+        result = await self._execute(stmt)
+        return [self._to_domain(model) for model in result.scalars()]
+
+    async def get_many_by_usernames(self, usernames: list[str]) -> list[User]:
+        """Retrieve all users with the given usernames in one query."""
+        if not usernames:
+            return []
+        stmt = select(UserModel).where(UserModel.username.in_(set(usernames)))
+        result = await self._execute(stmt)
+        return [self._to_domain(model) for model in result.scalars()]
+
+    async def get_by_email_or_username(self, email: str, username: str) -> User | None:
+        """Retrieve a user matching either the email or the username."""
+        stmt = (
+            select(UserModel)
+            .where(or_(UserModel.email == email, UserModel.username == username))
+            .limit(1)
+        )
+        result = await self._execute(stmt)
         model = result.scalar_one_or_none()
+        return self._to_domain(model) if model else None
 
-        if model:
-            model.email = user.email
-            model.username = user.username
-            model.hashed_password = user.hashed_password
-            model.updated_at = user.updated_at
-            await self._session.flush()
-            await self._session.refresh(model)
-            return self._to_domain(model)
+    async def get_profile_by_id(self, user_id: int) -> UserResponseDTO | None:
+        """Retrieve only the public profile columns of a user."""
+        row = (await self._execute(_PROFILE_BY_ID, {"user_id": user_id})).first()
+        return UserResponseDTO(**row._mapping) if row else None
 
-        raise ValueError(f"User with id {user.id} not found")
+    async def get_profiles_by_ids(self, user_ids: list[int]) -> list[UserResponseDTO]:
+        """Retrieve the public profile columns of many users in one query."""
+        if not user_ids:
+            return []
+        result = await self._execute(_PROFILES_BY_IDS, {"user_ids": list(set(user_ids))})
+        return [UserResponseDTO(**row._mapping) for row in result]
 
-    async def delete(self, user_id: int) -> bool:
-        """Delete a user by their ID."""
-        stmt = select(UserModel).where(UserModel.id == user_id)
-        result = await self._session.execute(stmt)
-        model = result.scalar_one_or_none()
+    async def search_profiles(self, query: str, limit: int) -> list[UserResponseDTO]:
+        """Find profiles by email or username prefix, then by substring."""
+        dialect = self._session.get_bind(**self._bind_arguments).dialect
+        rows = await _search_rows(
+            self._execute, _users, _PROFILE_COLUMNS, query, limit, dialect.name
+        )
+        return [UserResponseDTO(**row._mapping) for row in rows]
+
+    async def list_profiles(
+        self, limit: int, after: tuple[datetime, int] | None = None
+    ) -> list[UserResponseDTO]:
+        """Retrieve one page of public profiles ordered by (created_at, id)."""
+        if after is None:
+            result = await self._execute(_PROFILES_FIRST_PAGE, {"limit": limit})
+        else:
+            result = await self._execute(
+                _PROFILES_PAGE_AFTER,
+                {"limit": limit, "after_created_at": after[0], "after_id": after[1]},
+            )
+        return [UserResponseDTO(**row._mapping) for row in result]
+
+    async def stream_profiles(self, batch_size: int = 1000) -> AsyncIterator[UserResponseDTO]:
+        """Iterate over all public profiles through a server-side cursor."""
+        result = await self._session.stream(
+            _ALL_PROFILES,
+            execution_options={"yield_per": batch_size},
+            bind_arguments=self._bind_arguments,
+        )
+        async for row in result:
+            yield UserResponseDTO(**row._mapping)
+
+    async def get_credentials_by_email(self, email: str) -> UserCredentialsDTO | None:
+        """Retrieve only the columns needed to authenticate a user."""
+        row = (await self._execute(_CREDENTIALS_BY_EMAIL, {"email": email})).first()
+        return UserCredentialsDTO(**row._mapping) if row else None
 
-        if model:
-            await self._session.delete(model)
-            await self._session.flush()
-            return True
+    async def update_password(self, user_id: int, hashed_password: str) -> None:
+        """Replace a user's stored password hash."""
+        await self._execute(_UPDATE_PASSWORD, {"user_id": user_id, "new_hash": hashed_password})
 
-        return False
+    async def update_last_login_many(self, last_logins: dict[int, datetime]) -> None:
+        """Set many last login times with a single UPDATE ... CASE."""
+        if not last_logins:
+            return
+        stmt = (
+            update(_users)
+            .where(_users.c.id.in_(list(last_logins)))
+            .values(last_login_at=case(last_logins, value=_users.c.id))
+        )
+        await self._execute(stmt)
 
+    def _row_to_domain(self, row: Any) -> User:
+        """Convert a full users row to a domain entity."""
+        return User(
+            id=row.id,
+            email=row.email,
+            username=row.username,
+            hashed_password=row.hashed_password,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+
+    @staticmethod
+    def _update_values(user: User) -> dict[str, Any]:
+        values: dict[str, Any] = {
+            "email": user.email,
+            "username": user.username,
+            "hashed_password": user.hashed_password,
+        }
+        # Leaving updated_at out lets the column's onupdate default stamp it
+        if user.updated_at is not None:
+            values["updated_at"] = user.updated_at
+        return values
+
+    async def update(self, user: User) -> User:
+        """Update an existing user with a single UPDATE ... RETURNING."""
+        stmt = (
+            update(_users)
+            .where(_users.c.id == user.id)
+            .values(**self._update_values(user))
+            .returning(*_users.c)
+        )
+        row = (await self._execute(stmt)).first()
+
+        if row is None:
+            raise ValueError(f"User with id {user.id} not found")
+
+        return self._row_to_domain(row)
+
+    async def update_many(self, users: list[User]) -> list[User]:
+        """Update many users with one UPDATE ... SET col = CASE id ... RETURNING."""
+        if not users:
+            return []
+        by_id = {_persisted_id(user): user for user in users}
+        now = datetime.utcnow()
+        rows = {
+            user_id: {**self._update_values(user), "updated_at": user.updated_at or now}
+            for user_id, user in by_id.items()
+        }
+        values = {
+            column: case(
+                {user_id: row[column] for user_id, row in rows.items()},
+                value=_users.c.id,
+            )
+            for column in ("email", "username", "hashed_password", "updated_at")
+        }
+        stmt = (
+            update(_users)
+            .where(_users.c.id.in_(list(by_id)))
+            .values(**values)
+            .returning(*_users.c)
+        )
+        updated = [self._row_to_domain(row) for row in await self._execute(stmt)]
+
+        missing = set(by_id) - {_persisted_id(user) for user in updated}
+        if missing:
+            raise ValueError(f"Users with ids {sorted(missing)} not found")
+
+        return updated
+
+    async def delete(self, user_id: int) -> bool:
+        """Delete a user with a single DELETE ... RETURNING."""
+        stmt = delete(_users).where(_users.c.id == user_id).returning(_users.c.id)
+        return (await self._execute(stmt)).first() is not None
+
+    async def delete_many(self, user_ids: list[int]) -> list[int]:
+        """Delete many users with a single DELETE ... WHERE id IN (...) RETURNING."""
+        if not user_ids:
+            return []
+        stmt = (
+            delete(_users)
+            .where(_users.c.id.in_(set(user_ids)))
+            .returning(_users.c.id)
+        )
+        return list((await self._execute(stmt)).scalars())
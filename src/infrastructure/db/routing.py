@@ -0,0 +1,95 @@
+"""Read routing between the primary database and read replicas."""
+
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from src.infrastructure.metrics import registry
+
+READ_ROUTES = registry.counter(
+    "db_read_routes_total", "Read-only statements routed per target", ["target"]
+)
+REPLICAS_HEALTHY = registry.gauge("db_replicas_healthy", "Read replicas currently in rotation")
+
+_primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+
+def pin_to_primary() -> None:
+    """Send the remaining reads of the current request to the primary."""
+    _primary_pinned.set(True)
+
+
+def is_pinned_to_primary() -> bool:
+    """Check whether reads of the current request must use the primary."""
+    return _primary_pinned.get()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _pin_after_write_statement(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        pin_to_primary()
+
+
+@event.listens_for(Session, "after_flush")
+def _pin_after_flush(_session: Session, _flush_context: Any) -> None:
+    pin_to_primary()
+
+
+class ReplicaRouter:
+    """
+    Round-robin chooser over read replicas that skips unhealthy ones.
+
+    A replica that fails to serve a statement is taken out of rotation for
+    ``retry_seconds``. Reads fall back to the primary when the request is
+    pinned or no replica is healthy.
+    """
+
+    def __init__(self, primary: AsyncEngine, replicas: list[AsyncEngine], retry_seconds: float):
+        self.primary = primary
+        self._replicas = replicas
+        self._retry_seconds = retry_seconds
+        self._down_until = [0.0] * len(replicas)
+        self._next = 0
+        REPLICAS_HEALTHY.set(len(replicas))
+
+    def engine_for_read(self) -> AsyncEngine:
+        """Pick the engine for the next read-only statement."""
+        if self._replicas and not is_pinned_to_primary():
+            now = time.monotonic()
+            for _ in range(len(self._replicas)):
+                index = self._next % len(self._replicas)
+                self._next += 1
+                if self._down_until[index] <= now:
+                    READ_ROUTES.inc(target="replica")
+                    return self._replicas[index]
+        READ_ROUTES.inc(target="primary")
+        return self.primary
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        """Take a replica out of rotation after a connection failure."""
+        now = time.monotonic()
+        for index, replica in enumerate(self._replicas):
+            if replica is engine:
+                self._down_until[index] = now + self._retry_seconds
+        REPLICAS_HEALTHY.set(sum(1 for until in self._down_until if until <= now))
+
+
+class RoutingSession(Session):
+    """
+    Sync session that asks a ReplicaRouter for the bind of each transaction.
+
+    Without a ``read_router`` in ``info`` it behaves like a plain Session.
+    """
+
+    def get_bind(self, mapper: Any = None, **kw: Any) -> Engine | Connection:
+        router: ReplicaRouter | None = self.info.get("read_router")
+        if router is None:
+            return super().get_bind(mapper, **kw)
+        engine = router.primary if self.info.get("force_primary") else router.engine_for_read()
+        self.info["last_bind"] = engine
+        return engine.sync_engine
@@ -1,37 +1,273 @@
 """Database session configuration."""
 
-from collections.abc import AsyncGenerator
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Annotated, Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Depends
+from sqlalchemy import text
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import QueuePool
 
-from src.infrastructure.config import get_settings
+from src.infrastructure.config import Settings, get_settings
+from src.infrastructure.db.pool import create_pooled_engine
+from src.infrastructure.db.routing import ReplicaRouter, RoutingSession
+from src.infrastructure.db.sharding import HashRing, sharded_sessionmaker
+from src.infrastructure.db.sqlite import SQLiteSplitSession, create_sqlite_engines, is_sqlite_file
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True,
-)
 
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+class ReadOnlyAsyncSession(AsyncSession):
+    """
+    Session for read-only work that holds a connection only per statement.
 
+    The connection is checked out lazily by each statement and returned to
+    the pool as soon as its (pre-buffered) result is available, so a request
+    doing CPU work after its lookups does not pin a connection. Loaded
+    objects stay usable; they are detached, not expired.
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    With a ``read_router`` in ``info`` each statement may go to a different
+    replica; a replica that fails is taken out of rotation and the
+    statement is retried once on the primary.
+    """
+
+    async def _run(self, method: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        try:
+            try:
+                return await method(*args, **kwargs)
+            except (OperationalError, InterfaceError, OSError):
+                router: ReplicaRouter | None = self.info.get("read_router")
+                failed = self.info.get("last_bind")
+                if router is None or failed is None or failed is router.primary:
+                    raise
+                router.mark_down(failed)
+                await self.close()
+                self.info["force_primary"] = True
+                try:
+                    return await method(*args, **kwargs)
+                finally:
+                    self.info["force_primary"] = False
+        finally:
+            await self.close()
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(super().execute, *args, **kwargs)
+
+    async def scalar(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(super().scalar, *args, **kwargs)
+
+    async def scalars(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(super().scalars, *args, **kwargs)
+
+    async def get(self, *args: Any, **kwargs: Any) -> Any:
+        return await self._run(super().get, *args, **kwargs)
+
+    async def flush(self, objects: Any = None) -> None:  # noqa: ARG002 - AsyncSession.flush signature
+        raise RuntimeError("Read-only session cannot flush changes")
+
+
+@dataclass
+class Database:
+    """Engines and session factories of the process."""
+
+    engine: AsyncEngine
+    readonly_engine: AsyncEngine
+    read_router: ReplicaRouter
+    session_factory: async_sessionmaker[AsyncSession]
+    readonly_session_factory: async_sessionmaker[ReadOnlyAsyncSession]
+    replica_engines: list[AsyncEngine] = field(default_factory=list)
+    shard_engines: dict[str, AsyncEngine] = field(default_factory=dict)
+    shard_ring: HashRing | None = None
+
+    @property
+    def engines(self) -> list[AsyncEngine]:
+        """Every engine with a pool of its own."""
+        engines = [self.engine, *self.replica_engines, *self.shard_engines.values()]
+        if self.readonly_engine.sync_engine.pool is not self.engine.sync_engine.pool:
+            engines.append(self.readonly_engine)
+        return engines
+
+    async def warm_up(self) -> None:
+        """Open every pool's persistent connections so requests don't pay the connects."""
+
+        async def ping(engine: AsyncEngine) -> None:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        for engine in self.engines:
+            pool = engine.sync_engine.pool
+            # Concurrent pings check out distinct connections
+            size = pool.size() if isinstance(pool, QueuePool) else 1
+            await asyncio.gather(*(ping(engine) for _ in range(size)))
+
+    async def dispose(self) -> None:
+        """Close the connections of every pool."""
+        for engine in self.engines:
+            await engine.dispose()
+
+
+def create_database(settings: Settings) -> Database:
+    """
+    Create the engines and session factories for the configured databases.
+
+    Engines connect lazily, so nothing is opened until the first statement
+    or ``Database.warm_up()``.
+
+    Args:
+        settings: Application settings with the database configuration
+
+    Returns:
+        The database of the process
+    """
+    # Single-node installs on an SQLite file get one writer and pooled readers
+    sqlite_profile = is_sqlite_file(settings.database_url)
+
+    if sqlite_profile:
+        engine, readonly_engine = create_sqlite_engines(settings, settings.database_url)
+    else:
+        engine = create_pooled_engine(settings, settings.database_url, "primary")
+        # Shares the pool with `engine`; no BEGIN/COMMIT round-trips for plain reads
+        readonly_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+    replica_engines = [
+        create_pooled_engine(settings, url, f"replica{index}").execution_options(
+            isolation_level="AUTOCOMMIT"
+        )
+        for index, url in enumerate(settings.database_replica_urls)
+    ]
+
+    read_router = ReplicaRouter(
+        primary=readonly_engine,
+        replicas=replica_engines,
+        retry_seconds=settings.database_replica_retry_seconds,
+    )
+
+    session_factory = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+    readonly_session_factory = async_sessionmaker(
+        readonly_engine,
+        class_=ReadOnlyAsyncSession,
+        sync_session_class=RoutingSession,
+        info={"read_router": read_router},
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+    if sqlite_profile:
+        # Reads before a request's first write use the reader pool, so the
+        # single writer connection is only held for the write itself
+        session_factory = async_sessionmaker(
+            class_=AsyncSession,
+            sync_session_class=SQLiteSplitSession,
+            info={"sqlite_writer": engine, "sqlite_reader": readonly_engine},
+            expire_on_commit=False,
+            autoflush=False,
+        )
+
+    shard_engines: dict[str, AsyncEngine] = {}
+    shard_ring: HashRing | None = None
+    if settings.database_shard_urls:
+        # Users live on the shards; the primary keeps the user directory.
+        # Sharded sessions pick binds by shard, so read-only sessions read
+        # the directory and the shards from their primaries, not replicas.
+        if replica_engines:
+            logger.warning(
+                "DATABASE_REPLICA_URLS is ignored while DATABASE_SHARD_URLS is set: "
+                "read-only sessions read the directory and shards from their primaries"
+            )
+        shard_engines = {
+            f"shard{index}": create_pooled_engine(settings, url, f"shard{index}")
+            for index, url in enumerate(settings.database_shard_urls)
+        }
+        shard_ring = HashRing(shard_engines, settings.database_shard_virtual_nodes)
+        session_factory = sharded_sessionmaker(
+            engine,
+            shard_engines,
+            shard_ring,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+        readonly_session_factory = sharded_sessionmaker(
+            readonly_engine,
+            {
+                shard_id: shard.execution_options(isolation_level="AUTOCOMMIT")
+                for shard_id, shard in shard_engines.items()
+            },
+            shard_ring,
+            class_=ReadOnlyAsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+
+    return Database(
+        engine=engine,
+        readonly_engine=readonly_engine,
+        read_router=read_router,
+        session_factory=session_factory,
+        readonly_session_factory=readonly_session_factory,
+        replica_engines=replica_engines,
+        shard_engines=shard_engines,
+        shard_ring=shard_ring,
+    )
+
+
+@lru_cache
+def get_database() -> Database:
+    """Get the process-wide database, created on first use."""
+    return create_database(get_settings())
+
+
+async def close_database() -> None:
+    """Dispose of the process-wide database if it was created."""
+    if get_database.cache_info().currsize:
+        await get_database().dispose()
+        get_database.cache_clear()
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Dependency for the session factory used by request-independent work."""
+    return get_database().session_factory
+
+
+def get_readonly_session_factory() -> async_sessionmaker[ReadOnlyAsyncSession]:
+    """Dependency for the factory of read-only, per-statement sessions."""
+    return get_database().readonly_session_factory
+
+
+async def get_async_session(
+    session_factory: Annotated[async_sessionmaker[AsyncSession], Depends(get_session_factory)],
+) -> AsyncGenerator[AsyncSession, None]:
     """Dependency for getting async database sessions."""
-    async with AsyncSessionLocal() as session:
+    async with session_factory() as session:
         try:
             yield session
-            await session.commit()
+            # No statement ran, so no connection was checked out: nothing to commit
+            if session.in_transaction():
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
 
+
+async def get_readonly_session(
+    session_factory: Annotated[
+        async_sessionmaker[ReadOnlyAsyncSession], Depends(get_readonly_session_factory)
+    ],
+) -> AsyncGenerator[ReadOnlyAsyncSession, None]:
+    """Dependency for sessions of read-only routes, which are never committed."""
+    async with session_factory() as session:
+        yield session
@@ -0,0 +1,110 @@
+"""Hash sharding of users across databases."""
+
+import hashlib
+from bisect import bisect
+from collections.abc import Iterable
+from typing import Any, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import Mapper, ORMExecuteState
+
+from src.infrastructure.db.models.user_directory import UserDirectoryModel
+
+# Shard id of the database holding the global user directory
+DIRECTORY_SHARD = "directory"
+
+_S = TypeVar("_S", bound=AsyncSession)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping user IDs to shard ids.
+
+    Each shard owns ``virtual_nodes`` points on the ring, so adding a shard
+    moves only about 1/N of the users. Shard ids must stay stable: append
+    new shards, never rename or reorder existing ones.
+    """
+
+    def __init__(self, shard_ids: Iterable[str], virtual_nodes: int = 64):
+        self.shard_ids = list(shard_ids)
+        if not self.shard_ids:
+            raise ValueError("HashRing needs at least one shard")
+        points = sorted(
+            (_hash(f"{shard_id}#{index}"), shard_id)
+            for shard_id in self.shard_ids
+            for index in range(virtual_nodes)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [shard_id for _, shard_id in points]
+
+    def shard_for(self, user_id: int) -> str:
+        """Return the shard id owning a user ID."""
+        index = bisect(self._points, _hash(str(user_id))) % len(self._points)
+        return self._owners[index]
+
+    def group(self, user_ids: Iterable[int]) -> dict[str, list[int]]:
+        """Split user IDs by owning shard."""
+        groups: dict[str, list[int]] = {}
+        for user_id in user_ids:
+            groups.setdefault(self.shard_for(user_id), []).append(user_id)
+        return groups
+
+
+def sharded_sessionmaker(
+    directory: AsyncEngine,
+    shards: dict[str, AsyncEngine],
+    ring: HashRing,
+    *,
+    class_: type[_S],
+    **kwargs: Any,
+) -> async_sessionmaker[_S]:
+    """
+    Build a session factory whose sessions span the directory and all shards.
+
+    Statements pick their database through the ``shard_id`` bind argument;
+    ORM objects are placed by their ID. Statements without a shard fan out
+    to every user shard. Sessions carry the ring in ``info["shard_ring"]``.
+
+    Args:
+        directory: Engine of the database holding the user directory
+        shards: Engines of the user shards by shard id
+        ring: Hash ring over the shard ids
+        class_: Async session class the factory creates
+        **kwargs: Further ``async_sessionmaker`` arguments
+
+    Returns:
+        The session factory
+    """
+
+    def choose_shard(mapper: Mapper[Any] | None, instance: Any, **_kw: Any) -> str:
+        if mapper is None or mapper.class_ is UserDirectoryModel:
+            return DIRECTORY_SHARD
+        if getattr(instance, "id", None) is None:
+            raise ValueError("Sharded users need their ID assigned before they are flushed")
+        return ring.shard_for(instance.id)
+
+    def choose_identity(mapper: Mapper[Any], primary_key: Any, **_kw: Any) -> list[str]:
+        if mapper.class_ is UserDirectoryModel:
+            return [DIRECTORY_SHARD]
+        return [ring.shard_for(primary_key[0])]
+
+    def choose_execute(_context: ORMExecuteState) -> list[str]:
+        return ring.shard_ids
+
+    binds = {DIRECTORY_SHARD: directory.sync_engine}
+    binds.update({shard_id: engine.sync_engine for shard_id, engine in shards.items()})
+    return async_sessionmaker(
+        class_=class_,
+        sync_session_class=ShardedSession,
+        shards=binds,
+        shard_chooser=choose_shard,
+        identity_chooser=choose_identity,
+        execute_chooser=choose_execute,
+        info={"shard_ring": ring},
+        **kwargs,
+    )
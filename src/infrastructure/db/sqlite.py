@@ -0,0 +1,153 @@
+"""SQLite production profile: WAL, tuned pragmas, one writer and pooled readers."""
+
+from typing import Any, cast
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from src.infrastructure.config import Settings
+from src.infrastructure.db.pool import InstrumentedAsyncQueuePool, instrument_engine
+from src.infrastructure.db.routing import is_pinned_to_primary, pin_to_primary
+
+
+def is_sqlite_file(url: str) -> bool:
+    """Check whether a URL points at an on-disk SQLite database."""
+    backend = make_url(url)
+    if backend.get_backend_name() != "sqlite":
+        return False
+    database = backend.database or ""
+    return database not in ("", ":memory:") and backend.query.get("mode") != "memory"
+
+
+def sqlite_pragmas(settings: Settings, *, read_only: bool) -> list[str]:
+    """
+    Build the pragmas run on every new connection of the profile.
+
+    WAL lets readers run alongside the writer; with it ``synchronous=NORMAL``
+    is still durable against application crashes and only syncs at
+    checkpoints.
+
+    Args:
+        settings: Application settings with the SQLite tuning
+        read_only: Whether the connection serves readers only
+
+    Returns:
+        The PRAGMA statements
+    """
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        # Negative sizes are KiB rather than pages
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size_bytes}",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA foreign_keys=ON",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _configure_connections(engine: AsyncEngine, pragmas: list[str], *, writer: bool) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, _connection_record: Any) -> None:
+        # Stop the driver from opening transactions itself; SQLAlchemy's
+        # "begin" event below emits them instead
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    if writer:
+
+        @event.listens_for(sync_engine, "begin")
+        def _on_begin(conn: Connection) -> None:
+            # Take the write lock up front: a deferred transaction upgrading
+            # from read to write fails with SQLITE_BUSY instead of waiting
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_sqlite_engines(settings: Settings, url: str) -> tuple[AsyncEngine, AsyncEngine]:
+    """
+    Create the writer and reader engines of the SQLite profile.
+
+    SQLite allows one writer at a time, so the writer pool holds a single
+    connection and concurrent writers queue for it in-process instead of
+    spinning on the database lock. Readers get their own pool of
+    query-only, autocommit connections that never block the writer.
+
+    Args:
+        settings: Application settings with the SQLite tuning
+        url: SQLite database URL
+
+    Returns:
+        The writer and reader engines
+    """
+    connect_args = {"timeout": settings.sqlite_busy_timeout_ms / 1000}
+
+    writer = create_async_engine(
+        url,
+        echo=settings.debug,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name="primary",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        connect_args=connect_args,
+    )
+    _configure_connections(writer, sqlite_pragmas(settings, read_only=False), writer=True)
+    instrument_engine(writer, "primary")
+
+    reader = create_async_engine(
+        url,
+        echo=settings.debug,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name="reader",
+        pool_size=settings.sqlite_reader_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        connect_args=connect_args,
+    )
+    _configure_connections(reader, sqlite_pragmas(settings, read_only=True), writer=False)
+    instrument_engine(reader, "reader")
+
+    return writer, reader.execution_options(isolation_level="AUTOCOMMIT")
+
+
+class SQLiteSplitSession(Session):
+    """
+    Sync session sending reads to the reader pool until the request writes.
+
+    Inserts, updates, deletes, flushes, raw SQL and bare ``connection()``
+    calls go to the writer, which pins the request: its later statements
+    use the writer too and so read their own writes. Lookups done before
+    the first write (and CPU work such as password hashing after them)
+    therefore never hold the single writer connection. Expects
+    ``sqlite_writer`` and ``sqlite_reader`` engines in ``info``.
+    """
+
+    def get_bind(
+        self,
+        mapper: Any = None,  # noqa: ARG002 - Session.get_bind signature
+        clause: Any = None,
+        **kw: Any,  # noqa: ARG002
+    ) -> Engine:
+        writes = (
+            clause is None
+            or self._flushing
+            or getattr(clause, "is_dml", False)
+            or isinstance(clause, TextClause)
+        )
+        if writes:
+            pin_to_primary()
+        engine = self.info["sqlite_writer" if writes or is_pinned_to_primary() else "sqlite_reader"]
+        return cast(AsyncEngine, engine).sync_engine
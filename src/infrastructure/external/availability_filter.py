@@ -0,0 +1,236 @@
+"""Bloom filter of taken emails and usernames, optionally shared through Redis."""
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.interfaces.availability_filter import IAvailabilityFilter
+from src.infrastructure.bloom import BloomFilter
+from src.infrastructure.config import get_settings
+from src.infrastructure.db.repositories.sharded_user import user_repository_for
+from src.infrastructure.metrics import registry
+from src.infrastructure.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+AVAILABILITY_CHECKS = registry.counter(
+    "availability_filter_checks_total", "Availability checks by filter answer", ["result"]
+)
+AVAILABILITY_ENTRIES = registry.gauge(
+    "availability_filter_entries", "Emails and usernames in the local Bloom filter"
+)
+
+_REDIS_RETRY_SECONDS = 5.0
+_SCAN_BATCH_SIZE = 1000
+
+
+# Set the bits only if the shared bitmap has been built: SETBIT on a
+# missing key would create a partial bitmap other processes then trust.
+# KEYS: bitmap, built marker; ARGV: bit offsets.
+_SETBITS_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return 0
+end
+for _, offset in ipairs(ARGV) do
+    redis.call('SETBIT', KEYS[1], offset, 1)
+end
+return 1
+"""
+
+
+def _redis_offset(position: int) -> int:
+    # Redis numbers bits from the most significant bit of each byte, the
+    # Bloom filter from the least significant one; this keeps bytes identical
+    return (position & ~7) | (7 - (position & 7))
+
+
+class UserAvailabilityFilter(IAvailabilityFilter):
+    """
+    Bloom filter answering "certainly free" for emails and usernames.
+
+    The filter is built by streaming every user once at startup and is
+    updated as users register. With Redis, the bits are also kept in a
+    shared bitmap: new users set their bits there and ``sync`` merges the
+    bitmap back, so registrations in other processes become visible. The
+    bitmap is trusted only once a full build has been published to it,
+    which a marker key records. The keys encode the filter geometry, so
+    processes configured with another capacity never mix bits.
+
+    Until the first build completes, every value is reported as possibly
+    taken, which makes callers check the database.
+    """
+
+    def __init__(
+        self,
+        redis: Redis | None,
+        capacity: int,
+        error_rate: float = 0.001,
+        rebuild_seconds: float = 600.0,
+    ):
+        self._redis = redis
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._rebuild_seconds = rebuild_seconds
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._ready = False
+        self._built_at = 0.0
+        self._redis_retry_at = 0.0
+        size, hashes = self._bloom.geometry
+        self._redis_key = f"availability:bloom:{size}:{hashes}"
+        self._built_key = f"{self._redis_key}:built"
+        self._set_bits = redis.register_script(_SETBITS_SCRIPT) if redis is not None else None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the filter has been built and answers from memory."""
+        return self._ready
+
+    @property
+    def bloom(self) -> BloomFilter:
+        """The current in-memory Bloom filter."""
+        return self._bloom
+
+    def _use_redis(self, now: float) -> bool:
+        return self._redis is not None and now >= self._redis_retry_at
+
+    def _redis_failed(self, now: float) -> None:
+        self._redis_retry_at = now + _REDIS_RETRY_SECONDS
+
+    def might_be_taken(self, field: str, value: str) -> bool:
+        """Answer from the Bloom filter once built; before that, always maybe."""
+        if not self._ready:
+            AVAILABILITY_CHECKS.inc(result="not_ready")
+            return True
+        taken = f"{field}:{value}" in self._bloom
+        AVAILABILITY_CHECKS.inc(result="maybe_taken" if taken else "free")
+        return taken
+
+    async def add(self, email: str, username: str) -> None:
+        """Set the bits of a new user locally and in the shared bitmap."""
+        await self.add_many([(email, username)])
+
+    async def add_many(self, users: list[tuple[str, str]]) -> None:
+        """Set the bits of new users locally and, once it is built, in the shared bitmap."""
+        items = [
+            item
+            for email, username in users
+            for item in (f"email:{email}", f"username:{username}")
+        ]
+        for item in items:
+            self._bloom.add(item)
+        AVAILABILITY_ENTRIES.set(self._bloom.count)
+
+        now = time.monotonic()
+        if self._set_bits is None or not self._use_redis(now):
+            return
+        offsets = [
+            _redis_offset(position) for item in items for position in self._bloom.positions(item)
+        ]
+        try:
+            # Skipped if not built yet: the bits are published with the build
+            await self._set_bits(keys=[self._redis_key, self._built_key], args=offsets)
+        except RedisError:
+            self._redis_failed(now)
+
+    async def build(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """
+        Fill the filter, from the shared bitmap if built, else by scanning users.
+
+        Args:
+            session_factory: Transactional session factory, needed for the
+                server-side cursor of the scan
+        """
+        if await self.sync():
+            self._ready = True
+            self._built_at = time.monotonic()
+            return
+
+        bloom = BloomFilter(self._capacity, self._error_rate)
+        async with session_factory() as session:
+            profiles = user_repository_for(session).stream_profiles(_SCAN_BATCH_SIZE)
+            async for profile in profiles:
+                bloom.add(f"email:{profile.email}")
+                bloom.add(f"username:{profile.username}")
+        # Keep users added while the scan was running
+        bloom.merge(self._bloom.to_bytes())
+        if bloom.count > self._capacity:
+            logger.warning(
+                "Availability filter holds %d entries, over its capacity of %d; "
+                "raise AVAILABILITY_BLOOM_CAPACITY to keep false positives rare",
+                bloom.count,
+                self._capacity,
+            )
+        self._bloom = bloom
+        self._ready = True
+        self._built_at = time.monotonic()
+        AVAILABILITY_ENTRIES.set(bloom.count)
+        await self._publish()
+
+    async def _publish(self) -> None:
+        now = time.monotonic()
+        if not self._use_redis(now):
+            return
+        scratch = f"{self._redis_key}:merge"
+        try:
+            pipe = self._redis.pipeline(transaction=True)  # type: ignore[union-attr]
+            pipe.set(scratch, self._bloom.to_bytes(), ex=60)
+            pipe.bitop("OR", self._redis_key, self._redis_key, scratch)
+            pipe.delete(scratch)
+            pipe.set(self._built_key, 1)
+            await pipe.execute()
+        except RedisError:
+            self._redis_failed(now)
+
+    async def sync(self) -> bool:
+        """Merge the shared bitmap into the local filter; False if none has been built."""
+        now = time.monotonic()
+        if not self._use_redis(now):
+            return False
+        try:
+            built, bits = await self._redis.mget(  # type: ignore[union-attr]
+                self._built_key, self._redis_key
+            )
+        except RedisError:
+            self._redis_failed(now)
+            return False
+        if not built or not bits or len(bits) != self._bloom.size_bytes:
+            return False
+        self._bloom.merge(bits)
+        AVAILABILITY_ENTRIES.set(self._bloom.count)
+        return True
+
+    async def run_sync(
+        self, session_factory: async_sessionmaker[AsyncSession], interval_seconds: float
+    ) -> None:
+        """Build the filter, then keep it current until cancelled."""
+        await self.build(session_factory)
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                # Without the shared bitmap, rescan now and then to pick up
+                # users registered through other processes
+                if (
+                    not await self.sync()
+                    and time.monotonic() - self._built_at >= self._rebuild_seconds
+                ):
+                    await self.build(session_factory)
+            except Exception:
+                # Keep syncing: a dead task would leave the filter stale for good
+                logger.exception("Availability filter sync failed")
+
+
+@lru_cache
+def get_availability_filter() -> UserAvailabilityFilter:
+    """Get the process-wide availability filter."""
+    settings = get_settings()
+    return UserAvailabilityFilter(
+        get_redis(),
+        settings.availability_bloom_capacity,
+        settings.availability_bloom_error_rate,
+        settings.availability_rebuild_seconds,
+    )
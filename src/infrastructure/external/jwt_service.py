@@ -1,17 +1,30 @@
 """JWT service implementation."""
 
+import time
+import uuid
 from datetime import datetime, timedelta
 
-from jose import JWTError, jwt
-
 from src.application.dto.token import TokenDTO, TokenPayloadDTO
 from src.application.interfaces.token_service import ITokenService
 from src.domain.exceptions import InvalidTokenError
 from src.infrastructure.config import get_settings
+from src.infrastructure.metrics import registry
+
+JWT_DURATION = registry.histogram(
+    "jwt_duration_seconds",
+    "Time to sign or to verify and decode one token",
+    ["operation"],
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05),
+)
 
 
 class JWTService(ITokenService):
-    """JWT token service implementation using python-jose."""
+    """
+    JWT token service implementation using python-jose.
+
+    python-jose (and its crypto backend) is imported on first use rather
+    than with the application; start-up warm-up triggers it.
+    """
 
     def __init__(self):
         settings = get_settings()
@@ -20,7 +33,13 @@ class JWTService(ITokenService):
         self._access_token_expire_minutes = settings.jwt_access_token_expire_minutes
         self._refresh_token_expire_days = settings.jwt_refresh_token_expire_days
 
-    def _create_token(self, user_id: int, token_type: str, expires_delta: timedelta) -> str:
+    def _create_token(
+        self,
+        user_id: int,
+        token_type: str,
+        expires_delta: timedelta,
+        family: str | None,
+    ) -> str:
         """Create a JWT token with given parameters."""
         expire = datetime.utcnow() + expires_delta
         payload = {
@@ -28,39 +47,59 @@ class JWTService(ITokenService):
             "exp": expire,
             "type": token_type,
             "iat": datetime.utcnow(),
+            "jti": uuid.uuid4().hex,
+            "fam": family or uuid.uuid4().hex,
         }
-        return jwt.encode(payload, self._secret_key, algorithm=self._algorithm)
+        from jose import jwt
 
-    def create_access_token(self, user_id: int) -> str:
+        started = time.perf_counter()
+        token = jwt.encode(payload, self._secret_key, algorithm=self._algorithm)
+        JWT_DURATION.observe(time.perf_counter() - started, operation="encode")
+        return token
+
+    def create_access_token(self, user_id: int, family: str | None = None) -> str:
         """Create an access token for a user."""
         expires_delta = timedelta(minutes=self._access_token_expire_minutes)
-        return self._create_token(user_id, "access", expires_delta)
+        return self._create_token(user_id, "access", expires_delta, family)
 
-    def create_refresh_token(self, user_id: int) -> str:
+    def create_refresh_token(self, user_id: int, family: str | None = None) -> str:
         """Create a refresh token for a user."""
         expires_delta = timedelta(days=self._refresh_token_expire_days)
-        return self._create_token(user_id, "refresh", expires_delta)
+        return self._create_token(user_id, "refresh", expires_delta, family)
 
-    def create_token_pair(self, user_id: int) -> TokenDTO:
+    def create_token_pair(self, user_id: int, family: str | None = None) -> TokenDTO:
         """Create both access and refresh tokens for a user."""
+        family = family or uuid.uuid4().hex
         return TokenDTO(
-            access_token=self.create_access_token(user_id),
-            refresh_token=self.create_refresh_token(user_id),
+            access_token=self.create_access_token(user_id, family),
+            refresh_token=self.create_refresh_token(user_id, family),
         )
 
+    def refresh_token_expires_at(self) -> int:
+        """Get the expiry of a refresh token issued now."""
+        return int(time.time()) + self._refresh_token_expire_days * 86400 + 1
+
     def decode_token(self, token: str) -> TokenPayloadDTO:
         """Decode and validate a JWT token."""
+        from jose import JWTError, jwt
+
+        started = time.perf_counter()
         try:
             payload = jwt.decode(token, self._secret_key, algorithms=[self._algorithm])
             return TokenPayloadDTO(
                 sub=int(payload["sub"]),
                 exp=payload["exp"],
                 type=payload["type"],
+                jti=payload.get("jti"),
+                family=payload.get("fam"),
+                iat=payload.get("iat"),
             )
         except JWTError as e:
             raise InvalidTokenError(f"Invalid token: {e}")
         except (KeyError, ValueError) as e:
             raise InvalidTokenError(f"Malformed token payload: {e}")
+        finally:
+            JWT_DURATION.observe(time.perf_counter() - started, operation="decode")
 
     def verify_access_token(self, token: str) -> TokenPayloadDTO:
         """Verify an access token."""
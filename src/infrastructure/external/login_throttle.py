@@ -0,0 +1,241 @@
+"""Sliding-window login throttle backed by Redis with an in-memory fallback."""
+
+import time
+import uuid
+from collections import deque
+from functools import lru_cache
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.application.dto.login_throttle import LoginAttemptDTO
+from src.application.interfaces.login_throttle import ILoginThrottle
+from src.infrastructure.config import get_settings
+from src.infrastructure.metrics import registry
+from src.infrastructure.redis_client import get_redis
+
+LOGIN_THROTTLED = registry.counter(
+    "login_throttled_total", "Login attempts rejected by the throttle", ["scope"]
+)
+LOGIN_THROTTLE_FALLBACKS = registry.counter(
+    "login_throttle_fallback_total", "Throttle operations served from memory after a Redis error"
+)
+
+# How long to stay on the in-memory fallback after a Redis error
+_REDIS_RETRY_SECONDS = 5.0
+
+
+class InMemorySlidingWindow:
+    """Per-process sliding-window counters with a bounded number of keys."""
+
+    def __init__(self, window_seconds: int, max_keys: int = 100_000):
+        self._window = window_seconds
+        self._max_keys = max_keys
+        # (time, member) per event, oldest first
+        self._hits: dict[str, deque[tuple[float, str]]] = {}
+
+    def _prune(self, key: str, now: float) -> deque[tuple[float, str]] | None:
+        hits = self._hits.get(key)
+        if hits is None:
+            return None
+        while hits and hits[0][0] <= now - self._window:
+            hits.popleft()
+        if not hits:
+            del self._hits[key]
+            return None
+        return hits
+
+    def hit(self, key: str, now: float, member: str = "") -> None:
+        """Record one event for a key; give a unique member to refund it later."""
+        hits = self._prune(key, now)
+        if hits is None:
+            if len(self._hits) >= self._max_keys:
+                # Evict the oldest key so an attack with random keys stays bounded
+                del self._hits[next(iter(self._hits))]
+            hits = self._hits[key] = deque()
+        hits.append((now, member))
+
+    def retry_after(self, key: str, limit: int, now: float) -> float | None:
+        """Seconds until the key drops below the limit, or None if under it."""
+        hits = self._prune(key, now)
+        if hits is None or len(hits) < limit:
+            return None
+        return hits[len(hits) - limit][0] + self._window - now
+
+    def refund(self, key: str, member: str) -> None:
+        """Take back one event of a key, leaving concurrent events counted."""
+        hits = self._hits.get(key)
+        if hits:
+            for hit in hits:
+                if hit[1] == member:
+                    hits.remove(hit)
+                    break
+            if not hits:
+                del self._hits[key]
+
+    def clear(self, key: str) -> None:
+        """Forget all events for a key."""
+        self._hits.pop(key, None)
+
+
+# Prune every window, then either report how long each full one must wait
+# or add the hit to all of them: check and count happen in one atomic step.
+# KEYS: window keys; ARGV: now, window, member, then one limit per key.
+# Returns one wait per key, "-1" for keys under their limit.
+_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local waits = {}
+local throttled = false
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+    local limit = tonumber(ARGV[3 + i])
+    local count = redis.call('ZCARD', key)
+    waits[i] = '-1'
+    if count >= limit then
+        local oldest = redis.call('ZRANGE', key, count - limit, count - limit, 'WITHSCORES')
+        waits[i] = tostring(tonumber(oldest[2]) + window - now)
+        throttled = true
+    end
+end
+if not throttled then
+    for _, key in ipairs(KEYS) do
+        redis.call('ZADD', key, now, ARGV[3])
+        redis.call('EXPIRE', key, window)
+    end
+end
+return waits
+"""
+
+
+class RedisSlidingWindow:
+    """Sliding-window counters shared across processes via Redis sorted sets."""
+
+    def __init__(self, redis: Redis, window_seconds: int, prefix: str = "throttle:"):
+        self._redis = redis
+        self._window = window_seconds
+        self._prefix = prefix
+        self._acquire = redis.register_script(_ACQUIRE_SCRIPT)
+
+    async def acquire(self, limits: dict[str, int], now: float, member: str) -> dict[str, float]:
+        """
+        Count one event for each key unless any key is at its limit.
+
+        Args:
+            limits: Limit per key
+            now: Current Unix time
+            member: Unique ID of the event, to refund it later
+
+        Returns:
+            Seconds until each over-limit key drops below its limit; empty
+            if the event was counted
+        """
+        result = await self._acquire(
+            keys=[self._prefix + key for key in limits],
+            args=[now, self._window, member, *limits.values()],
+        )
+        waits = {key: float(wait) for key, wait in zip(limits, result, strict=True)}
+        return {key: wait for key, wait in waits.items() if wait >= 0}
+
+    async def refund(self, key: str, member: str) -> None:
+        """Take back one event of a key, leaving concurrent events counted."""
+        await self._redis.zrem(self._prefix + key, member)
+
+    async def clear(self, key: str) -> None:
+        """Forget all events for a key."""
+        await self._redis.delete(self._prefix + key)
+
+
+class LoginThrottle(ILoginThrottle):
+    """Throttle failed logins per account and per client IP."""
+
+    def __init__(
+        self,
+        window_seconds: int,
+        max_failures_per_account: int,
+        max_failures_per_ip: int,
+        redis: Redis | None = None,
+    ):
+        self._max_per_account = max_failures_per_account
+        self._max_per_ip = max_failures_per_ip
+        self._memory = InMemorySlidingWindow(window_seconds)
+        self._redis = RedisSlidingWindow(redis, window_seconds) if redis else None
+        self._redis_retry_at = 0.0
+
+    def _use_redis(self, now: float) -> bool:
+        return self._redis is not None and now >= self._redis_retry_at
+
+    def _redis_failed(self, now: float) -> None:
+        self._redis_retry_at = now + _REDIS_RETRY_SECONDS
+        LOGIN_THROTTLE_FALLBACKS.inc()
+
+    def _limits(self, account: str, client_ip: str | None) -> dict[str, int]:
+        limits = {f"acct:{account.lower()}": self._max_per_account}
+        if client_ip:
+            limits[f"ip:{client_ip}"] = self._max_per_ip
+        return limits
+
+    def _acquire_in_memory(
+        self, limits: dict[str, int], now: float, member: str
+    ) -> dict[str, float]:
+        # No await between check and hit, so this is atomic on the event loop
+        waits: dict[str, float] = {}
+        for key, limit in limits.items():
+            wait = self._memory.retry_after(key, limit, now)
+            if wait is not None:
+                waits[key] = wait
+        if not waits:
+            for key in limits:
+                self._memory.hit(key, now, member)
+        return waits
+
+    async def attempt(self, account: str, client_ip: str | None) -> LoginAttemptDTO:
+        """Count the attempt, or return seconds to wait if the account or IP is over its limit."""
+        now = time.time()
+        limits = self._limits(account, client_ip)
+        member = f"{now}:{uuid.uuid4().hex}"
+
+        waits: dict[str, float] | None = None
+        if self._redis is not None and self._use_redis(now):
+            try:
+                waits = await self._redis.acquire(limits, now, member)
+            except RedisError:
+                self._redis_failed(now)
+        if waits is None:
+            waits = self._acquire_in_memory(limits, now, member)
+
+        if not waits:
+            return LoginAttemptDTO(member)
+        for key in waits:
+            LOGIN_THROTTLED.inc(scope=key.split(":", 1)[0])
+        return LoginAttemptDTO(member, max(1, int(max(waits.values()) + 0.999)))
+
+    async def reset(self, account: str, client_ip: str | None, attempt_id: str) -> None:
+        """Clear the account window and take the attempt back from the IP window."""
+        account_key = f"acct:{account.lower()}"
+        ip_key = f"ip:{client_ip}" if client_ip else None
+        self._memory.clear(account_key)
+        if ip_key:
+            self._memory.refund(ip_key, attempt_id)
+        now = time.time()
+        if self._redis is not None and self._use_redis(now):
+            try:
+                await self._redis.clear(account_key)
+                if ip_key:
+                    await self._redis.refund(ip_key, attempt_id)
+            except RedisError:
+                self._redis_failed(now)
+
+
+@lru_cache
+def get_login_throttle() -> LoginThrottle | None:
+    """Get the process-wide login throttle, or None if disabled."""
+    settings = get_settings()
+    if not settings.login_throttle_enabled:
+        return None
+    return LoginThrottle(
+        window_seconds=settings.login_throttle_window_seconds,
+        max_failures_per_account=settings.login_throttle_max_failures_per_account,
+        max_failures_per_ip=settings.login_throttle_max_failures_per_ip,
+        redis=get_redis(),
+    )
@@ -1,18 +1,231 @@
 """Password hasher implementation."""
 
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
 import bcrypt
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
 from src.application.interfaces.password_hasher import IPasswordHasher
+from src.infrastructure.config import get_settings
+from src.infrastructure.metrics import registry
+
+BCRYPT_ROUNDS = registry.gauge(
+    "bcrypt_rounds", "bcrypt cost factor used for new hashes", multiprocess_mode="max"
+)
+BCRYPT_CALIBRATED_SECONDS = registry.gauge(
+    "bcrypt_calibrated_hash_seconds",
+    "Estimated time of one hash at the selected cost factor",
+    multiprocess_mode="max",
+)
+BCRYPT_DURATION = registry.histogram(
+    "bcrypt_duration_seconds",
+    "Time of one bcrypt hash or verification in the request path",
+    ["operation"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+BCRYPT_STALE_HASHES = registry.counter(
+    "bcrypt_stale_hashes_total",
+    "Stored hashes found with a cost factor below the target",
+)
+
+logger = logging.getLogger(__name__)
+
+_CALIBRATION_PASSWORD = b"katharsis-calibration"
+# Cost factor calibrated by the first process, shared by all others
+_SHARED_ROUNDS_KEY = "bcrypt:rounds"
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int, max_rounds: int) -> int:
+    """
+    Pick the largest bcrypt cost whose hash time stays within a target.
+
+    Each extra round doubles the work, so a single timed hash at
+    ``min_rounds`` is enough to extrapolate the others.
+
+    Args:
+        target_ms: Target time for one hash in milliseconds
+        min_rounds: Lowest acceptable cost factor
+        max_rounds: Highest acceptable cost factor
+
+    Returns:
+        Selected cost factor
+    """
+    salt = bcrypt.gensalt(rounds=min_rounds)
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        bcrypt.hashpw(_CALIBRATION_PASSWORD, salt)
+        timings.append((time.perf_counter() - start) * 1000)
+    elapsed_ms = min(timings)
+
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms *= 2
+
+    BCRYPT_CALIBRATED_SECONDS.set(elapsed_ms / 1000)
+    return rounds
+
+
+def _calibrate() -> int:
+    settings = get_settings()
+    return calibrate_bcrypt_rounds(
+        settings.bcrypt_target_hash_ms, settings.bcrypt_min_rounds, settings.bcrypt_max_rounds
+    )
+
+
+_rounds: int | None = None
+
+
+def _use_rounds(rounds: int) -> int:
+    global _rounds
+    _rounds = rounds
+    BCRYPT_ROUNDS.set(rounds)
+    return rounds
+
+
+def get_bcrypt_rounds() -> int:
+    """
+    Get the cost factor for new hashes.
+
+    ``bcrypt_rounds`` if configured, else the value ``share_bcrypt_rounds``
+    agreed on at start-up; a process that skipped it calibrates on its own.
+    """
+    if _rounds is not None:
+        return _rounds
+    configured = get_settings().bcrypt_rounds
+    return _use_rounds(configured if configured is not None else _calibrate())
+
+
+async def share_bcrypt_rounds(redis: Redis) -> int:
+    """
+    Agree on one calibrated cost factor across processes and hosts.
+
+    The first process to start calibrates and stores its result in Redis;
+    every later one uses the stored value, so all workers hash at the same
+    cost. Delete the key to recalibrate. A configured ``bcrypt_rounds``
+    takes precedence; if Redis fails the process calibrates on its own.
+
+    Args:
+        redis: Redis client holding the shared value
+
+    Returns:
+        Cost factor for new hashes
+    """
+    if _rounds is not None or get_settings().bcrypt_rounds is not None:
+        return get_bcrypt_rounds()
+    try:
+        stored = await redis.get(_SHARED_ROUNDS_KEY)
+        if stored is None:
+            # Calibration times a few hashes; keep it off the event loop
+            calibrated = await asyncio.to_thread(_calibrate)
+            # Only the first process's value is kept; re-read the winner
+            await redis.set(_SHARED_ROUNDS_KEY, calibrated, nx=True)
+            stored = await redis.get(_SHARED_ROUNDS_KEY)
+    except RedisError as e:
+        logger.warning("Calibrating bcrypt for this process only, Redis failed: %s", e)
+        return get_bcrypt_rounds()
+    return _use_rounds(int(stored))
+
+
+def _hash_chunk(passwords: list[str], rounds: int) -> list[str]:
+    """Hash a chunk of passwords; runs in a worker process."""
+    return [
+        bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=rounds)).decode()
+        for password in passwords
+    ]
+
+
+def hashing_workers() -> int:
+    """Number of processes in the bulk hashing pool."""
+    return get_settings().bulk_hash_workers or os.cpu_count() or 1
+
+
+@lru_cache
+def get_hashing_pool() -> ProcessPoolExecutor:
+    """Get the process pool for bulk hashing, created on first use."""
+    # spawn: forking a process that runs an event loop and threads is unsafe
+    return ProcessPoolExecutor(
+        max_workers=hashing_workers(), mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+async def warm_hashing_pool() -> None:
+    """Start every bulk hashing worker so the first import doesn't wait for spawns."""
+    pool = get_hashing_pool()
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(
+        *(
+            loop.run_in_executor(pool, _hash_chunk, [], get_bcrypt_rounds())
+            for _ in range(hashing_workers())
+        )
+    )
+
+
+def shutdown_hashing_pool() -> None:
+    """Stop the bulk hashing workers if they were started."""
+    if get_hashing_pool.cache_info().currsize:
+        get_hashing_pool().shutdown(cancel_futures=True)
+        get_hashing_pool.cache_clear()
 
 
 class PasswordHasher(IPasswordHasher):
     """Password hasher using bcrypt directly."""
 
+    def __init__(self, rounds: int | None = None):
+        self._rounds = rounds if rounds is not None else get_bcrypt_rounds()
+
     def hash(self, password: str) -> str:
         """Hash a plain text password."""
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        started = time.perf_counter()
+        hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=self._rounds)).decode()
+        BCRYPT_DURATION.observe(time.perf_counter() - started, operation="hash")
+        return hashed
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        """Hash many passwords across all cores of the bulk hashing pool."""
+        if not passwords:
+            return []
+        pool = get_hashing_pool()
+        loop = asyncio.get_running_loop()
+        # A few chunks per worker amortize IPC while keeping workers evenly busy
+        chunk_size = max(1, -(-len(passwords) // (hashing_workers() * 4)))
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool, _hash_chunk, passwords[start : start + chunk_size], self._rounds
+                )
+                for start in range(0, len(passwords), chunk_size)
+            )
+        )
+        return [hashed for chunk in chunks for hashed in chunk]
 
     def verify(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a plain text password against a hashed password."""
-        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        started = time.perf_counter()
+        matches = bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+        BCRYPT_DURATION.observe(time.perf_counter() - started, operation="verify")
+        return matches
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Check whether a hash was made with a cost below the current one.
 
+        Stronger hashes are kept: rehashing them would weaken them.
+        """
+        # Modular crypt format: $2b$<cost>$<salt+hash>
+        try:
+            rounds = int(hashed_password.split("$")[2])
+        except (IndexError, ValueError):
+            return True
+        if rounds < self._rounds:
+            BCRYPT_STALE_HASHES.inc()
+            return True
+        return False
@@ -0,0 +1,153 @@
+"""Redis-backed token denylist fronted by an in-process Bloom filter."""
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.application.interfaces.token_denylist import ITokenDenylist
+from src.infrastructure.bloom import BloomFilter
+from src.infrastructure.config import get_settings
+from src.infrastructure.metrics import registry
+from src.infrastructure.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+DENYLIST_CHECKS = registry.counter(
+    "token_denylist_checks_total",
+    "Revocation checks by how they were answered",
+    ["result"],
+)
+DENYLIST_SIZE = registry.gauge(
+    "token_denylist_bloom_entries", "Revoked IDs loaded into the local Bloom filter"
+)
+
+_KEY_PREFIX = "revoked:"
+_INDEX_KEY = "revoked:index"
+_REDIS_RETRY_SECONDS = 5.0
+
+
+class TokenDenylist(ITokenDenylist):
+    """
+    Denylist of revoked token and family IDs.
+
+    Redis holds the authoritative entries. Every process keeps a Bloom
+    filter of them, rebuilt by ``sync``, so the common "not revoked" answer
+    needs no network call. IDs revoked in this process are added to the
+    filter immediately; revocations from other processes become visible
+    after the next sync. If Redis is unreachable, entries are kept locally.
+    """
+
+    def __init__(self, redis: Redis | None, bloom_capacity: int):
+        self._redis = redis
+        self._bloom_capacity = bloom_capacity
+        self._bloom = BloomFilter(bloom_capacity)
+        self._local: dict[str, int] = {}
+        self._redis_retry_at = 0.0
+
+    @property
+    def bloom(self) -> BloomFilter:
+        """The current in-memory Bloom filter."""
+        return self._bloom
+
+    @property
+    def local_entries(self) -> int:
+        """Number of unexpired revocations held in process memory."""
+        return len(self._local)
+
+    def _use_redis(self, now: float) -> bool:
+        return self._redis is not None and now >= self._redis_retry_at
+
+    def _redis_failed(self, now: float) -> None:
+        self._redis_retry_at = now + _REDIS_RETRY_SECONDS
+
+    async def is_revoked(self, *token_ids: str | None) -> bool:
+        """Check the Bloom filter first and confirm probable hits."""
+        candidates = [token_id for token_id in token_ids if token_id and token_id in self._bloom]
+        if not candidates:
+            DENYLIST_CHECKS.inc(result="bloom_negative")
+            return False
+
+        now = time.time()
+        if any(self._local.get(token_id, 0) > now for token_id in candidates):
+            DENYLIST_CHECKS.inc(result="revoked")
+            return True
+
+        if self._use_redis(now):
+            try:
+                found = await self._redis.exists(  # type: ignore[union-attr]
+                    *(_KEY_PREFIX + token_id for token_id in candidates)
+                )
+            except RedisError:
+                self._redis_failed(now)
+            else:
+                DENYLIST_CHECKS.inc(result="revoked" if found else "false_positive")
+                return bool(found)
+
+        DENYLIST_CHECKS.inc(result="false_positive")
+        return False
+
+    async def revoke(self, token_id: str, expires_at: int) -> bool:
+        """Revoke an ID atomically; returns False if it was already revoked."""
+        now = time.time()
+        if expires_at <= now:
+            # Already expired tokens are rejected on signature verification
+            return True
+
+        newly_revoked = token_id not in self._local or self._local[token_id] <= now
+        if self._use_redis(now):
+            try:
+                pipe = self._redis.pipeline(transaction=True)  # type: ignore[union-attr]
+                pipe.set(_KEY_PREFIX + token_id, 1, nx=True, exat=expires_at)
+                pipe.zadd(_INDEX_KEY, {token_id: expires_at})
+                created, _ = await pipe.execute()
+                newly_revoked = bool(created)
+            except RedisError:
+                self._redis_failed(now)
+
+        self._local[token_id] = max(expires_at, self._local.get(token_id, 0))
+        self._bloom.add(token_id)
+        return newly_revoked
+
+    async def sync(self) -> None:
+        """Rebuild the local Bloom filter from Redis and local entries."""
+        now = time.time()
+        remote: list[bytes] = []
+        if self._use_redis(now):
+            try:
+                pipe = self._redis.pipeline(transaction=False)  # type: ignore[union-attr]
+                pipe.zremrangebyscore(_INDEX_KEY, "-inf", now)
+                pipe.zrange(_INDEX_KEY, 0, -1)
+                _, remote = await pipe.execute()
+            except RedisError:
+                self._redis_failed(now)
+
+        # Built without awaiting so no local revocation can be missed
+        self._local = {key: exp for key, exp in self._local.items() if exp > now}
+        bloom = BloomFilter(max(self._bloom_capacity, len(remote) + len(self._local)))
+        for member in remote:
+            bloom.add(member.decode())
+        for token_id in self._local:
+            bloom.add(token_id)
+        self._bloom = bloom
+        DENYLIST_SIZE.set(bloom.count)
+
+    async def run_sync(self, interval_seconds: float) -> None:
+        """Periodically resync the Bloom filter until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.sync()
+            except Exception:
+                # Keep syncing: a dead task would leave the filter stale for good
+                logger.exception("Token denylist sync failed")
+
+
+@lru_cache
+def get_token_denylist() -> TokenDenylist:
+    """Get the process-wide token denylist."""
+    settings = get_settings()
+    return TokenDenylist(get_redis(), settings.token_denylist_bloom_capacity)
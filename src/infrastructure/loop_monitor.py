@@ -0,0 +1,143 @@
+"""Event-loop lag monitor and blocking-call detector."""
+
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from types import FrameType
+
+from src.infrastructure.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG = registry.histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a timer, i.e. how long ready work waited",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_BLOCKS = registry.counter(
+    "event_loop_blocked_total",
+    "Times the event loop was held longer than the blocking threshold, by code location",
+    ["site"],
+)
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+
+
+def _is_project_frame(frame: FrameType) -> bool:
+    filename = frame.f_code.co_filename
+    return filename.startswith(_PROJECT_ROOT) and "site-packages" not in filename
+
+
+def _location(frame: FrameType) -> str:
+    code = frame.f_code
+    try:
+        path = str(Path(code.co_filename).relative_to(_PROJECT_ROOT))
+    except ValueError:
+        # A sibling directory sharing the root's prefix, e.g. "package2/"
+        path = code.co_filename
+    return f"{path}:{code.co_qualname}"
+
+
+def blocking_site(frame: FrameType) -> tuple[str, str]:
+    """
+    Locate a blocking call in the project's own code.
+
+    Args:
+        frame: Innermost frame of the blocked thread
+
+    Returns:
+        The innermost and outermost project frames as ``path:function``
+        (the blocking call and, for requests, the route handler); both are
+        ``"<external>"`` if no project code is on the stack
+    """
+    project = []
+    current: FrameType | None = frame
+    while current is not None:
+        if _is_project_frame(current):
+            project.append(current)
+        current = current.f_back
+    if not project:
+        return "<external>", "<external>"
+    return _location(project[0]), _location(project[-1])
+
+
+class EventLoopMonitor:
+    """
+    Measure event-loop lag and report what blocks the loop.
+
+    A task sleeps ``interval`` seconds at a time and records how late it
+    wakes up as lag. A watchdog thread watches that task's heartbeat: once
+    it is overdue by ``threshold`` seconds, something is holding the loop,
+    and the thread logs the loop thread's stack while the blocking frame is
+    still running. Each stall is reported once.
+    """
+
+    def __init__(self, interval: float, threshold: float):
+        self.interval = interval
+        self.threshold = threshold
+        self._heartbeat = 0.0
+        self._stopped = threading.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start measuring the running loop; call from the loop's thread."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = self._loop.create_task(self._measure(), name="event-loop-monitor")
+        self._thread = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """Stop the lag task and the watchdog."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+
+    async def _measure(self) -> None:
+        while True:
+            self._heartbeat = time.monotonic()
+            expected = self._loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            LOOP_LAG.observe(max(self._loop.time() - expected, 0.0))
+
+    def _watch(self) -> None:
+        reported = None
+        # Poll often enough to catch a stall while it is still going on
+        poll = min(self.interval, self.threshold / 2)
+        while not self._stopped.wait(poll):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat - self.interval
+            if blocked >= self.threshold and heartbeat != reported:
+                reported = heartbeat
+                try:
+                    self._report(blocked)
+                except Exception:
+                    # Keep watching: a dead watchdog would hide every later stall
+                    logger.exception("Event loop stall report failed")
+
+    def _report(self, blocked: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        task = asyncio.current_task(self._loop)
+        site, entry = blocking_site(frame)
+        LOOP_BLOCKS.inc(site=site)
+        logger.warning(
+            "Event loop blocked for over %.0f ms by %s in %s (task %s), stack:\n%s",
+            blocked * 1000,
+            site,
+            entry,
+            task.get_name() if task is not None else "-",
+            "".join(traceback.format_stack(frame)).rstrip(),
+        )
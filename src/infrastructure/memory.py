@@ -0,0 +1,273 @@
+"""Live memory diagnostics: RSS, GC and cache sizes, tracemalloc snapshots and diffs."""
+
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Literal
+
+from src.infrastructure.external.availability_filter import get_availability_filter
+from src.infrastructure.external.token_denylist import get_token_denylist
+from src.infrastructure.prime_cache import get_prime_sieve
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+# Snapshots are large; older ones are dropped beyond this many
+_MAX_SNAPSHOTS = 10
+
+# Allocations made by tracemalloc and the import system are noise
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+GroupBy = Literal["lineno", "filename", "traceback"]
+
+
+@dataclass(frozen=True)
+class CacheUsage:
+    """Entries held by an in-process cache and their approximate size."""
+
+    entries: int
+    size_bytes: int
+
+
+@dataclass(frozen=True)
+class GCGeneration:
+    """Collector state of one GC generation."""
+
+    generation: int
+    pending: int
+    threshold: int
+    collections: int
+    collected: int
+    uncollectable: int
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    """Memory use of the current process."""
+
+    pid: int
+    rss_bytes: int | None
+    peak_rss_bytes: int | None
+    tracing: bool
+    traced_bytes: int | None
+    traced_peak_bytes: int | None
+    gc: list[GCGeneration]
+    caches: dict[str, CacheUsage]
+
+
+@dataclass(frozen=True)
+class SnapshotInfo:
+    """A tracemalloc snapshot kept for diffing."""
+
+    id: int
+    taken_at: float
+    traced_bytes: int
+    blocks: int
+
+
+@dataclass(frozen=True)
+class AllocationDiff:
+    """Change in memory allocated at one site between two snapshots."""
+
+    site: str
+    size_bytes: int
+    size_diff_bytes: int
+    count: int
+    count_diff: int
+
+
+@dataclass(frozen=True)
+class SnapshotDiff:
+    """Allocation sites that grew or shrank the most between two snapshots."""
+
+    base_id: int
+    snapshot_id: int
+    size_diff_bytes: int
+    sites: list[AllocationDiff]
+
+
+def rss_bytes() -> int | None:
+    """Current resident set size, or None where ``/proc`` is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def peak_rss_bytes() -> int | None:
+    """Highest resident set size of the process so far."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def gc_generations() -> list[GCGeneration]:
+    """Thresholds, pending allocations and collection totals per generation."""
+    return [
+        GCGeneration(
+            generation=generation,
+            pending=pending,
+            threshold=threshold,
+            collections=stats["collections"],
+            collected=stats["collected"],
+            uncollectable=stats["uncollectable"],
+        )
+        for generation, (pending, threshold, stats) in enumerate(
+            zip(gc.get_count(), gc.get_threshold(), gc.get_stats(), strict=True)
+        )
+    ]
+
+
+def cache_usage() -> dict[str, CacheUsage]:
+    """
+    Sizes of the process-wide caches created so far.
+
+    Caches not used yet by this process are left out rather than created.
+    """
+    caches = {}
+    if get_prime_sieve.cache_info().currsize:
+        primes = get_prime_sieve().cached_primes
+        # Primes below 2**30 are one-digit ints of identical size
+        item = sys.getsizeof(primes[-1]) if primes else 0
+        caches["prime_sieve"] = CacheUsage(len(primes), sys.getsizeof(primes) + len(primes) * item)
+    if get_availability_filter.cache_info().currsize:
+        bloom = get_availability_filter().bloom
+        caches["user_availability_filter"] = CacheUsage(bloom.count, bloom.nbytes)
+    if get_token_denylist.cache_info().currsize:
+        denylist = get_token_denylist()
+        caches["token_denylist_filter"] = CacheUsage(denylist.bloom.count, denylist.bloom.nbytes)
+        caches["token_denylist_local"] = CacheUsage(denylist.local_entries, 0)
+    return caches
+
+
+class MemoryDiagnostics:
+    """
+    Process-wide tracemalloc control and snapshot store.
+
+    Tracing is off until ``start_tracing``; while off it costs nothing.
+    While on, every allocation is slowed down and carries its traceback,
+    so turn it off again once the snapshots of interest are taken.
+    Snapshots live in this process only.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshots: dict[int, tuple[SnapshotInfo, tracemalloc.Snapshot]] = {}
+        self._next_id = 1
+
+    def report(self) -> MemoryReport:
+        """Describe the memory use of the process."""
+        tracing = tracemalloc.is_tracing()
+        traced, traced_peak = tracemalloc.get_traced_memory() if tracing else (None, None)
+        return MemoryReport(
+            pid=os.getpid(),
+            rss_bytes=rss_bytes(),
+            peak_rss_bytes=peak_rss_bytes(),
+            tracing=tracing,
+            traced_bytes=traced,
+            traced_peak_bytes=traced_peak,
+            gc=gc_generations(),
+            caches=cache_usage(),
+        )
+
+    def start_tracing(self, frames: int) -> None:
+        """Start tracing allocations, keeping ``frames`` frames per traceback."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        tracemalloc.start(frames)
+
+    def stop_tracing(self) -> None:
+        """Stop tracing and drop all snapshots."""
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def snapshots(self) -> list[SnapshotInfo]:
+        """The snapshots kept, oldest first."""
+        with self._lock:
+            return [info for info, _ in self._snapshots.values()]
+
+    def take_snapshot(self) -> SnapshotInfo | None:
+        """
+        Take and keep a snapshot of the traced allocations.
+
+        Returns:
+            The snapshot taken, or None if tracing is off
+        """
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        stats = snapshot.statistics("filename")
+        with self._lock:
+            info = SnapshotInfo(
+                id=self._next_id,
+                taken_at=time.time(),
+                traced_bytes=sum(stat.size for stat in stats),
+                blocks=sum(stat.count for stat in stats),
+            )
+            self._next_id += 1
+            self._snapshots[info.id] = (info, snapshot)
+            while len(self._snapshots) > _MAX_SNAPSHOTS:
+                del self._snapshots[next(iter(self._snapshots))]
+        return info
+
+    def diff(
+        self, base_id: int, snapshot_id: int, group_by: GroupBy = "lineno", limit: int = 20
+    ) -> SnapshotDiff | None:
+        """
+        Compare two snapshots by allocation site.
+
+        Args:
+            base_id: ID of the earlier snapshot
+            snapshot_id: ID of the later snapshot
+            group_by: Site granularity: line, file, or full traceback
+            limit: Number of sites to return, largest size change first
+
+        Returns:
+            The diff, or None if either snapshot is unknown
+        """
+        with self._lock:
+            base = self._snapshots.get(base_id)
+            current = self._snapshots.get(snapshot_id)
+        if base is None or current is None:
+            return None
+        stats = current[1].compare_to(base[1], group_by)
+        return SnapshotDiff(
+            base_id=base_id,
+            snapshot_id=snapshot_id,
+            size_diff_bytes=sum(stat.size_diff for stat in stats),
+            sites=[
+                AllocationDiff(
+                    # Allocating line first, then its callers
+                    site=" <- ".join(
+                        f"{frame.filename}:{frame.lineno}" for frame in reversed(stat.traceback)
+                    ),
+                    size_bytes=stat.size,
+                    size_diff_bytes=stat.size_diff,
+                    count=stat.count,
+                    count_diff=stat.count_diff,
+                )
+                for stat in stats[:limit]
+            ],
+        )
+
+
+@lru_cache
+def get_memory_diagnostics() -> MemoryDiagnostics:
+    """Get the process-wide memory diagnostics."""
+    return MemoryDiagnostics()
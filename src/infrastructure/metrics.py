@@ -0,0 +1,414 @@
+"""
+In-process metrics registry with Prometheus text exposition.
+
+Recording is plain dict arithmetic under the GIL, without locks. With
+several worker processes (uvicorn ``--workers``, Celery prefork) each
+process periodically dumps its values to a shared directory and
+``render()`` merges them; see ``enable_multiprocess``.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Metric:
+    """Base class for a named metric with optional labels."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def value(self, **labels: str) -> float:
+        """Return the current value for the given label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[tuple[str, LabelValues, LabelValues, float]]:
+        """Return (suffix, label names, label values, value) samples for exposition."""
+        return [("", self.labelnames, key, value) for key, value in self._values.items()]
+
+    def dump(self) -> dict[str, Any]:
+        """Return the metric and its values in a JSON-serializable form."""
+        return {
+            "type": self.type_name,
+            "documentation": self.documentation,
+            "labelnames": list(self.labelnames),
+            # list() copies in one step, safe against concurrent recording
+            "values": [[list(key), value] for key, value in list(self._values.items())],
+        }
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increment the counter."""
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down.
+
+    ``multiprocess_mode`` decides how the values of several processes are
+    combined: ``"all"`` keeps one series per process (with a ``pid``
+    label), ``"sum"`` adds them up and ``"max"`` takes the largest. Only
+    processes still running are included.
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        multiprocess_mode: str = "all",
+    ):
+        if multiprocess_mode not in ("all", "sum", "max"):
+            raise ValueError(f"Unknown multiprocess mode '{multiprocess_mode}'")
+        super().__init__(name, documentation, labelnames)
+        self.multiprocess_mode = multiprocess_mode
+
+    def dump(self) -> dict[str, Any]:
+        """Return the gauge, its values and multiprocess mode."""
+        return {**super().dump(), "multiprocess_mode": self.multiprocess_mode}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge to a value."""
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increment the gauge."""
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decrement the gauge."""
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts, then +Inf count and sum
+        self._series: dict[LabelValues, list[float]] = {}
+
+    def observe(self, amount: float, **labels: str) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, amount)] += 1
+        series[-1] += amount
+
+    def value(self, **labels: str) -> float:
+        """Return the number of observations for the given label set."""
+        series = self._series.get(self._key(labels))
+        return sum(series[:-1]) if series else 0.0
+
+    def sum(self, **labels: str) -> float:
+        """Return the sum of observations for the given label set."""
+        series = self._series.get(self._key(labels))
+        return series[-1] if series else 0.0
+
+    def samples(self) -> list[tuple[str, LabelValues, LabelValues, float]]:
+        """Return bucket, sum and count samples for exposition."""
+        bucket_names = (*self.labelnames, "le")
+        samples: list[tuple[str, LabelValues, LabelValues, float]] = []
+        for key, series in self._series.items():
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, float("inf")), series, strict=False):
+                cumulative += count
+                samples.append(("_bucket", bucket_names, (*key, _format_bound(bound)), cumulative))
+            samples.append(("_sum", self.labelnames, key, series[-1]))
+            samples.append(("_count", self.labelnames, key, cumulative))
+        return samples
+
+    def dump(self) -> dict[str, Any]:
+        """Return the histogram, its buckets and per-bucket counts."""
+        return {
+            **super().dump(),
+            "buckets": list(self.buckets),
+            "values": [[list(key), list(series)] for key, series in list(self._series.items())],
+        }
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric):
+                raise ValueError(f"Metric '{metric.name}' already registered")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(  # type: ignore[return-value]
+            Counter(name, documentation, labelnames)
+        )
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        multiprocess_mode: str = "all",
+    ) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(  # type: ignore[return-value]
+            Gauge(name, documentation, labelnames, multiprocess_mode)
+        )
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(  # type: ignore[return-value]
+            Histogram(name, documentation, labelnames, buckets)
+        )
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        return _render(list(self._metrics.values()))
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return every metric and its values in a JSON-serializable form."""
+        return {name: metric.dump() for name, metric in list(self._metrics.items())}
+
+
+def _render(metrics: Iterable[_Metric]) -> str:
+    lines: list[str] = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+        for suffix, names, key, value in metric.samples():
+            lines.append(f"{metric.name}{suffix}{_format_labels(names, key)} {value!r}")
+    return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(snapshots: dict[int, dict[str, dict[str, Any]]]) -> list[_Metric]:
+    """
+    Combine the snapshots of several processes into one set of metrics.
+
+    Counters and histograms are summed over all processes, including ones
+    that have exited, so totals never go backwards. Gauges only include
+    running processes and are combined by their multiprocess mode.
+
+    Args:
+        snapshots: Registry snapshots by process ID
+
+    Returns:
+        The merged metrics, ready to render
+    """
+    merged: dict[str, _Metric] = {}
+    live = {pid: _pid_alive(pid) for pid in snapshots}
+    for pid, snapshot in sorted(snapshots.items()):
+        for name, data in snapshot.items():
+            metric = merged.get(name)
+            if metric is None:
+                metric = merged[name] = _metric_from_dump(name, data)
+            if isinstance(metric, Histogram):
+                if tuple(data["buckets"]) != metric.buckets:
+                    logger.warning("Skipping %s of pid %d: bucket layout differs", name, pid)
+                    continue
+                for key, series in data["values"]:
+                    target = metric._series.setdefault(tuple(key), [0.0] * len(series))
+                    for index, count in enumerate(series):
+                        target[index] += count
+            elif isinstance(metric, Gauge):
+                if not live[pid]:
+                    continue
+                for key, value in data["values"]:
+                    if metric.multiprocess_mode == "all":
+                        metric._values[(*key, str(pid))] = value
+                    elif metric.multiprocess_mode == "max":
+                        current = metric._values.get(tuple(key), value)
+                        metric._values[tuple(key)] = max(value, current)
+                    else:
+                        metric._values[tuple(key)] = metric._values.get(tuple(key), 0.0) + value
+            else:
+                for key, value in data["values"]:
+                    metric._values[tuple(key)] = metric._values.get(tuple(key), 0.0) + value
+    return list(merged.values())
+
+
+def _metric_from_dump(name: str, data: dict[str, Any]) -> _Metric:
+    labelnames = data["labelnames"]
+    if data["type"] == "histogram":
+        return Histogram(name, data["documentation"], labelnames, data["buckets"])
+    if data["type"] == "gauge":
+        mode = data.get("multiprocess_mode", "all")
+        if mode == "all":
+            labelnames = [*labelnames, "pid"]
+        return Gauge(name, data["documentation"], labelnames, mode)
+    return Counter(name, data["documentation"], labelnames)
+
+
+class MultiprocessCollector:
+    """
+    Shares the metrics of worker processes through a directory.
+
+    A daemon thread writes the registry of the current process to
+    ``<directory>/<pid>.json`` every ``interval`` seconds and once more at
+    exit; rendering merges the files of all processes with the live
+    values of the current one. The directory must be local to the host
+    (process liveness is checked by PID) and emptied before the server
+    starts, and the registry must not be filled before worker processes
+    are forked.
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: Path, interval: float):
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _path(self, pid: int) -> Path:
+        return self.directory / f"{pid}.json"
+
+    def write(self) -> None:
+        """Write the current values of this process."""
+        pid = os.getpid()
+        temporary = self.directory / f".{pid}.json.tmp"
+        temporary.write_text(json.dumps(self.registry.snapshot()))
+        os.replace(temporary, self._path(pid))
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.write()
+            except OSError:
+                logger.warning("Could not write metrics to %s", self.directory, exc_info=True)
+
+    def start(self) -> None:
+        """Start writing this process's values periodically."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Stop the writer thread after a final write."""
+        self._stopped.set()
+        self.write()
+
+    def collect(self) -> list[_Metric]:
+        """Merge the values of every process that wrote to the directory."""
+        pid = os.getpid()
+        snapshots = {pid: self.registry.snapshot()}
+        for path in self.directory.glob("*.json"):
+            if path.stem.isdigit() and int(path.stem) != pid:
+                try:
+                    snapshots[int(path.stem)] = json.loads(path.read_text())
+                except (OSError, ValueError):
+                    logger.warning("Skipping unreadable metrics file %s", path)
+        return merge_snapshots(snapshots)
+
+    def render(self) -> str:
+        """Render the merged metrics of all processes."""
+        return _render(self.collect())
+
+
+def _format_labels(names: LabelValues, values: LabelValues) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = MetricsRegistry()
+
+_collector: MultiprocessCollector | None = None
+
+
+def enable_multiprocess(directory: str | Path, interval: float) -> None:
+    """
+    Share this process's metrics with the other workers through a directory.
+
+    Call once per process after it has started (e.g. in the lifespan or a
+    Celery ``worker_process_init`` handler).
+
+    Args:
+        directory: Directory shared by all worker processes of the host
+        interval: Seconds between two writes of this process's values
+    """
+    global _collector
+    if _collector is None:
+        _collector = MultiprocessCollector(registry, Path(directory), interval)
+        _collector.start()
+
+
+def render() -> str:
+    """Render the metrics of this process, or of all workers in multiprocess mode."""
+    if _collector is not None:
+        return _collector.render()
+    return registry.render()
@@ -0,0 +1,41 @@
+"""Process-wide prime sieve cache."""
+
+import math
+import time
+from functools import lru_cache
+
+from src.domain.models.math_operations import PrimeSieve
+from src.infrastructure.config import get_settings
+from src.infrastructure.metrics import registry
+
+SIEVE_DURATION = registry.histogram(
+    "prime_sieve_duration_seconds",
+    "Time to list the primes up to a limit, by power-of-ten limit bucket",
+    ["limit_bucket", "source"],
+    buckets=(0.0001, 0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+def limit_bucket(limit: int) -> str:
+    """Name the smallest power of ten at or above a limit, e.g. "1e4" for 5000."""
+    return f"1e{max(1, math.ceil(math.log10(max(limit, 1))))}"
+
+
+class InstrumentedPrimeSieve(PrimeSieve):
+    """Prime sieve recording how long each lookup takes and whether it was cached."""
+
+    def primes_up_to(self, n: int) -> list[int]:
+        """Get all primes up to n, timing the lookup."""
+        source = "cache" if n <= self.limit else "sieve"
+        started = time.perf_counter()
+        primes = super().primes_up_to(n)
+        SIEVE_DURATION.observe(
+            time.perf_counter() - started, limit_bucket=limit_bucket(n), source=source
+        )
+        return primes
+
+
+@lru_cache
+def get_prime_sieve() -> PrimeSieve:
+    """Get the process-wide prime sieve."""
+    return InstrumentedPrimeSieve(get_settings().prime_cache_max_limit)
@@ -0,0 +1,238 @@
+"""Wall-clock sampling profiler for single requests and storage of its output."""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from enum import StrEnum
+from functools import lru_cache
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from src.infrastructure.config import get_settings
+
+# Leaf frame of samples taken while the task waits on I/O, a thread or a lock
+AWAITING_FRAME = "[awaiting]"
+
+
+class ProfileFormat(StrEnum):
+    """Flamegraph-compatible profile formats."""
+
+    # One "frame;frame;frame microseconds" line per stack (flamegraph.pl, speedscope)
+    COLLAPSED = "collapsed"
+    # https://www.speedscope.app/file-format-schema.json
+    SPEEDSCOPE = "speedscope"
+
+
+_MEDIA_TYPES = {
+    ProfileFormat.COLLAPSED: "text/plain; charset=utf-8",
+    ProfileFormat.SPEEDSCOPE: "application/json",
+}
+_SUFFIXES = {
+    ProfileFormat.COLLAPSED: ".collapsed.txt",
+    ProfileFormat.SPEEDSCOPE: ".speedscope.json",
+}
+
+
+@lru_cache(maxsize=4096)
+def _short_path(filename: str) -> str:
+    """Strip the longest ``sys.path`` entry, e.g. ``fastapi/routing.py``."""
+    for entry in sorted((p for p in sys.path if p), key=len, reverse=True):
+        prefix = entry.rstrip(os.sep) + os.sep
+        if filename.startswith(prefix):
+            return filename[len(prefix) :]
+    return filename
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    # Function identity rather than the current line keeps flamegraphs merged
+    return f"{code.co_qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+@dataclass(frozen=True)
+class Profile:
+    """
+    Aggregated samples of one profiled request.
+
+    Attributes:
+        stacks: Wall-clock seconds attributed to each stack, outermost frame first
+        sample_count: Number of samples taken
+        duration_seconds: Wall-clock time the profiler ran
+    """
+
+    stacks: dict[tuple[str, ...], float]
+    sample_count: int
+    duration_seconds: float
+
+    def collapsed(self) -> str:
+        """Render the stacks in the collapsed-stack format, weighted in microseconds."""
+        return "".join(
+            f"{';'.join(stack)} {round(seconds * 1_000_000)}\n"
+            for stack, seconds in self.stacks.items()
+        )
+
+    def speedscope(self, name: str) -> dict[str, Any]:
+        """Render the stacks as a speedscope sampled profile named ``name``."""
+        frames: dict[str, int] = {}
+        stacks = [
+            [frames.setdefault(frame, len(frames)) for frame in stack] for stack in self.stacks
+        ]
+        weights = [seconds * 1000 for seconds in self.stacks.values()]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": frame} for frame in frames]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": stacks,
+                    "weights": weights,
+                }
+            ],
+            "name": name,
+            "exporter": "fastapi-katharsis",
+        }
+
+    def render(self, profile_format: ProfileFormat, name: str) -> bytes:
+        """Render the stacks in a given format."""
+        if profile_format is ProfileFormat.SPEEDSCOPE:
+            return json.dumps(self.speedscope(name)).encode()
+        return self.collapsed().encode()
+
+
+class SamplingProfiler:
+    """
+    Sample the stack of the calling asyncio task from a background thread.
+
+    While the task runs, the sample is the event-loop thread's stack; while
+    it is suspended, it is the task's await chain ending in
+    ``[awaiting]``, so the profile shows wall-clock time. Frames outside
+    the coroutine that called ``start`` (the event loop, outer middleware)
+    are left out. Other tasks sharing the loop are never sampled. Each
+    sample is weighted by the time since the previous one, as the sampling
+    thread may wake late while another thread holds the GIL.
+    """
+
+    def __init__(self, interval_seconds: float, max_seconds: float):
+        self._interval = interval_seconds
+        self._max_seconds = max_seconds
+        self._stacks: defaultdict[tuple[str, ...], float] = defaultdict(float)
+        self._sample_count = 0
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        """Start sampling the current task; call from the coroutine to profile."""
+        task = asyncio.current_task()
+        if task is None:
+            raise RuntimeError("SamplingProfiler must be started from an asyncio task")
+        self._task = task
+        self._loop = task.get_loop()
+        self._thread_id = threading.get_ident()
+        self._root = sys._getframe(1)
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Profile:
+        """Stop sampling and return the collected profile."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        return Profile(
+            stacks=dict(self._stacks),
+            sample_count=self._sample_count,
+            duration_seconds=time.perf_counter() - self._started,
+        )
+
+    def _run(self) -> None:
+        deadline = self._started + self._max_seconds
+        previous = self._started
+        while not self._stopped.wait(self._interval):
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            stack = self._sample()
+            if stack:
+                self._stacks[stack] += now - previous
+                self._sample_count += 1
+            previous = now
+
+    def _sample(self) -> tuple[str, ...] | None:
+        if self._task.done():
+            return None
+        if asyncio.current_task(self._loop) is self._task:
+            frame = sys._current_frames().get(self._thread_id)
+            frames: list[FrameType] = []
+            while frame is not None:
+                frames.append(frame)
+                if frame is self._root:
+                    break
+                frame = frame.f_back
+            frames.reverse()
+            leaf: list[str] = []
+        else:
+            frames = self._await_chain()
+            leaf = [AWAITING_FRAME]
+        if self._root in frames:
+            frames = frames[frames.index(self._root) :]
+        return tuple([_frame_name(frame) for frame in frames] + leaf)
+
+    def _await_chain(self) -> list[FrameType]:
+        frames = []
+        awaitable: Any = self._task.get_coro()
+        while awaitable is not None:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+            if frame is None:
+                # A future, or a coroutine that just finished
+                break
+            frames.append(frame)
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(
+                awaitable, "gi_yieldfrom", None
+            )
+        return frames
+
+
+class ProfileStore:
+    """Keep the newest ``max_profiles`` rendered profiles in a directory."""
+
+    def __init__(self, directory: Path, max_profiles: int):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def save(self, profile_id: str, profile_format: ProfileFormat, content: bytes) -> Path:
+        """Write a profile and drop the oldest ones beyond the limit."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{profile_id}{_SUFFIXES[profile_format]}"
+        path.write_bytes(content)
+        stored = sorted(self.directory.glob("*.*.*"), key=lambda p: p.stat().st_mtime)
+        for old in stored[: max(len(stored) - self.max_profiles, 0)]:
+            old.unlink(missing_ok=True)
+        return path
+
+    def load(self, profile_id: str) -> tuple[bytes, str] | None:
+        """Return a stored profile and its media type, or None if unknown."""
+        for profile_format, suffix in _SUFFIXES.items():
+            path = self.directory / f"{profile_id}{suffix}"
+            if path.is_file():
+                return path.read_bytes(), _MEDIA_TYPES[profile_format]
+        return None
+
+
+@lru_cache
+def get_profile_store() -> ProfileStore:
+    """Get the process-wide profile store."""
+    settings = get_settings()
+    directory = settings.profiling_dir or os.path.join(tempfile.gettempdir(), "profiles")
+    return ProfileStore(Path(directory), settings.profiling_max_stored)
@@ -0,0 +1,30 @@
+"""Shared async Redis client."""
+
+from functools import lru_cache
+from typing import cast
+
+from redis.asyncio import Redis
+
+from src.infrastructure.config import get_settings
+
+
+@lru_cache
+def get_redis() -> Redis:
+    """Get the process-wide async Redis client."""
+    settings = get_settings()
+    # from_url is annotated to return Any
+    return cast(
+        Redis,
+        Redis.from_url(
+            settings.redis_url,
+            socket_timeout=settings.redis_socket_timeout_seconds,
+            socket_connect_timeout=settings.redis_socket_timeout_seconds,
+        ),
+    )
+
+
+async def close_redis() -> None:
+    """Close the process-wide Redis client if it was created."""
+    if get_redis.cache_info().currsize:
+        await get_redis().aclose()
+        get_redis.cache_clear()
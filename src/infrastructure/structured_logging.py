@@ -0,0 +1,179 @@
+"""Structured JSON logging written by a background thread through a bounded queue."""
+
+import copy
+import json
+import logging
+import queue
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, TextIO
+
+from src.infrastructure.config import Settings
+from src.infrastructure.metrics import registry
+
+LOG_RECORDS_DROPPED = registry.counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full"
+)
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+_TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+
+
+@dataclass
+class RequestLogContext:
+    """Request details attached to every record logged while handling it."""
+
+    request_id: str
+    user_id: int | None = None
+
+
+_current_request: ContextVar[RequestLogContext | None] = ContextVar("log_request", default=None)
+
+
+@contextmanager
+def log_request(request_id: str) -> Iterator[RequestLogContext]:
+    """
+    Attach a request ID to the records logged in the current context.
+
+    Args:
+        request_id: ID of the request being handled
+
+    Yields:
+        The context, which the request fills in as it learns more
+    """
+    context = RequestLogContext(request_id)
+    token = _current_request.set(context)
+    try:
+        yield context
+    finally:
+        _current_request.reset(token)
+
+
+def bind_user_id(user_id: int) -> None:
+    """Record the authenticated user of the current request, if any."""
+    context = _current_request.get()
+    if context is not None:
+        context.user_id = user_id
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the logging thread.
+
+    Records are handed to the writer thread unformatted; only the message
+    and traceback are rendered here, as the arguments may change once the
+    call returns. When the queue is full the record is dropped and counted.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+class RequestContextFilter(logging.Filter):
+    """Add the current request's ID (or "-") to records as ``request_id``."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            context = _current_request.get()
+            record.request_id = context.request_id if context is not None else "-"
+        return True
+
+
+class _DrainingQueueListener(QueueListener):
+    def __init__(
+        self, log_queue: queue.Queue[logging.LogRecord | None], *handlers: logging.Handler
+    ):
+        super().__init__(log_queue, *handlers)
+        self._log_queue = log_queue
+
+    def enqueue_sentinel(self) -> None:
+        # Wait for room: the writer must see the sentinel (None) to flush and exit
+        self._log_queue.put(None)
+
+
+def configure_logging(settings: Settings, stream: TextIO | None = None) -> QueueListener:
+    """
+    Route all logging through a bounded queue to a background writer.
+
+    Handlers of the root logger are replaced; uvicorn's loggers propagate
+    to it, and its access log is turned off in favour of the application's.
+    Code logging on the event loop only enqueues records, so slow stdout
+    or disk I/O never stalls requests.
+
+    Args:
+        settings: Application settings with the logging options
+        stream: Where the writer writes (defaults to stdout)
+
+    Returns:
+        The started listener; pass it to ``stop_logging`` on shutdown
+    """
+    log_queue: queue.Queue[logging.LogRecord | None] = queue.Queue(settings.log_queue_size)
+    handler = DroppingQueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter())
+
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(JsonFormatter() if settings.log_json else logging.Formatter(_TEXT_FORMAT))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.log_level.upper())
+    for name in ("uvicorn", "uvicorn.error"):
+        logging.getLogger(name).handlers.clear()
+        logging.getLogger(name).propagate = True
+    logging.getLogger("uvicorn.access").disabled = True
+
+    listener = _DrainingQueueListener(log_queue, writer)
+    listener.start()
+    return listener
+
+
+def stop_logging(listener: QueueListener) -> None:
+    """Detach the queue from the root logger and write out what it still holds."""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, DroppingQueueHandler) and handler.queue is listener.queue:
+            root.removeHandler(handler)
+    listener.stop()
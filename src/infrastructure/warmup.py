@@ -0,0 +1,97 @@
+"""Start-up warm-up of connection pools, clients, caches and hot code paths."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
+
+from src.infrastructure.config import Settings
+from src.infrastructure.db.repositories.sharded_user import user_repository_for
+from src.infrastructure.db.session import Database
+from src.infrastructure.external.jwt_service import JWTService
+from src.infrastructure.external.password_hasher import warm_hashing_pool
+from src.infrastructure.metrics import registry
+from src.infrastructure.prime_cache import get_prime_sieve
+from src.infrastructure.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+WARMUP_SECONDS = registry.gauge(
+    "app_warmup_seconds", "Time spent in each start-up warm-up step", ["step"]
+)
+
+# Never a registered address: lookups for it only compile and cache statements
+_WARMUP_EMAIL = "warmup@invalid"
+
+
+async def _warm_queries(database: Database) -> None:
+    # SQLAlchemy caches compiled statements per engine on first execution;
+    # run the lookups of login, registration and token checks once each
+    for session_factory in (database.readonly_session_factory, database.session_factory):
+        async with session_factory() as session:
+            repository = user_repository_for(session)
+            await repository.get_credentials_by_email(_WARMUP_EMAIL)
+            await repository.get_by_email_or_username(_WARMUP_EMAIL, _WARMUP_EMAIL)
+            await repository.get_profiles_by_ids([0])
+            await repository.get_by_id(0)
+
+
+async def _warm_redis() -> None:
+    await get_redis().ping()
+
+
+async def _warm_tokens() -> None:
+    # Imports python-jose and its crypto backend
+    service = JWTService()
+    service.decode_token(service.create_access_token(0))
+
+
+async def warm_up(settings: Settings, database: Database) -> dict[str, float]:
+    """
+    Prepare the process for its first requests.
+
+    Opens the database pools, compiles the hot queries, connects Redis,
+    loads the JWT library and, when configured, starts the bulk hashing
+    workers and computes the prime sieve. A failing step is logged and
+    skipped: a cold cache must not keep the application from starting.
+
+    Args:
+        settings: Application settings with the warm-up options
+        database: Database whose pools to open
+
+    Returns:
+        Seconds spent per successful step
+    """
+    steps: list[tuple[str, Callable[[], Awaitable[object]]]] = [
+        ("database", database.warm_up),
+        ("queries", partial(_warm_queries, database)),
+        ("redis", _warm_redis),
+        ("tokens", _warm_tokens),
+    ]
+    if settings.startup_warm_hashing_pool:
+        steps.append(("hashing_pool", warm_hashing_pool))
+    if settings.prime_cache_warm_limit:
+        steps.append(
+            (
+                "primes",
+                partial(
+                    asyncio.to_thread,
+                    get_prime_sieve().primes_up_to,
+                    settings.prime_cache_warm_limit,
+                ),
+            )
+        )
+
+    timings: dict[str, float] = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            await step()
+        except Exception as e:  # noqa: BLE001 - warm-up is best effort
+            logger.warning("Warm-up step %s failed: %s", name, e)
+            continue
+        timings[name] = time.perf_counter() - started
+        WARMUP_SECONDS.set(timings[name], step=name)
+        logger.info("Warm-up step %s took %.1f ms", name, timings[name] * 1000)
+    return timings
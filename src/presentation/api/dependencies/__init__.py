@@ -1,6 +1,7 @@
 """API dependencies."""
 
+from src.presentation.api.dependencies.api_key import require_admin_key, require_service_key
 from src.presentation.api.dependencies.auth import get_current_user
+from src.presentation.api.dependencies.client_ip import get_client_ip
 
-__all__ = ["get_current_user"]
-
+__all__ = ["get_current_user", "get_client_ip", "require_service_key", "require_admin_key"]
@@ -0,0 +1,50 @@
+"""API key dependencies for non-user callers."""
+
+import secrets
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import APIKeyHeader
+
+from src.infrastructure.config import get_settings
+
+service_key_header = APIKeyHeader(name="X-Service-Key", auto_error=False)
+admin_key_header = APIKeyHeader(name="X-Admin-Key", auto_error=False)
+
+
+def _check_key(provided: str | None, expected: str) -> None:
+    """Reject the request unless the configured key was provided."""
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Endpoint is disabled: no API key configured",
+        )
+    if provided is None or not secrets.compare_digest(provided, expected):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid API key",
+        )
+
+
+async def require_service_key(
+    api_key: Annotated[str | None, Depends(service_key_header)],
+) -> None:
+    """
+    Dependency allowing only callers holding the service API key.
+
+    Raises:
+        HTTPException: If the key is missing, wrong, or not configured
+    """
+    _check_key(api_key, get_settings().service_api_key)
+
+
+async def require_admin_key(
+    api_key: Annotated[str | None, Depends(admin_key_header)],
+) -> None:
+    """
+    Dependency allowing only callers holding the admin API key.
+
+    Raises:
+        HTTPException: If the key is missing, wrong, or not configured
+    """
+    _check_key(api_key, get_settings().admin_api_key)
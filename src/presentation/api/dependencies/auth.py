@@ -1,31 +1,44 @@
 """Authentication dependencies."""
 
+import time
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.application.dto.user import UserResponseDTO
 from src.application.use_cases.auth import GetCurrentUserUseCase
 from src.domain.exceptions import InvalidTokenError, UserNotFoundError
-from src.infrastructure.db.repositories.user import UserRepository
-from src.infrastructure.db.session import get_async_session
+from src.infrastructure.config import get_settings
+from src.infrastructure.db.repositories.loader import (
+    CoalescingUserRepository,
+    get_user_loader,
+)
+from src.infrastructure.db.repositories.sharded_user import user_repository_for
+from src.infrastructure.db.routing import pin_to_primary
+from src.infrastructure.db.session import get_readonly_session, get_readonly_session_factory
 from src.infrastructure.external.jwt_service import JWTService
+from src.infrastructure.external.token_denylist import get_token_denylist
+from src.infrastructure.structured_logging import bind_user_id
 
 security = HTTPBearer()
 
 
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    session: Annotated[AsyncSession, Depends(get_async_session)],
+    session: Annotated[AsyncSession, Depends(get_readonly_session)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_readonly_session_factory)
+    ],
 ) -> UserResponseDTO:
     """
     Dependency to get the current authenticated user from JWT token.
 
     Args:
         credentials: HTTP Bearer token credentials
-        session: Database session
+        session: Read-only database session
+        session_factory: Factory for the shared lookup loader's sessions
 
     Returns:
         Current user data
@@ -38,6 +51,8 @@ async def get_current_user(
 
     try:
         payload = jwt_service.verify_access_token(token)
+        if await get_token_denylist().is_revoked(payload.jti, payload.family):
+            raise InvalidTokenError("Token has been revoked")
     except InvalidTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,11 +60,19 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_repository = UserRepository(session)
+    # Tokens are issued right after auth writes (register, login, refresh):
+    # while replicas may still lag behind them, read from the primary
+    if payload.iat and time.time() - payload.iat < get_settings().database_read_your_writes_seconds:
+        pin_to_primary()
+
+    # Concurrent requests resolving users share one batched query
+    user_repository = CoalescingUserRepository(
+        get_user_loader(session_factory), user_repository_for(session)
+    )
     use_case = GetCurrentUserUseCase(user_repository)
 
     try:
-        return await use_case.execute(payload.sub)
+        user = await use_case.execute(payload.sub)
     except UserNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -57,4 +80,7 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    bind_user_id(user.id)
+    return user
+
 
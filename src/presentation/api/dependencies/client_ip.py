@@ -0,0 +1,52 @@
+"""Client IP dependency for requests arriving through reverse proxies."""
+
+from functools import lru_cache
+from ipaddress import IPv4Network, IPv6Network, ip_address, ip_network
+
+from fastapi import Request
+
+from src.infrastructure.config import get_settings
+
+
+@lru_cache
+def _networks(proxies: tuple[str, ...]) -> tuple[IPv4Network | IPv6Network, ...]:
+    return tuple(ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def _is_trusted(host: str, networks: tuple[IPv4Network | IPv6Network, ...]) -> bool:
+    try:
+        address = ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in networks)
+
+
+async def get_client_ip(request: Request) -> str | None:
+    """
+    Dependency resolving the IP address of the client behind trusted proxies.
+
+    ``X-Forwarded-For`` is only read when the peer is a configured trusted
+    proxy, and then from the right: each trusted proxy appends the address
+    it received the request from, so the first untrusted hop is the client.
+    Anything left of it was sent by the client and may be forged.
+
+    Returns:
+        The client IP, or None if the server did not record the peer
+    """
+    if request.client is None:
+        return None
+    peer = request.client.host
+    networks = _networks(tuple(get_settings().trusted_proxies))
+    if not _is_trusted(peer, networks):
+        return peer
+
+    forwarded = [
+        hop.strip()
+        for header in request.headers.getlist("x-forwarded-for")
+        for hop in header.split(",")
+    ]
+    for hop in reversed(forwarded):
+        if hop and not _is_trusted(hop, networks):
+            return hop
+    # Every hop is a trusted proxy: the leftmost is as close to the client as known
+    return next((hop for hop in forwarded if hop), peer)
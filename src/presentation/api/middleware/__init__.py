@@ -0,0 +1,15 @@
+"""API middleware."""
+
+from src.presentation.api.middleware.access_log import AccessLogMiddleware
+from src.presentation.api.middleware.http_metrics import HTTPMetricsMiddleware
+from src.presentation.api.middleware.profiling import ProfilingMiddleware
+from src.presentation.api.middleware.query_stats import QueryStatsMiddleware
+from src.presentation.api.middleware.startup_latency import StartupLatencyMiddleware
+
+__all__ = [
+    "AccessLogMiddleware",
+    "HTTPMetricsMiddleware",
+    "ProfilingMiddleware",
+    "QueryStatsMiddleware",
+    "StartupLatencyMiddleware",
+]
@@ -0,0 +1,98 @@
+"""Structured access log middleware."""
+
+import logging
+import random
+import re
+import time
+import uuid
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.config import Settings
+from src.infrastructure.db.query_stats import current_query_stats
+from src.infrastructure.structured_logging import RequestLogContext, log_request
+from src.presentation.api.middleware.http_metrics import route_template
+
+access_logger = logging.getLogger("access")
+
+# Client-supplied request IDs are kept only if they look like IDs
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class AccessLogMiddleware:
+    """
+    Log one structured record per HTTP request.
+
+    Records carry the request ID (taken from ``X-Request-ID`` or generated,
+    and echoed in the response), route template, status, latency, database
+    time and authenticated user. Routes listed in
+    ``log_access_sample_rates`` are logged only at that rate unless they
+    fail; their records carry the ``sample_rate``. Place this inside
+    ``QueryStatsMiddleware`` so database time is known.
+    """
+
+    def __init__(self, app: ASGIApp, settings: Settings):
+        self.app = app
+        self.sample_rates = settings.log_access_sample_rates
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = Headers(scope=scope).get("x-request-id")
+        request_id = (
+            requested if requested and _REQUEST_ID.match(requested) else uuid.uuid4().hex
+        )
+        started = time.perf_counter()
+        status = 500
+        template: str | None = None
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status, template
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                template = route_template(scope)
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", request_id.encode()),
+                ]
+            await send(message)
+
+        with log_request(request_id) as context:
+            try:
+                await self.app(scope, receive, send_with_request_id)
+            finally:
+                if access_logger.isEnabledFor(logging.INFO):
+                    self._log(scope, template or route_template(scope), status, started, context)
+
+    def _log(
+        self,
+        scope: Scope,
+        template: str,
+        status: int,
+        started: float,
+        context: RequestLogContext,
+    ) -> None:
+        sample_rate = self.sample_rates.get(template, 1.0)
+        if status < 500 and random.random() >= sample_rate:
+            return
+        stats = current_query_stats()
+        access_logger.info(
+            "%s %s %d",
+            scope["method"],
+            scope["path"],
+            status,
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": template,
+                "status": status,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+                "db_queries": stats.count if stats is not None else None,
+                "db_time_ms": round(stats.total_seconds * 1000, 2) if stats is not None else None,
+                "user_id": context.user_id,
+                "sample_rate": sample_rate,
+            },
+        )
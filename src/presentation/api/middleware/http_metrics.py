@@ -0,0 +1,89 @@
+"""Per-route request count, latency, size and in-flight metrics."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.metrics import registry
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total",
+    "HTTP requests by route template and status",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Time until the response was fully sent, by route template",
+    ["method", "route"],
+)
+HTTP_RESPONSE_SIZE = registry.histogram(
+    "http_response_size_bytes",
+    "Response body size by route template",
+    ["method", "route"],
+    buckets=(100.0, 1_000.0, 10_000.0, 100_000.0, 1_000_000.0, 10_000_000.0, 100_000_000.0),
+)
+HTTP_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "HTTP requests being served", ["method"], multiprocess_mode="sum"
+)
+
+# Label for requests that matched no route, so unknown paths can't blow
+# up the number of series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Return the full path template of the route serving a request.
+
+    Routes of included routers keep their router-local path in
+    ``scope["route"]``; FastAPI tracks the prefixed one under
+    ``scope["fastapi"]`` while the route runs, so call this before the
+    response has been sent.
+    """
+    route = scope.get("fastapi", {}).get("effective_route_context") or scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class HTTPMetricsMiddleware:
+    """
+    Record count, latency and response size of every HTTP request.
+
+    Requests are labelled with the template of the route that served them
+    (``/api/v1/admin/users/{user_id}``), which FastAPI leaves in the ASGI
+    scope, never with the raw path.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        size = 0
+        template: str | None = None
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, size, template
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                template = route_template(scope)
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec(method=method)
+            if template is None:
+                template = route_template(scope)
+            HTTP_REQUESTS.inc(method=method, route=template, status=str(status))
+            HTTP_REQUEST_DURATION.observe(elapsed, method=method, route=template)
+            HTTP_RESPONSE_SIZE.observe(size, method=method, route=template)
@@ -0,0 +1,96 @@
+"""On-demand request profiling middleware."""
+
+import asyncio
+import secrets
+import time
+import uuid
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.config import Settings
+from src.infrastructure.external.login_throttle import InMemorySlidingWindow
+from src.infrastructure.metrics import registry
+from src.infrastructure.profiling import ProfileFormat, SamplingProfiler, get_profile_store
+
+PROFILE_REQUESTS = registry.counter(
+    "request_profiles_total", "Requests asking to be profiled, by outcome", ["status"]
+)
+
+_RATE_LIMIT_KEY = "profile"
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests that ask for it with an ``X-Profile`` header.
+
+    The header names the output format (``collapsed`` or ``speedscope``)
+    and must come with the admin key in ``X-Admin-Key``. A profiled
+    response carries ``X-Profile-Id``, under which the profile is then
+    available from the admin API; refused requests are served normally
+    with an ``X-Profile-Status`` header saying why. At most one request
+    per process is profiled at a time, and at most
+    ``profiling_max_per_minute`` a minute.
+    """
+
+    def __init__(self, app: ASGIApp, settings: Settings):
+        self.app = app
+        self.settings = settings
+        self._window = InMemorySlidingWindow(60)
+        self._active = False
+
+    def _refusal(self, requested: str, admin_key: str | None) -> str | None:
+        expected = self.settings.admin_api_key
+        if not expected or admin_key is None or not secrets.compare_digest(admin_key, expected):
+            return "forbidden"
+        if requested not in tuple(ProfileFormat):
+            return "unsupported-format"
+        if self._active:
+            return "busy"
+        now = time.monotonic()
+        if self._window.retry_after(_RATE_LIMIT_KEY, self.settings.profiling_max_per_minute, now):
+            return "rate-limited"
+        self._window.hit(_RATE_LIMIT_KEY, now)
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        requested = headers.get("x-profile")
+        if requested is None:
+            await self.app(scope, receive, send)
+            return
+        requested = requested.strip().lower()
+
+        refusal = self._refusal(requested, headers.get("x-admin-key"))
+        if refusal is not None:
+            PROFILE_REQUESTS.inc(status=refusal)
+            await self.app(scope, receive, _adding_header(send, b"x-profile-status", refusal))
+            return
+
+        PROFILE_REQUESTS.inc(status="profiled")
+        profile_format = ProfileFormat(requested)
+        profile_id = uuid.uuid4().hex
+        profiler = SamplingProfiler(
+            self.settings.profiling_interval_ms / 1000, self.settings.profiling_max_seconds
+        )
+        self._active = True
+        profiler.start()
+        try:
+            await self.app(scope, receive, _adding_header(send, b"x-profile-id", profile_id))
+        finally:
+            profile = profiler.stop()
+            self._active = False
+            content = profile.render(profile_format, f"{scope['method']} {scope['path']}")
+            await asyncio.to_thread(get_profile_store().save, profile_id, profile_format, content)
+
+
+def _adding_header(send: Send, name: bytes, value: str) -> Send:
+    async def send_with_header(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            message["headers"] = [*message.get("headers", []), (name, value.encode())]
+        await send(message)
+
+    return send_with_header
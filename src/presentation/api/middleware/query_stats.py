@@ -0,0 +1,42 @@
+"""Per-request SQL accounting middleware."""
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.config import Settings
+from src.infrastructure.db.query_stats import track_queries
+
+
+class QueryStatsMiddleware:
+    """
+    Count the SQL statements and database time of every HTTP request.
+
+    In debug mode the totals are added to the response as ``X-DB-Query-Count``
+    and ``X-DB-Time-Ms`` headers; statements run after the response has
+    started (e.g. while streaming) are not included there.
+    """
+
+    def __init__(self, app: ASGIApp, settings: Settings):
+        self.app = app
+        self.settings = settings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(f"{scope['method']} {scope['path']}") as stats:
+            if not self.settings.debug:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-query-count", str(stats.count).encode()))
+                    headers.append(
+                        (b"x-db-time-ms", f"{stats.total_seconds * 1000:.2f}".encode())
+                    )
+                    message["headers"] = headers
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
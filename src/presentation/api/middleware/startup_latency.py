@@ -0,0 +1,49 @@
+"""Time-to-first-request and early request latency middleware."""
+
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.infrastructure.metrics import registry
+
+TIME_TO_FIRST_REQUEST = registry.gauge(
+    "app_time_to_first_request_seconds",
+    "Time from creating the application until its first response was sent",
+)
+EARLY_REQUEST_DURATION = registry.histogram(
+    "app_early_request_duration_seconds",
+    "Latency of the first requests after start-up",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+class StartupLatencyMiddleware:
+    """
+    Record how long the first ``sample_size`` HTTP requests take.
+
+    Cold pools, caches and imports show up as a slow head of this
+    histogram; later requests pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp, started: float, sample_size: int):
+        self.app = app
+        self.started = started
+        self.sample_size = sample_size
+        self._seen = 0
+        self._answered = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._seen >= self.sample_size:
+            await self.app(scope, receive, send)
+            return
+
+        self._seen += 1
+        request_started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            finished = time.perf_counter()
+            EARLY_REQUEST_DURATION.observe(finished - request_started)
+            if not self._answered:
+                self._answered = True
+                TIME_TO_FIRST_REQUEST.set(finished - self.started)
@@ -0,0 +1,416 @@
+"""Administration router."""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+from collections.abc import AsyncIterator
+from enum import StrEnum
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.dto.user import (
+    UserImportErrorDTO,
+    UserImportProgressDTO,
+    UserResponseDTO,
+)
+from src.application.use_cases.users import (
+    ExportUsersUseCase,
+    ImportUsersUseCase,
+    ListUsersUseCase,
+    SearchUsersUseCase,
+)
+from src.domain.exceptions import InvalidCursorError
+from src.infrastructure.config import get_settings
+from src.infrastructure.db.repositories.sharded_user import user_repository_for
+from src.infrastructure.db.session import (
+    get_async_session,
+    get_readonly_session,
+    get_session_factory,
+)
+from src.infrastructure.external.availability_filter import get_availability_filter
+from src.infrastructure.external.password_hasher import PasswordHasher
+from src.infrastructure.memory import GroupBy, get_memory_diagnostics
+from src.infrastructure.profiling import get_profile_store
+from src.presentation.api.dependencies.api_key import require_admin_key
+from src.presentation.api.schemas.memory import (
+    MemoryReport,
+    MemorySnapshot,
+    MemorySnapshotDiff,
+    TracingRequest,
+)
+from src.presentation.api.schemas.user import (
+    UserImportError,
+    UserImportResponse,
+    UserPage,
+    UserResponse,
+)
+from src.presentation.user_import import ImportFormat, stream_import_rows
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin_key)],
+)
+
+# Rows per database round-trip and per chunk written to the client
+_EXPORT_BATCH_SIZE = 1000
+_CSV_FIELDS = ["id", "email", "username", "created_at"]
+
+
+class ExportFormat(StrEnum):
+    """Supported user export formats."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+@router.get(
+    "/users",
+    response_model=UserPage,
+    summary="List users",
+)
+async def list_users(
+    session: Annotated[AsyncSession, Depends(get_readonly_session)],
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+    cursor: Annotated[str | None, Query(description="`next_cursor` of the previous page")] = None,
+) -> UserPage:
+    """
+    Page through users ordered by creation time.
+
+    **Requires the `X-Admin-Key` header.**
+
+    - **limit**: Users per page (1-500)
+    - **cursor**: Opaque cursor from the previous page
+    """
+    use_case = ListUsersUseCase(user_repository_for(session))
+
+    try:
+        page = await use_case.execute(limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    return UserPage(
+        items=[UserResponse.model_validate(item) for item in page.items],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.get(
+    "/users/search",
+    response_model=list[UserResponse],
+    summary="Search users",
+)
+async def search_users(
+    session: Annotated[AsyncSession, Depends(get_readonly_session)],
+    q: Annotated[str, Query(min_length=1, max_length=100, description="Text to look for")],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+) -> list[UserResponse]:
+    """
+    Find users whose email or username starts with or contains a string.
+
+    **Requires the `X-Admin-Key` header.**
+
+    Matching is case-insensitive; prefix matches are listed first. Substring
+    matches need at least three characters.
+
+    - **q**: Text to look for
+    - **limit**: Maximum number of users (1-100)
+    """
+    use_case = SearchUsersUseCase(user_repository_for(session))
+    profiles = await use_case.execute(q, limit)
+    return [UserResponse.model_validate(profile) for profile in profiles]
+
+
+async def _export_chunks(
+    session_factory: async_sessionmaker[AsyncSession], export_format: ExportFormat
+) -> AsyncIterator[str]:
+    # The response outlives the request's dependencies, so the export opens
+    # its own session; one transaction keeps the cursor on one snapshot
+    async with session_factory() as session:
+        profiles = ExportUsersUseCase(user_repository_for(session)).execute(_EXPORT_BATCH_SIZE)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=_CSV_FIELDS)
+        if export_format is ExportFormat.CSV:
+            writer.writeheader()
+
+        rows = 0
+        async for profile in profiles:
+            if export_format is ExportFormat.CSV:
+                writer.writerow(_export_row(profile))
+            else:
+                buffer.write(json.dumps(_export_row(profile)) + "\n")
+            rows += 1
+            if rows % _EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield buffer.getvalue()
+
+
+def _export_row(profile: UserResponseDTO) -> dict[str, object]:
+    return {
+        "id": profile.id,
+        "email": profile.email,
+        "username": profile.username,
+        "created_at": profile.created_at.isoformat(),
+    }
+
+
+@router.get(
+    "/users/export",
+    summary="Export all users",
+    response_class=StreamingResponse,
+)
+async def export_users(
+    session_factory: Annotated[async_sessionmaker[AsyncSession], Depends(get_session_factory)],
+    export_format: Annotated[ExportFormat, Query(alias="format")] = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    """
+    Stream every user as NDJSON or CSV.
+
+    **Requires the `X-Admin-Key` header.**
+
+    Rows are read through a server-side cursor and written as they arrive,
+    so memory use stays flat however many users there are.
+
+    - **format**: `ndjson` (default) or `csv`
+    """
+    media_type = "text/csv" if export_format is ExportFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        _export_chunks(session_factory, export_format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="users.{export_format.value}"'
+        },
+    )
+
+
+@router.post(
+    "/users/import",
+    response_model=UserImportResponse,
+    summary="Import users",
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "required": True,
+        }
+    },
+)
+async def import_users(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    import_format: Annotated[ImportFormat, Query(alias="format")] = ImportFormat.NDJSON,
+) -> UserImportResponse:
+    """
+    Create many users from an NDJSON or CSV body.
+
+    **Requires the `X-Admin-Key` header.**
+
+    Each row has `email`, `username` and either `password` or an existing
+    bcrypt `hashed_password`. Invalid rows and users whose email or username
+    is taken are reported and skipped; all other rows are imported. The
+    body is imported batch by batch while it is being received, and each
+    batch is committed on its own: if the import fails part way, the
+    batches committed before stay imported.
+
+    - **format**: `ndjson` (default) or `csv` with a header row
+    """
+    errors: list[UserImportErrorDTO] = []
+    rows = stream_import_rows(request.stream(), import_format, errors)
+
+    async def commit_batch(progress: UserImportProgressDTO) -> None:
+        await session.commit()
+        logger.info(
+            "User import batch %d committed: %d imported, %d skipped up to row %d",
+            progress.batches,
+            progress.imported,
+            progress.skipped + len(errors),
+            progress.last_row,
+        )
+
+    use_case = ImportUsersUseCase(
+        user_repository_for(session),
+        PasswordHasher(),
+        get_settings().bulk_import_batch_size,
+        get_availability_filter(),
+        commit_batch,
+    )
+    result = await use_case.execute(rows)
+
+    return UserImportResponse(
+        imported=result.imported,
+        errors=[
+            UserImportError.model_validate(error)
+            for error in sorted([*errors, *result.errors], key=lambda error: error.row)
+        ],
+    )
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    summary="Download a request profile",
+    response_class=Response,
+)
+async def get_profile(
+    profile_id: Annotated[str, Path(pattern=r"^[0-9a-f]{32}$")],
+) -> Response:
+    """
+    Download the profile of a request sent with an `X-Profile` header.
+
+    **Requires the `X-Admin-Key` header.**
+
+    Collapsed stacks are plain text for `flamegraph.pl` or speedscope;
+    speedscope profiles are JSON for https://www.speedscope.app.
+
+    - **profile_id**: `X-Profile-Id` header of the profiled response
+    """
+    stored = await asyncio.to_thread(get_profile_store().load, profile_id)
+    if stored is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    content, media_type = stored
+    return Response(content=content, media_type=media_type)
+
+
+@router.get(
+    "/memory",
+    response_model=MemoryReport,
+    summary="Report memory use",
+)
+async def get_memory_report() -> MemoryReport:
+    """
+    Report RSS, GC generations and the sizes of the in-process caches.
+
+    **Requires the `X-Admin-Key` header.**
+
+    Covers the worker process that answers (see `pid`), not the whole
+    deployment.
+    """
+    return MemoryReport.model_validate(get_memory_diagnostics().report())
+
+
+@router.post(
+    "/memory/tracing",
+    response_model=MemoryReport,
+    summary="Start tracing allocations",
+)
+async def start_memory_tracing(request: TracingRequest) -> MemoryReport:
+    """
+    Start `tracemalloc` in the answering worker process.
+
+    **Requires the `X-Admin-Key` header.**
+
+    Tracing slows down every allocation; stop it once done. Restarting
+    it discards what was traced so far.
+
+    - **frames**: Frames kept per allocation traceback (1-100)
+    """
+    diagnostics = get_memory_diagnostics()
+    diagnostics.start_tracing(request.frames)
+    return MemoryReport.model_validate(diagnostics.report())
+
+
+@router.delete(
+    "/memory/tracing",
+    response_model=MemoryReport,
+    summary="Stop tracing allocations",
+)
+async def stop_memory_tracing() -> MemoryReport:
+    """
+    Stop `tracemalloc` and drop all snapshots.
+
+    **Requires the `X-Admin-Key` header.**
+    """
+    diagnostics = get_memory_diagnostics()
+    diagnostics.stop_tracing()
+    return MemoryReport.model_validate(diagnostics.report())
+
+
+@router.get(
+    "/memory/snapshots",
+    response_model=list[MemorySnapshot],
+    summary="List memory snapshots",
+)
+async def list_memory_snapshots() -> list[MemorySnapshot]:
+    """
+    List the snapshots kept for diffing, oldest first.
+
+    **Requires the `X-Admin-Key` header.**
+    """
+    return [MemorySnapshot.model_validate(info) for info in get_memory_diagnostics().snapshots()]
+
+
+@router.post(
+    "/memory/snapshots",
+    response_model=MemorySnapshot,
+    status_code=status.HTTP_201_CREATED,
+    summary="Take a memory snapshot",
+)
+async def take_memory_snapshot() -> MemorySnapshot:
+    """
+    Snapshot the allocations traced so far.
+
+    **Requires the `X-Admin-Key` header** and tracing to be started.
+
+    The ten newest snapshots are kept.
+    """
+    info = await asyncio.to_thread(get_memory_diagnostics().take_snapshot)
+    if info is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Allocation tracing is not running",
+        )
+    return MemorySnapshot.model_validate(info)
+
+
+@router.get(
+    "/memory/snapshots/{snapshot_id}/diff",
+    response_model=MemorySnapshotDiff,
+    summary="Diff two memory snapshots",
+)
+async def diff_memory_snapshots(
+    snapshot_id: int,
+    base: Annotated[
+        int | None, Query(description="Earlier snapshot; defaults to the one before")
+    ] = None,
+    group_by: GroupBy = "lineno",
+    limit: Annotated[int, Query(ge=1, le=500)] = 20,
+) -> MemorySnapshotDiff:
+    """
+    Show the allocation sites whose memory changed most between two snapshots.
+
+    **Requires the `X-Admin-Key` header.**
+
+    - **base**: Earlier snapshot ID; defaults to the snapshot before this one
+    - **group_by**: `lineno`, `filename` or `traceback`
+    - **limit**: Number of sites (1-500), largest change first
+    """
+    diagnostics = get_memory_diagnostics()
+    if base is None:
+        earlier = [info.id for info in diagnostics.snapshots() if info.id < snapshot_id]
+        if not earlier:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No earlier snapshot to compare with",
+            )
+        base = earlier[-1]
+    diff = await asyncio.to_thread(diagnostics.diff, base, snapshot_id, group_by, limit)
+    if diff is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Snapshot not found",
+        )
+    return MemorySnapshotDiff.model_validate(diff)
@@ -1,29 +1,61 @@
 """Authentication router."""
 
+from dataclasses import asdict
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import EmailStr
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.application.dto.user import UserCreateDTO, UserResponseDTO
 from src.application.use_cases.auth import (
+    CheckAvailabilityUseCase,
+    IntrospectTokensUseCase,
     LoginUserUseCase,
+    LogoutUseCase,
     RefreshTokenUseCase,
     RegisterUserUseCase,
 )
 from src.domain.exceptions import (
     InvalidCredentialsError,
     InvalidTokenError,
+    TooManyLoginAttemptsError,
     UserAlreadyExistsError,
     UserNotFoundError,
 )
-from src.infrastructure.db.repositories.user import UserRepository
-from src.infrastructure.db.session import get_async_session
+from src.infrastructure.db.activity_log import AfterCommitActivityLog, get_activity_log
+from src.infrastructure.db.repositories.loader import (
+    CoalescingUserRepository,
+    get_user_loader,
+)
+from src.infrastructure.db.repositories.sharded_user import user_repository_for
+from src.infrastructure.db.session import (
+    get_async_session,
+    get_readonly_session,
+    get_readonly_session_factory,
+    get_session_factory,
+)
+from src.infrastructure.external.availability_filter import get_availability_filter
 from src.infrastructure.external.jwt_service import JWTService
+from src.infrastructure.external.login_throttle import get_login_throttle
 from src.infrastructure.external.password_hasher import PasswordHasher
+from src.infrastructure.external.token_denylist import get_token_denylist
+from src.presentation.api.dependencies.api_key import require_service_key
 from src.presentation.api.dependencies.auth import get_current_user
-from src.presentation.api.schemas.token import Token, TokenRefresh
-from src.presentation.api.schemas.user import UserAuth, UserCreate, UserResponse
+from src.presentation.api.dependencies.client_ip import get_client_ip
+from src.presentation.api.schemas.token import (
+    Token,
+    TokenIntrospection,
+    TokenIntrospectionRequest,
+    TokenIntrospectionResponse,
+    TokenRefresh,
+)
+from src.presentation.api.schemas.user import (
+    Availability,
+    UserAuth,
+    UserCreate,
+    UserResponse,
+)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -36,7 +68,9 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 )
 async def register(
     user_data: UserCreate,
+    client_ip: Annotated[str | None, Depends(get_client_ip)],
     session: Annotated[AsyncSession, Depends(get_async_session)],
+    session_factory: Annotated[async_sessionmaker[AsyncSession], Depends(get_session_factory)],
 ) -> Token:
     """
     Register a new user account and return tokens.
@@ -45,11 +79,18 @@ async def register(
     - **username**: Username (3-50 characters, must be unique)
     - **password**: Password (8-100 characters)
     """
-    user_repository = UserRepository(session)
+    user_repository = user_repository_for(session)
     password_hasher = PasswordHasher()
     jwt_service = JWTService()
 
-    use_case = RegisterUserUseCase(user_repository, password_hasher, jwt_service)
+    use_case = RegisterUserUseCase(
+        user_repository,
+        password_hasher,
+        jwt_service,
+        # The event is written only once the new user is committed
+        AfterCommitActivityLog(session, get_activity_log(session_factory)),
+        get_availability_filter(),
+    )
 
     dto = UserCreateDTO(
         email=user_data.email,
@@ -58,7 +99,7 @@ async def register(
     )
 
     try:
-        result = await use_case.execute(dto)
+        result = await use_case.execute(dto, client_ip)
     except UserAlreadyExistsError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -71,6 +112,45 @@ async def register(
     )
 
 
+@router.get(
+    "/availability",
+    response_model=Availability,
+    summary="Check email/username availability",
+)
+async def check_availability(
+    session: Annotated[AsyncSession, Depends(get_readonly_session)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_readonly_session_factory)
+    ],
+    email: Annotated[EmailStr | None, Query()] = None,
+    username: Annotated[str | None, Query(min_length=3, max_length=50)] = None,
+) -> Availability:
+    """
+    Tell whether an email and/or username can still be registered.
+
+    Meant for signup forms checking as the user types: values never seen
+    are answered from an in-memory Bloom filter without touching the
+    database. A `true` answer is advisory; registration still enforces
+    uniqueness.
+
+    - **email**: Email to check
+    - **username**: Username to check
+    """
+    if email is None and username is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Give an email, a username or both",
+        )
+
+    user_repository = CoalescingUserRepository(
+        get_user_loader(session_factory), user_repository_for(session)
+    )
+    use_case = CheckAvailabilityUseCase(user_repository, get_availability_filter())
+    result = await use_case.execute(email=email, username=username)
+
+    return Availability(email=result.email, username=result.username)
+
+
 @router.post(
     "/login",
     response_model=Token,
@@ -78,22 +158,39 @@ async def register(
 )
 async def login(
     credentials: UserAuth,
+    client_ip: Annotated[str | None, Depends(get_client_ip)],
     session: Annotated[AsyncSession, Depends(get_async_session)],
+    session_factory: Annotated[async_sessionmaker[AsyncSession], Depends(get_session_factory)],
 ) -> Token:
     """
     Authenticate user and return access and refresh tokens.
 
+    Repeated failures for the same account or client IP are rejected with
+    429 and a `Retry-After` header.
+
     - **email**: User's email address
     - **password**: User's password
     """
-    user_repository = UserRepository(session)
+    user_repository = user_repository_for(session)
     password_hasher = PasswordHasher()
     jwt_service = JWTService()
 
-    use_case = LoginUserUseCase(user_repository, password_hasher, jwt_service)
+    use_case = LoginUserUseCase(
+        user_repository,
+        password_hasher,
+        jwt_service,
+        get_login_throttle(),
+        get_activity_log(session_factory),
+    )
 
     try:
-        result = await use_case.execute(credentials.email, credentials.password)
+        result = await use_case.execute(credentials.email, credentials.password, client_ip)
+    except TooManyLoginAttemptsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except InvalidCredentialsError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -114,20 +211,37 @@ async def login(
 )
 async def refresh_token(
     token_data: TokenRefresh,
-    session: Annotated[AsyncSession, Depends(get_async_session)],
+    client_ip: Annotated[str | None, Depends(get_client_ip)],
+    session: Annotated[AsyncSession, Depends(get_readonly_session)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_readonly_session_factory)
+    ],
+    write_session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_session_factory)
+    ],
 ) -> Token:
     """
     Get new access and refresh tokens using a valid refresh token.
 
+    The presented refresh token is consumed; reusing it revokes every
+    token issued from the same login.
+
     - **refresh_token**: Valid refresh token
     """
-    user_repository = UserRepository(session)
+    user_repository = CoalescingUserRepository(
+        get_user_loader(session_factory), user_repository_for(session)
+    )
     jwt_service = JWTService()
 
-    use_case = RefreshTokenUseCase(user_repository, jwt_service)
+    use_case = RefreshTokenUseCase(
+        user_repository,
+        jwt_service,
+        get_token_denylist(),
+        get_activity_log(write_session_factory),
+    )
 
     try:
-        result = await use_case.execute(token_data.refresh_token)
+        result = await use_case.execute(token_data.refresh_token, client_ip)
     except InvalidTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -147,6 +261,29 @@ async def refresh_token(
     )
 
 
+@router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Revoke a login session",
+)
+async def logout(token_data: TokenRefresh) -> None:
+    """
+    Revoke the refresh token and every token issued from the same login.
+
+    - **refresh_token**: Refresh token of the session to end
+    """
+    use_case = LogoutUseCase(JWTService(), get_token_denylist())
+
+    try:
+        await use_case.execute(token_data.refresh_token)
+    except InvalidTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
 @router.get(
     "/me",
     response_model=UserResponse,
@@ -167,3 +304,31 @@ async def get_me(
         created_at=current_user.created_at,
     )
 
+
+@router.post(
+    "/introspect",
+    response_model=TokenIntrospectionResponse,
+    summary="Validate many tokens at once",
+    dependencies=[Depends(require_service_key)],
+)
+async def introspect_tokens(
+    request: TokenIntrospectionRequest,
+    session: Annotated[AsyncSession, Depends(get_readonly_session)],
+) -> TokenIntrospectionResponse:
+    """
+    Validate a batch of tokens and resolve their users in one query.
+
+    **Requires the `X-Service-Key` header.**
+
+    - **tokens**: Up to 100 access or refresh tokens
+
+    Returns one result per token, in request order.
+    """
+    use_case = IntrospectTokensUseCase(
+        user_repository_for(session), JWTService(), get_token_denylist()
+    )
+    results = await use_case.execute(request.tokens)
+
+    return TokenIntrospectionResponse(
+        results=[TokenIntrospection(**asdict(result)) for result in results]
+    )
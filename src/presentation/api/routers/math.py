@@ -8,6 +8,7 @@ from src.application.dto.math import PrimesListRequestDTO
 from src.application.dto.user import UserResponseDTO
 from src.application.use_cases.math import MathUseCase
 from src.domain.exceptions import MathOperationError
+from src.infrastructure.prime_cache import get_prime_sieve
 from src.presentation.api.dependencies.auth import get_current_user
 from src.presentation.api.schemas.math import PrimesListRequest, PrimesListResponse
 
@@ -32,7 +33,7 @@ async def get_primes_list(
 
     Returns a list of all prime numbers up to the limit.
     """
-    use_case = MathUseCase()
+    use_case = MathUseCase(get_prime_sieve())
 
     try:
         result = use_case.get_primes_list(PrimesListRequestDTO(limit=request.limit))
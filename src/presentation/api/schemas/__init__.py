@@ -4,22 +4,48 @@ from src.presentation.api.schemas.math import (
     PrimesListRequest,
     PrimesListResponse,
 )
+from src.presentation.api.schemas.memory import (
+    MemoryReport,
+    MemorySnapshot,
+    MemorySnapshotDiff,
+    TracingRequest,
+)
 from src.presentation.api.schemas.token import (
     Token,
+    TokenIntrospection,
+    TokenIntrospectionRequest,
+    TokenIntrospectionResponse,
     TokenRefresh,
 )
 from src.presentation.api.schemas.user import (
+    Availability,
     UserAuth,
     UserCreate,
+    UserImportError,
+    UserImportResponse,
+    UserImportRow,
+    UserPage,
     UserResponse,
 )
 
 __all__ = [
     "UserCreate",
     "UserAuth",
+    "Availability",
     "UserResponse",
+    "UserPage",
+    "UserImportRow",
+    "UserImportError",
+    "UserImportResponse",
     "Token",
     "TokenRefresh",
+    "TokenIntrospectionRequest",
+    "TokenIntrospection",
+    "TokenIntrospectionResponse",
     "PrimesListRequest",
     "PrimesListResponse",
+    "MemoryReport",
+    "TracingRequest",
+    "MemorySnapshot",
+    "MemorySnapshotDiff",
 ]
@@ -0,0 +1,80 @@
+"""Memory diagnostics Pydantic schemas."""
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class CacheUsage(BaseModel):
+    """Schema for the size of one in-process cache."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    entries: int
+    size_bytes: int = Field(..., description="Approximate size of the cached data")
+
+
+class GCGeneration(BaseModel):
+    """Schema for the collector state of one GC generation."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    generation: int
+    pending: int = Field(..., description="Allocations since the last collection")
+    threshold: int
+    collections: int
+    collected: int
+    uncollectable: int
+
+
+class MemoryReport(BaseModel):
+    """Schema for the memory use of the worker process that answered."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    pid: int
+    rss_bytes: int | None
+    peak_rss_bytes: int | None
+    tracing: bool
+    traced_bytes: int | None = Field(..., description="Memory traced by tracemalloc")
+    traced_peak_bytes: int | None
+    gc: list[GCGeneration]
+    caches: dict[str, CacheUsage]
+
+
+class TracingRequest(BaseModel):
+    """Schema for starting tracemalloc."""
+
+    frames: int = Field(1, ge=1, le=100, description="Frames kept per allocation traceback")
+
+
+class MemorySnapshot(BaseModel):
+    """Schema for a tracemalloc snapshot kept for diffing."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    taken_at: float
+    traced_bytes: int
+    blocks: int
+
+
+class AllocationDiff(BaseModel):
+    """Schema for the change in memory allocated at one site."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    site: str = Field(..., description="Allocating line first, then its callers")
+    size_bytes: int
+    size_diff_bytes: int
+    count: int
+    count_diff: int
+
+
+class MemorySnapshotDiff(BaseModel):
+    """Schema for the allocation sites that changed most between two snapshots."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    base_id: int
+    snapshot_id: int
+    size_diff_bytes: int
+    sites: list[AllocationDiff]
@@ -1,6 +1,6 @@
 """Token-related Pydantic schemas."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Token(BaseModel):
@@ -15,3 +15,26 @@ class TokenRefresh(BaseModel):
 
     refresh_token: str
 
+
+class TokenIntrospectionRequest(BaseModel):
+    """Schema for batch token introspection request."""
+
+    tokens: list[str] = Field(..., min_length=1, max_length=100)
+
+
+class TokenIntrospection(BaseModel):
+    """Schema for the introspection result of a single token."""
+
+    active: bool
+    sub: int | None = None
+    exp: int | None = None
+    type: str | None = None
+    username: str | None = None
+    email: str | None = None
+    error: str | None = None
+
+
+class TokenIntrospectionResponse(BaseModel):
+    """Schema for batch token introspection response."""
+
+    results: list[TokenIntrospection]
@@ -1,8 +1,9 @@
 """User-related Pydantic schemas."""
 
 from datetime import datetime
+from typing import Self
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, model_validator
 
 
 class UserCreate(BaseModel):
@@ -13,6 +14,13 @@ class UserCreate(BaseModel):
     password: str = Field(..., min_length=8, max_length=100)
 
 
+class Availability(BaseModel):
+    """Schema for an availability check; null for fields not asked about."""
+
+    email: bool | None = None
+    username: bool | None = None
+
+
 class UserAuth(BaseModel):
     """Schema for user login request."""
 
@@ -29,3 +37,48 @@ class UserResponse(BaseModel):
     email: str
     username: str
     created_at: datetime
+
+
+class UserPage(BaseModel):
+    """Schema for one page of the user listing."""
+
+    items: list[UserResponse]
+    next_cursor: str | None = Field(
+        None, description="Pass as `cursor` to get the next page; null on the last page"
+    )
+
+
+class UserImportRow(BaseModel):
+    """Schema for one user of a bulk import."""
+
+    email: EmailStr
+    username: str = Field(..., min_length=3, max_length=50)
+    password: str | None = Field(None, min_length=8, max_length=100)
+    hashed_password: str | None = Field(
+        None,
+        pattern=r"^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$",
+        description="bcrypt hash migrated from another system, stored as is",
+    )
+
+    @model_validator(mode="after")
+    def _one_password(self) -> Self:
+        if (self.password is None) == (self.hashed_password is None):
+            raise ValueError("Give exactly one of password and hashed_password")
+        return self
+
+
+class UserImportError(BaseModel):
+    """Schema for a row a bulk import rejected."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    row: int
+    email: str | None
+    error: str
+
+
+class UserImportResponse(BaseModel):
+    """Schema for the outcome of a bulk import."""
+
+    imported: int
+    errors: list[UserImportError]
@@ -0,0 +1,108 @@
+"""
+Bulk user import from the command line.
+
+Usage::
+
+    python -m src.presentation.cli.import_users users.ndjson
+    python -m src.presentation.cli.import_users users.csv --format csv --batch-size 5000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections.abc import AsyncIterator, Iterable
+from pathlib import Path
+
+from src.application.dto.user import (
+    UserImportErrorDTO,
+    UserImportProgressDTO,
+    UserImportRowDTO,
+)
+from src.application.use_cases.users import ImportUsersUseCase
+from src.infrastructure.config import get_settings
+from src.infrastructure.db.repositories.sharded_user import user_repository_for
+from src.infrastructure.db.session import close_database, get_session_factory
+from src.infrastructure.external.availability_filter import get_availability_filter
+from src.infrastructure.external.password_hasher import (
+    PasswordHasher,
+    share_bcrypt_rounds,
+    shutdown_hashing_pool,
+)
+from src.infrastructure.redis_client import close_redis, get_redis
+from src.presentation.user_import import ImportFormat, parse_import_rows
+
+
+async def _rows(rows: Iterable[UserImportRowDTO]) -> AsyncIterator[UserImportRowDTO]:
+    for row in rows:
+        yield row
+
+
+async def _import(path: Path, import_format: ImportFormat, batch_size: int) -> int:
+    started = time.perf_counter()
+    errors: list[UserImportErrorDTO] = []
+    try:
+        # Hash at the cost the API processes use
+        await share_bcrypt_rounds(get_redis())
+        with path.open(encoding="utf-8-sig", newline="") as source:
+            # Rows are read from the file as the import consumes them
+            rows = _rows(parse_import_rows(source, import_format, errors))
+            async with get_session_factory()() as session:
+
+                async def commit_batch(progress: UserImportProgressDTO) -> None:
+                    await session.commit()
+                    print(
+                        f"Committed row {progress.last_row}: {progress.imported} imported, "
+                        f"{progress.skipped + len(errors)} skipped",
+                        file=sys.stderr,
+                    )
+
+                # Publishes the new users to the shared availability bitmap, if any
+                use_case = ImportUsersUseCase(
+                    user_repository_for(session),
+                    PasswordHasher(),
+                    batch_size,
+                    get_availability_filter(),
+                    commit_batch,
+                )
+                result = await use_case.execute(rows)
+    finally:
+        await close_database()
+        await close_redis()
+
+    elapsed = time.perf_counter() - started
+    for error in sorted([*errors, *result.errors], key=lambda error: error.row):
+        print(f"row {error.row} ({error.email or '-'}): {error.error}", file=sys.stderr)
+    print(
+        f"Imported {result.imported} users, skipped {len(errors) + len(result.errors)} "
+        f"in {elapsed:.1f}s ({result.imported / elapsed:.0f} users/s)"
+    )
+    return 1 if errors or result.errors else 0
+
+
+def main() -> None:
+    """Parse arguments and run the import."""
+    parser = argparse.ArgumentParser(description="Import users from an NDJSON or CSV file.")
+    parser.add_argument("file", type=Path, help="File with one user per row")
+    parser.add_argument(
+        "--format",
+        type=ImportFormat,
+        choices=list(ImportFormat),
+        default=ImportFormat.NDJSON,
+        help="File format (default: ndjson)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=get_settings().bulk_import_batch_size,
+        help="Users hashed and inserted per batch",
+    )
+    args = parser.parse_args()
+    try:
+        sys.exit(asyncio.run(_import(args.file, args.format, args.batch_size)))
+    finally:
+        shutdown_hashing_pool()
+
+
+if __name__ == "__main__":
+    main()
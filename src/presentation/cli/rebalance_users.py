@@ -0,0 +1,56 @@
+"""
+Move users to the shards that own them, from the command line.
+
+Run with the application stopped, after setting ``DATABASE_SHARD_URLS``
+for the first time and after appending shards to it::
+
+    python -m src.presentation.cli.rebalance_users
+    python -m src.presentation.cli.rebalance_users --batch-size 5000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from src.infrastructure.db.rebalance import rebalance_users
+from src.infrastructure.db.session import close_database, get_database
+
+
+async def _rebalance(batch_size: int) -> int:
+    started = time.perf_counter()
+    database = get_database()
+    try:
+        if database.shard_ring is None:
+            print("DATABASE_SHARD_URLS is not set: nothing to rebalance", file=sys.stderr)
+            return 2
+        result = await rebalance_users(
+            database.engine, database.shard_engines, database.shard_ring, batch_size
+        )
+    finally:
+        await close_database()
+
+    print(
+        f"Rebuilt {result.directory_entries} directory entries and moved {result.moved} "
+        f"users in {time.perf_counter() - started:.1f}s"
+    )
+    if result.conflicts:
+        print(f"{result.conflicts} users conflict with their shard; see the log", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main() -> None:
+    """Parse arguments and run the rebalance."""
+    parser = argparse.ArgumentParser(
+        description="Rebuild the user directory and move users to their shards."
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Users moved per transaction"
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_rebalance(args.batch_size)))
+
+
+if __name__ == "__main__":
+    main()
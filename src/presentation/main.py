@@ -1,63 +1,188 @@
 """FastAPI application entry point."""
 
+import asyncio
+import logging
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.infrastructure import metrics
 from src.infrastructure.config import get_settings
-from src.presentation.api.routers import auth_router, math_router
+from src.infrastructure.db.activity_log import close_activity_logs
+from src.infrastructure.db.rebalance import unplaced_users
+from src.infrastructure.db.session import close_database, get_database
+from src.infrastructure.external.availability_filter import get_availability_filter
+from src.infrastructure.external.password_hasher import (
+    share_bcrypt_rounds,
+    shutdown_hashing_pool,
+)
+from src.infrastructure.external.token_denylist import get_token_denylist
+from src.infrastructure.loop_monitor import EventLoopMonitor
+from src.infrastructure.redis_client import close_redis, get_redis
+from src.infrastructure.structured_logging import configure_logging, stop_logging
+from src.infrastructure.warmup import warm_up
+from src.presentation.api.middleware import (
+    AccessLogMiddleware,
+    HTTPMetricsMiddleware,
+    ProfilingMiddleware,
+    QueryStatsMiddleware,
+    StartupLatencyMiddleware,
+)
+from src.presentation.api.routers import admin_router, auth_router, math_router
 
-settings = get_settings()
+logger = logging.getLogger(__name__)
 
+STARTUP_SECONDS = metrics.registry.gauge(
+    "app_startup_seconds", "Time from creating the application until it was ready to serve"
+)
 
-@asynccontextmanager
-async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
-    """Application lifespan manager."""
-    # Startup
-    print(f"Starting {settings.app_name} v{settings.app_version}")
-    yield
-    # Shutdown
-    print(f"Shutting down {settings.app_name}")
 
+def create_app() -> FastAPI:
+    """
+    Build the application.
 
-app = FastAPI(
-    title=settings.app_name,
-    version=settings.app_version,
-    description="Production-ready FastAPI backend with JWT authentication",
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json",
-    lifespan=lifespan,
-)
+    Database engines, Redis and worker pools are created by the lifespan,
+    not on import, and warmed up before the first request when
+    ``startup_warmup`` is set. The application and the process-wide
+    infrastructure are configured by the same ``get_settings()``, i.e. the
+    environment.
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    Serve with ``uvicorn --factory src.presentation.main:create_app`` or
+    through the module-level ``app``.
+
+    Returns:
+        The application
+    """
+    settings = get_settings()
+    created = time.perf_counter()
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+        """Create, warm up and release the process-wide resources."""
+        # Startup
+        log_listener = configure_logging(settings)
+        logger.info("Starting %s v%s", settings.app_name, settings.app_version)
+        if settings.metrics_multiproc_dir:
+            # Runs in each uvicorn worker, so every worker writes its own file
+            metrics.enable_multiprocess(
+                settings.metrics_multiproc_dir, settings.metrics_multiproc_interval_seconds
+            )
+        logger.info("Using bcrypt cost factor %d", await share_bcrypt_rounds(get_redis()))
+        database = get_database()
+        if database.shard_ring is not None and await unplaced_users(database.engine):
+            logger.error(
+                "Users are still stored in the directory database and cannot be found "
+                "on the shards; run python -m src.presentation.cli.rebalance_users"
+            )
+        if settings.startup_warmup:
+            timings = await warm_up(settings, database)
+            logger.info("Warmed up %s in %.2fs", ", ".join(timings), sum(timings.values()))
+        denylist = get_token_denylist()
+        await denylist.sync()
+        denylist_sync = asyncio.create_task(
+            denylist.run_sync(settings.token_denylist_sync_seconds)
+        )
+        # Built in the background: until ready, availability checks query the database
+        availability_sync = asyncio.create_task(
+            get_availability_filter().run_sync(
+                database.session_factory, settings.availability_sync_seconds
+            )
+        )
+        loop_monitor = None
+        if settings.loop_monitor_enabled:
+            threshold_ms = settings.loop_block_threshold_ms
+            if settings.debug:
+                # Development: flag every handler step holding the loop this long
+                threshold_ms = settings.loop_block_debug_ms
+                loop = asyncio.get_running_loop()
+                loop.set_debug(True)
+                loop.slow_callback_duration = threshold_ms / 1000
+            loop_monitor = EventLoopMonitor(
+                settings.loop_monitor_interval_ms / 1000, threshold_ms / 1000
+            )
+            loop_monitor.start()
+        STARTUP_SECONDS.set(time.perf_counter() - created)
+        yield
+        # Shutdown
+        if loop_monitor is not None:
+            await loop_monitor.stop()
+        denylist_sync.cancel()
+        availability_sync.cancel()
+        await close_activity_logs()
+        shutdown_hashing_pool()
+        await close_database()
+        await close_redis()
+        logger.info("Shutting down %s", settings.app_name)
+        await asyncio.to_thread(stop_logging, log_listener)
+
+    app = FastAPI(
+        title=settings.app_name,
+        version=settings.app_version,
+        description="Production-ready FastAPI backend with JWT authentication",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        openapi_url="/openapi.json",
+        lifespan=lifespan,
+    )
+
+    # Innermost, and only installed when enabled: costs nothing otherwise
+    if settings.profiling_enabled:
+        app.add_middleware(ProfilingMiddleware, settings=settings)
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Access log; inside the SQL accounting so it can report database time
+    if settings.log_access:
+        app.add_middleware(AccessLogMiddleware, settings=settings)
+
+    # Per-request SQL accounting (slow-query log, N+1 warnings, debug headers)
+    app.add_middleware(QueryStatsMiddleware, settings=settings)
+
+    # Per-route counts, latency, response sizes and in-flight requests
+    app.add_middleware(HTTPMetricsMiddleware)
+
+    # Outermost: latency of the first requests, as clients see it
+    app.add_middleware(
+        StartupLatencyMiddleware, started=created, sample_size=settings.startup_latency_requests
+    )
+
+    # Include routers
+    app.include_router(auth_router, prefix="/api/v1")
+    app.include_router(math_router, prefix="/api/v1")
+    app.include_router(admin_router, prefix="/api/v1")
 
-# Include routers
-app.include_router(auth_router, prefix="/api/v1")
-app.include_router(math_router, prefix="/api/v1")
+    @app.get("/", tags=["Health"])
+    async def root() -> dict[str, str]:
+        """Root endpoint - health check."""
+        return {
+            "message": f"Welcome to {settings.app_name}",
+            "version": settings.app_version,
+            "status": "healthy",
+        }
 
+    @app.get("/health", tags=["Health"])
+    async def health_check() -> dict[str, str]:
+        """Health check endpoint."""
+        return {"status": "healthy"}
 
-@app.get("/", tags=["Health"])
-async def root() -> dict[str, str]:
-    """Root endpoint - health check."""
-    return {
-        "message": f"Welcome to {settings.app_name}",
-        "version": settings.app_version,
-        "status": "healthy",
-    }
+    # Not async: rendering reads the other workers' metric files from disk,
+    # so it runs in the threadpool rather than on the event loop
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    def metrics_endpoint() -> Response:
+        """Expose application metrics (of all workers) in the Prometheus text format."""
+        return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
 
+    return app
 
-@app.get("/health", tags=["Health"])
-async def health_check() -> dict[str, str]:
-    """Health check endpoint."""
-    return {"status": "healthy"}
 
+app = create_app()
@@ -0,0 +1,172 @@
+"""Parsing of bulk user import files shared by the admin API and the CLI."""
+
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from enum import StrEnum
+
+from pydantic import ValidationError
+
+from src.application.dto.user import UserImportErrorDTO, UserImportRowDTO
+from src.presentation.api.schemas.user import UserImportRow
+
+
+class ImportFormat(StrEnum):
+    """Supported user import formats."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ImportRowParser:
+    """
+    Validate the rows of an import file one line at a time.
+
+    CSV records spanning several lines (quoted line breaks) are buffered
+    until complete; the header line names the fields of every record.
+    """
+
+    def __init__(self, import_format: ImportFormat):
+        self._format = import_format
+        self._header: list[str] | None = None
+        self._pending = ""
+        self._number = 0
+
+    def _record(self, line: str) -> object:
+        if self._format is ImportFormat.NDJSON:
+            self._number += 1
+            if not line.strip():
+                return None
+            try:
+                return json.loads(line)
+            except json.JSONDecodeError:
+                return ValueError("Invalid JSON")
+
+        self._pending += line if line.endswith("\n") else line + "\n"
+        # Quotes are escaped by doubling, so an odd count means an open field
+        if self._pending.count('"') % 2:
+            return None
+        fields = next(csv.reader([self._pending]), [])
+        self._pending = ""
+        if not fields:
+            return None
+        if self._header is None:
+            self._header = fields
+            return None
+        self._number += 1
+        record: dict[str | None, object] = dict(zip(self._header, fields, strict=False))
+        if len(fields) > len(self._header):
+            record[None] = fields[len(self._header) :]
+        # Empty CSV cells mean "not given"
+        return {key: value for key, value in record.items() if value != ""}
+
+    def feed(self, line: str) -> UserImportRowDTO | UserImportErrorDTO | None:
+        """
+        Parse the next line of the file.
+
+        Args:
+            line: One line, with or without its line break
+
+        Returns:
+            The validated row or the error of an invalid one, numbered from
+            1; None for blank lines, the CSV header and incomplete records
+        """
+        record = self._record(line)
+        if record is None:
+            return None
+        if isinstance(record, ValueError):
+            return UserImportErrorDTO(self._number, None, str(record))
+        try:
+            row = UserImportRow.model_validate(record)
+        except ValidationError as e:
+            email = record.get("email") if isinstance(record, dict) else None
+            message = "; ".join(
+                f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}"
+                for error in e.errors()
+            )
+            return UserImportErrorDTO(self._number, email, message)
+        return UserImportRowDTO(
+            row=self._number,
+            email=str(row.email),
+            username=row.username,
+            password=row.password,
+            hashed_password=row.hashed_password,
+        )
+
+    def finish(self) -> UserImportErrorDTO | None:
+        """
+        Report a record left incomplete at the end of the file.
+
+        Returns:
+            The error of a CSV record whose quoted field was never closed,
+            None if the file ended cleanly
+        """
+        if not self._pending:
+            return None
+        self._pending = ""
+        self._number += 1
+        return UserImportErrorDTO(self._number, None, "Unterminated quoted field")
+
+
+def parse_import_rows(
+    lines: Iterable[str], import_format: ImportFormat, errors: list[UserImportErrorDTO]
+) -> Iterator[UserImportRowDTO]:
+    """
+    Validate the rows of an import file as it is read.
+
+    Args:
+        lines: Lines of the file
+        import_format: NDJSON (one object per line) or CSV with a header row
+        errors: Receives an error for each invalid row
+
+    Yields:
+        Valid rows, numbered from 1
+    """
+    parser = ImportRowParser(import_format)
+    yield from _valid_rows(parser, lines, errors)
+    _finish(parser, errors)
+
+
+def _finish(parser: ImportRowParser, errors: list[UserImportErrorDTO]) -> None:
+    error = parser.finish()
+    if error is not None:
+        errors.append(error)
+
+
+def _valid_rows(
+    parser: ImportRowParser, lines: Iterable[str], errors: list[UserImportErrorDTO]
+) -> Iterator[UserImportRowDTO]:
+    for line in lines:
+        parsed = parser.feed(line)
+        if isinstance(parsed, UserImportErrorDTO):
+            errors.append(parsed)
+        elif parsed is not None:
+            yield parsed
+
+
+async def stream_import_rows(
+    chunks: AsyncIterable[bytes], import_format: ImportFormat, errors: list[UserImportErrorDTO]
+) -> AsyncIterator[UserImportRowDTO]:
+    """
+    Validate the rows of an import file as its bytes arrive.
+
+    Args:
+        chunks: UTF-8 encoded file, in chunks of any size
+        import_format: NDJSON (one object per line) or CSV with a header row
+        errors: Receives an error for each invalid row
+
+    Yields:
+        Valid rows, numbered from 1
+    """
+    parser = ImportRowParser(import_format)
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for row in _valid_rows(parser, lines, errors):
+            yield row
+    pending += decoder.decode(b"", final=True)
+    for row in _valid_rows(parser, [pending] if pending else [], errors):
+        yield row
+    _finish(parser, errors)
@@ -1,5 +1,6 @@
 """Shared test fixtures with in-memory SQLite database."""
 
+import os
 from collections.abc import AsyncGenerator
 
 import pytest
@@ -7,9 +8,24 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
-from src.infrastructure.db.models.base import Base
-from src.infrastructure.db.session import get_async_session
-from src.presentation.main import app
+# Cheapest bcrypt cost keeps the suite fast and skips calibration
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("SERVICE_API_KEY", "test-service-key")
+os.environ.setdefault("ADMIN_API_KEY", "test-admin-key")
+
+from src.infrastructure.db.activity_log import close_activity_logs  # noqa: E402
+from src.infrastructure.db.models.base import Base  # noqa: E402
+from src.infrastructure.db.session import (  # noqa: E402
+    ReadOnlyAsyncSession,
+    get_readonly_session_factory,
+    get_session_factory,
+)
+from src.infrastructure.external.availability_filter import (  # noqa: E402
+    get_availability_filter,
+)
+from src.infrastructure.external.login_throttle import get_login_throttle  # noqa: E402
+from src.infrastructure.external.token_denylist import get_token_denylist  # noqa: E402
+from src.presentation.main import app  # noqa: E402
 
 # In-memory SQLite for fast tests
 _test_engine = create_async_engine(
@@ -27,6 +43,13 @@ _TestAsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+_TestReadOnlySessionLocal = async_sessionmaker(
+    _test_engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=ReadOnlyAsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
 
 @pytest.fixture(scope="session")
 async def setup_database():
@@ -48,20 +71,22 @@ async def test_session(setup_database) -> AsyncGenerator[AsyncSession, None]:
         await session.commit()
 
 
+@pytest.fixture
+def session_factory(
+    setup_database,  # noqa: ARG001 - requested only so the tables exist
+) -> async_sessionmaker[AsyncSession]:
+    """Provide the test session factory for code that opens its own sessions."""
+    return _TestAsyncSessionLocal
+
+
 @pytest.fixture(scope="function")
 async def client(setup_database) -> AsyncGenerator[AsyncClient, None]:
     """Provide an async HTTP client for testing."""
-
-    async def override_get_async_session() -> AsyncGenerator[AsyncSession, None]:
-        async with _TestAsyncSessionLocal() as session:
-            try:
-                yield session
-                await session.commit()
-            except Exception:
-                await session.rollback()
-                raise
-
-    app.dependency_overrides[get_async_session] = override_get_async_session
+    app.dependency_overrides[get_session_factory] = lambda: _TestAsyncSessionLocal
+    app.dependency_overrides[get_readonly_session_factory] = lambda: _TestReadOnlySessionLocal
+    get_login_throttle.cache_clear()
+    get_token_denylist.cache_clear()
+    get_availability_filter.cache_clear()
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -70,6 +95,7 @@ async def client(setup_database) -> AsyncGenerator[AsyncClient, None]:
         yield ac
 
     app.dependency_overrides.clear()
+    await close_activity_logs()
 
     # Clean up data after test
     async with _TestAsyncSessionLocal() as session:
@@ -0,0 +1,105 @@
+"""Tests for the write-behind activity log."""
+
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.dto.activity import ActivityEventDTO, ActivityEventType
+from src.infrastructure.db.activity_log import (
+    ACTIVITY_EVENTS,
+    AfterCommitActivityLog,
+    WriteBehindActivityLog,
+    get_activity_log,
+)
+from src.infrastructure.db.models.user import UserModel
+from src.infrastructure.db.models.user_activity import UserActivityEventModel
+
+
+@pytest.mark.asyncio
+async def test_auth_events_are_written_behind(
+    client: AsyncClient, registered_user: dict, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test register, login and refresh are logged and logins set last_login_at once flushed."""
+    credentials = {"email": registered_user["email"], "password": registered_user["password"]}
+    for _ in range(2):
+        assert (await client.post("/api/v1/auth/login", json=credentials)).status_code == 200
+    response = await client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": registered_user["refresh_token"]}
+    )
+    assert response.status_code == 200
+
+    await get_activity_log(session_factory).flush()
+
+    async with session_factory() as session:
+        events = (
+            await session.execute(
+                select(UserActivityEventModel).order_by(UserActivityEventModel.id)
+            )
+        ).scalars().all()
+        user = (await session.execute(select(UserModel))).scalar_one()
+
+    assert [event.event_type for event in events] == ["register", "login", "login", "refresh"]
+    assert {event.user_id for event in events} == {user.id}
+    assert user.last_login_at == events[2].occurred_at
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting_for_timer(
+    test_session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test reaching the batch size wakes the writer before the flush interval."""
+    activity_log = WriteBehindActivityLog(session_factory, batch_size=2, flush_seconds=60)
+    activity_log.record(ActivityEventDTO(1, ActivityEventType.LOGIN))
+    activity_log.record(ActivityEventDTO(2, ActivityEventType.LOGIN))
+
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        rows = (await test_session.execute(select(UserActivityEventModel.user_id))).all()
+        if rows:
+            break
+    await activity_log.close()
+
+    assert sorted(row.user_id for row in rows) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_overflow_drops_new_events(
+    test_session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test events beyond max_pending are dropped and counted instead of queued."""
+    dropped_before = ACTIVITY_EVENTS.value(outcome="dropped_overflow")
+    activity_log = WriteBehindActivityLog(session_factory, flush_seconds=60, max_pending=2)
+    for user_id in (1, 2, 3):
+        activity_log.record(ActivityEventDTO(user_id, ActivityEventType.REFRESH))
+    await activity_log.close()
+
+    rows = (await test_session.execute(select(UserActivityEventModel.user_id))).all()
+    assert sorted(row.user_id for row in rows) == [1, 2]
+    assert ACTIVITY_EVENTS.value(outcome="dropped_overflow") - dropped_before == 1
+
+
+
+@pytest.mark.asyncio
+async def test_after_commit_log_drops_events_of_rolled_back_writes(
+    test_session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test events held for a transaction are passed on at commit and dropped on rollback."""
+    activity_log = WriteBehindActivityLog(session_factory, flush_seconds=60)
+    held = AfterCommitActivityLog(test_session, activity_log)
+
+    test_session.add(UserModel(email="gone@example.com", username="gone", hashed_password="x"))
+    await test_session.flush()
+    held.record(ActivityEventDTO(1, ActivityEventType.REGISTER))
+    await test_session.rollback()
+
+    test_session.add(UserModel(email="kept@example.com", username="kept", hashed_password="x"))
+    await test_session.flush()
+    held.record(ActivityEventDTO(2, ActivityEventType.REGISTER))
+    await test_session.commit()
+    await activity_log.close()
+
+    rows = (await test_session.execute(select(UserActivityEventModel.user_id))).all()
+    assert [row.user_id for row in rows] == [2]
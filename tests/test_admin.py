@@ -0,0 +1,309 @@
+"""Tests for administration endpoints."""
+
+import csv
+import io
+import json
+import logging
+from collections.abc import AsyncIterator
+
+import bcrypt
+import pytest
+from httpx import AsyncClient
+
+from src.infrastructure.config import get_settings
+from src.infrastructure.prime_cache import get_prime_sieve
+
+ADMIN_HEADERS = {"X-Admin-Key": "test-admin-key"}
+
+
+async def _register(client: AsyncClient, count: int) -> None:
+    for i in range(count):
+        response = await client.post(
+            "/api/v1/auth/register",
+            json={
+                "email": f"admin{i}@example.com",
+                "username": f"admin{i}",
+                "password": "testpassword123",
+            },
+        )
+        assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_list_users_keyset_pages(client: AsyncClient) -> None:
+    """Test following cursors visits every user exactly once, in order."""
+    await _register(client, 5)
+
+    seen: list[int] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/v1/admin/users", params=params, headers=ADMIN_HEADERS)
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(item["id"] for item in data["items"])
+        pages += 1
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len(seen) == 5
+    assert seen == sorted(seen)
+
+
+@pytest.mark.asyncio
+async def test_list_users_invalid_cursor(client: AsyncClient) -> None:
+    """Test a tampered cursor is rejected."""
+    response = await client.get(
+        "/api/v1/admin/users", params={"cursor": "not-a-cursor"}, headers=ADMIN_HEADERS
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_admin_requires_key(client: AsyncClient) -> None:
+    """Test admin endpoints reject callers without the admin key."""
+    response = await client.get("/api/v1/admin/users")
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson(client: AsyncClient) -> None:
+    """Test the NDJSON export streams one JSON object per user."""
+    await _register(client, 3)
+
+    response = await client.get("/api/v1/admin/users/export", headers=ADMIN_HEADERS)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["username"] for row in rows] == ["admin0", "admin1", "admin2"]
+    assert "hashed_password" not in rows[0]
+
+
+@pytest.mark.asyncio
+async def test_export_csv(client: AsyncClient) -> None:
+    """Test the CSV export has a header and one row per user."""
+    await _register(client, 2)
+
+    response = await client.get(
+        "/api/v1/admin/users/export", params={"format": "csv"}, headers=ADMIN_HEADERS
+    )
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["email"] for row in rows] == ["admin0@example.com", "admin1@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_import_users_reports_skipped_rows(client: AsyncClient) -> None:
+    """Test valid rows are imported while invalid and duplicate rows are reported."""
+    await _register(client, 1)
+    migrated_hash = bcrypt.hashpw(b"migratedpass1", bcrypt.gensalt(rounds=4)).decode()
+    rows = [
+        {"email": "new1@example.com", "username": "new1", "password": "importpass123"},
+        {"email": "new2@example.com", "username": "new2", "hashed_password": migrated_hash},
+        {"email": "admin0@example.com", "username": "taken", "password": "importpass123"},
+        {"email": "new1@example.com", "username": "again", "password": "importpass123"},
+        {"email": "not-an-email", "username": "bad", "password": "importpass123"},
+        {"email": "both@example.com", "username": "both"},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n{broken\n"
+
+    response = await client.post(
+        "/api/v1/admin/users/import", content=body, headers=ADMIN_HEADERS
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 2
+    assert [error["row"] for error in data["errors"]] == [3, 4, 5, 6, 7]
+    assert "already exists" in data["errors"][0]["error"]
+    assert "Duplicate" in data["errors"][1]["error"]
+
+    credentials = [("new1@example.com", "importpass123"), ("new2@example.com", "migratedpass1")]
+    for email, password in credentials:
+        login = await client.post(
+            "/api/v1/auth/login", json={"email": email, "password": password}
+        )
+        assert login.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_import_users_csv(client: AsyncClient) -> None:
+    """Test CSV imports treat empty cells as missing."""
+    body = (
+        "email,username,password,hashed_password\n"
+        "csv1@example.com,csv1,importpass123,\n"
+        "csv2@example.com,csv2,importpass123,\n"
+    )
+
+    response = await client.post(
+        "/api/v1/admin/users/import",
+        params={"format": "csv"},
+        content=body,
+        headers=ADMIN_HEADERS,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"imported": 2, "errors": []}
+    listing = await client.get("/api/v1/admin/users", headers=ADMIN_HEADERS)
+    assert [item["username"] for item in listing.json()["items"]] == ["csv1", "csv2"]
+
+
+@pytest.mark.asyncio
+async def test_import_users_streams_body_in_chunks(client: AsyncClient) -> None:
+    """Test rows split across body chunks are reassembled and numbered in order."""
+    body = "".join(
+        json.dumps({"email": f"chunk{i}@example.com", "username": f"chunk{i}", "password": "p" * 8})
+        + "\n"
+        for i in range(5)
+    ) + "{broken\n"
+
+    async def chunks() -> AsyncIterator[bytes]:
+        data = body.encode()
+        for start in range(0, len(data), 7):
+            yield data[start : start + 7]
+
+    response = await client.post(
+        "/api/v1/admin/users/import", content=chunks(), headers=ADMIN_HEADERS
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "imported": 5,
+        "errors": [{"row": 6, "email": None, "error": "Invalid JSON"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_import_users_reports_unterminated_csv_quote(client: AsyncClient) -> None:
+    """Test a quoted field left open at the end of the file is reported, not dropped."""
+    body = (
+        "email,username,password\n"
+        "okay@example.com,okay,importpass123\n"
+        'open@example.com,"open,importpass123\n'
+        "late@example.com,late,importpass123\n"
+    )
+
+    response = await client.post(
+        "/api/v1/admin/users/import",
+        params={"format": "csv"},
+        content=body,
+        headers=ADMIN_HEADERS,
+    )
+
+    assert response.json() == {
+        "imported": 1,
+        "errors": [{"row": 2, "email": None, "error": "Unterminated quoted field"}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_import_users_commits_each_batch(
+    client: AsyncClient, caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test imports commit and report progress batch by batch."""
+    monkeypatch.setattr(get_settings(), "bulk_import_batch_size", 2)
+    body = "".join(
+        json.dumps({"email": f"batch{i}@example.com", "username": f"batch{i}", "password": "p" * 8})
+        + "\n"
+        for i in range(5)
+    )
+
+    with caplog.at_level(logging.INFO, logger="src.presentation.api.routers.admin"):
+        response = await client.post(
+            "/api/v1/admin/users/import", content=body, headers=ADMIN_HEADERS
+        )
+
+    assert response.json() == {"imported": 5, "errors": []}
+    assert [record.getMessage() for record in caplog.records] == [
+        "User import batch 1 committed: 2 imported, 0 skipped up to row 2",
+        "User import batch 2 committed: 4 imported, 0 skipped up to row 4",
+        "User import batch 3 committed: 5 imported, 0 skipped up to row 5",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_users_prefix_then_substring(client: AsyncClient) -> None:
+    """Test prefix matches come before substring matches, case-insensitively."""
+    for email, username in (
+        ("carol@example.com", "carol"),
+        ("dave@example.com", "caroline_fan"),
+        ("erin@example.com", "mccarol"),
+        ("frank@example.com", "frank"),
+    ):
+        response = await client.post(
+            "/api/v1/auth/register",
+            json={"email": email, "username": username, "password": "testpassword123"},
+        )
+        assert response.status_code == 201
+
+    response = await client.get(
+        "/api/v1/admin/users/search", params={"q": "CAROL"}, headers=ADMIN_HEADERS
+    )
+    assert response.status_code == 200
+    assert [user["username"] for user in response.json()] == ["carol", "caroline_fan", "mccarol"]
+
+    short = await client.get(
+        "/api/v1/admin/users/search", params={"q": "ca"}, headers=ADMIN_HEADERS
+    )
+    assert [user["username"] for user in short.json()] == ["carol", "caroline_fan"]
+
+    escaped = await client.get(
+        "/api/v1/admin/users/search", params={"q": "_", "limit": 5}, headers=ADMIN_HEADERS
+    )
+    assert escaped.json() == []  # "_" is matched literally, not as a wildcard
+
+
+@pytest.mark.asyncio
+async def test_memory_snapshots_diff_by_allocation_site(
+    client: AsyncClient, auth_headers: dict
+) -> None:
+    """Test tracing, snapshotting and diffing find where memory grew."""
+    get_prime_sieve.cache_clear()
+    assert (await client.get("/api/v1/admin/memory")).status_code == 403
+    report = (await client.get("/api/v1/admin/memory", headers=ADMIN_HEADERS)).json()
+    assert report["tracing"] is False
+    assert report["rss_bytes"] > 0
+    assert [generation["generation"] for generation in report["gc"]] == [0, 1, 2]
+    not_tracing = await client.post("/api/v1/admin/memory/snapshots", headers=ADMIN_HEADERS)
+    assert not_tracing.status_code == 409
+
+    started = await client.post(
+        "/api/v1/admin/memory/tracing", json={"frames": 5}, headers=ADMIN_HEADERS
+    )
+    assert started.json()["tracing"] is True
+    try:
+        first = await client.post("/api/v1/admin/memory/snapshots", headers=ADMIN_HEADERS)
+        primes = await client.post(
+            "/api/v1/math/primes-list", json={"limit": 200_000}, headers=auth_headers
+        )
+        assert primes.status_code == 200
+        second = await client.post("/api/v1/admin/memory/snapshots", headers=ADMIN_HEADERS)
+        assert first.status_code == second.status_code == 201
+
+        diff = await client.get(
+            f"/api/v1/admin/memory/snapshots/{second.json()['id']}/diff",
+            params={"limit": 5},
+            headers=ADMIN_HEADERS,
+        )
+        report = (await client.get("/api/v1/admin/memory", headers=ADMIN_HEADERS)).json()
+    finally:
+        stopped = await client.delete("/api/v1/admin/memory/tracing", headers=ADMIN_HEADERS)
+
+    assert diff.status_code == 200
+    data = diff.json()
+    assert data["base_id"] == first.json()["id"]
+    assert len(data["sites"]) == 5
+    # The cached prime table is the largest allocation made in between
+    assert "math_operations.py" in data["sites"][0]["site"]
+    assert data["sites"][0]["size_diff_bytes"] > 0
+    assert report["caches"]["prime_sieve"]["entries"] >= 17984
+    assert stopped.json()["tracing"] is False
+    listed = await client.get("/api/v1/admin/memory/snapshots", headers=ADMIN_HEADERS)
+    assert listed.json() == []
@@ -1,7 +1,21 @@
 """Tests for authentication endpoints."""
 
+import asyncio
+from types import SimpleNamespace
+
+import bcrypt
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from src.infrastructure.config import get_settings
+from src.infrastructure.db.models.user import UserModel
+from src.infrastructure.external import login_throttle
+from src.infrastructure.external.login_throttle import LoginThrottle
+from src.infrastructure.external.password_hasher import PasswordHasher
+from src.presentation.api.dependencies.client_ip import get_client_ip
 
 
 @pytest.mark.asyncio
@@ -39,6 +53,24 @@ async def test_register_duplicate_email(client: AsyncClient) -> None:
     assert response.status_code == 409
 
 
+@pytest.mark.asyncio
+async def test_register_duplicate_username(client: AsyncClient) -> None:
+    """Test registration with duplicate username fails."""
+    user_data = {
+        "email": "first@example.com",
+        "username": "sameuser",
+        "password": "securepassword123",
+    }
+    response = await client.post("/api/v1/auth/register", json=user_data)
+    assert response.status_code == 201
+
+    user_data["email"] = "second@example.com"
+    response = await client.post("/api/v1/auth/register", json=user_data)
+
+    assert response.status_code == 409
+    assert "sameuser" in response.json()["detail"]
+
+
 @pytest.mark.asyncio
 async def test_login_success(client: AsyncClient, registered_user: dict) -> None:
     """Test successful login."""
@@ -54,6 +86,43 @@ async def test_login_success(client: AsyncClient, registered_user: dict) -> None
     assert "refresh_token" in data
 
 
+@pytest.mark.asyncio
+async def test_login_keeps_hash_of_higher_cost(
+    client: AsyncClient, registered_user: dict, test_session: AsyncSession
+) -> None:
+    """Test login never rehashes a stored hash down to a lower cost factor."""
+    old_hash = bcrypt.hashpw(
+        registered_user["password"].encode(), bcrypt.gensalt(rounds=5)
+    ).decode()
+    await test_session.execute(
+        update(UserModel)
+        .where(UserModel.email == registered_user["email"])
+        .values(hashed_password=old_hash)
+    )
+    await test_session.commit()
+
+    login_data = {
+        "email": registered_user["email"],
+        "password": registered_user["password"],
+    }
+    response = await client.post("/api/v1/auth/login", json=login_data)
+    assert response.status_code == 200
+
+    stored_hash = await test_session.scalar(
+        select(UserModel.hashed_password).where(UserModel.email == registered_user["email"])
+    )
+    assert stored_hash == old_hash
+
+
+def test_needs_rehash_only_below_target_cost() -> None:
+    """Test hashes below the target cost are upgraded and stronger ones kept."""
+    hasher = PasswordHasher(rounds=5)
+
+    assert hasher.needs_rehash(bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=4)).decode())
+    assert not hasher.needs_rehash(bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=5)).decode())
+    assert not hasher.needs_rehash(bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=6)).decode())
+
+
 @pytest.mark.asyncio
 async def test_login_invalid_credentials(client: AsyncClient) -> None:
     """Test login with invalid credentials fails."""
@@ -66,6 +135,75 @@ async def test_login_invalid_credentials(client: AsyncClient) -> None:
     assert response.status_code == 401
 
 
+@pytest.mark.asyncio
+async def test_login_throttled_after_failures(client: AsyncClient, registered_user: dict) -> None:
+    """Test repeated failed logins are rejected with Retry-After."""
+    login_data = {"email": registered_user["email"], "password": "wrongpassword"}
+    for _ in range(5):
+        response = await client.post("/api/v1/auth/login", json=login_data)
+        assert response.status_code == 401
+
+    # Even the correct password is rejected while throttled
+    login_data["password"] = registered_user["password"]
+    response = await client.post("/api/v1/auth/login", json=login_data)
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+
+@pytest.mark.asyncio
+async def test_login_throttle_holds_under_concurrent_burst(
+    client: AsyncClient, registered_user: dict
+) -> None:
+    """Test concurrent failed logins cannot all pass the throttle before one is counted."""
+    login_data = {"email": registered_user["email"], "password": "wrongpassword"}
+    responses = await asyncio.gather(
+        *(client.post("/api/v1/auth/login", json=login_data) for _ in range(10))
+    )
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [401] * 5 + [429] * 5
+
+
+@pytest.mark.asyncio
+async def test_login_success_refunds_only_its_own_attempt(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a successful login takes back its own IP hit, not a concurrent failure."""
+    clock = SimpleNamespace(time=lambda: 1000.0)
+    monkeypatch.setattr(login_throttle, "time", clock)
+    throttle = LoginThrottle(300, 5, 3)
+
+    succeeded = await throttle.attempt("alice@example.com", "10.0.0.1")
+    clock.time = lambda: 1100.0
+    await throttle.attempt("bob@example.com", "10.0.0.1")
+    clock.time = lambda: 1200.0
+    await throttle.attempt("carol@example.com", "10.0.0.1")
+    await throttle.reset("alice@example.com", "10.0.0.1", succeeded.attempt_id)
+
+    clock.time = lambda: 1250.0
+    assert (await throttle.attempt("dave@example.com", "10.0.0.1")).retry_after is None
+    clock.time = lambda: 1260.0
+    # The IP window now starts with bob's attempt, which expires at 1400
+    assert (await throttle.attempt("erin@example.com", "10.0.0.1")).retry_after == 140
+
+
+def _request(peer: str, forwarded_for: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "client": (peer, 1234), "headers": headers})
+
+
+@pytest.mark.asyncio
+async def test_client_ip_resolved_behind_trusted_proxies(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test X-Forwarded-For is read right to left, only from trusted proxies."""
+    monkeypatch.setattr(get_settings(), "trusted_proxies", ["10.0.0.0/8", "192.0.2.1"])
+
+    # The client cannot pick its IP by prepending to the header
+    request = _request("10.0.0.5", "6.6.6.6, 203.0.113.7, 192.0.2.1")
+    assert await get_client_ip(request) == "203.0.113.7"
+    # The header of an untrusted peer is ignored
+    assert await get_client_ip(_request("203.0.113.9", "6.6.6.6")) == "203.0.113.9"
+    assert await get_client_ip(_request("10.0.0.5")) == "10.0.0.5"
+
+
 @pytest.mark.asyncio
 async def test_refresh_token(client: AsyncClient, registered_user: dict) -> None:
     """Test token refresh."""
@@ -80,6 +218,39 @@ async def test_refresh_token(client: AsyncClient, registered_user: dict) -> None
     assert "refresh_token" in data
 
 
+@pytest.mark.asyncio
+async def test_refresh_token_reuse_revokes_family(
+    client: AsyncClient, registered_user: dict
+) -> None:
+    """Test a reused refresh token is rejected and kills its rotated successor."""
+    old_token = {"refresh_token": registered_user["refresh_token"]}
+    response = await client.post("/api/v1/auth/refresh", json=old_token)
+    assert response.status_code == 200
+    new_token = {"refresh_token": response.json()["refresh_token"]}
+
+    response = await client.post("/api/v1/auth/refresh", json=old_token)
+    assert response.status_code == 401
+
+    response = await client.post("/api/v1/auth/refresh", json=new_token)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_tokens(
+    client: AsyncClient, registered_user: dict, auth_headers: dict
+) -> None:
+    """Test logout revokes both the refresh and access tokens of the session."""
+    refresh_data = {"refresh_token": registered_user["refresh_token"]}
+    response = await client.post("/api/v1/auth/logout", json=refresh_data)
+    assert response.status_code == 204
+
+    response = await client.post("/api/v1/auth/refresh", json=refresh_data)
+    assert response.status_code == 401
+
+    response = await client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.status_code == 401
+
+
 @pytest.mark.asyncio
 async def test_get_me(client: AsyncClient, registered_user: dict, auth_headers: dict) -> None:
     """Test get current user endpoint."""
@@ -100,3 +271,29 @@ async def test_get_me_unauthorized(client: AsyncClient) -> None:
 
     assert response.status_code == 403
 
+
+@pytest.mark.asyncio
+async def test_introspect_tokens(client: AsyncClient, registered_user: dict) -> None:
+    """Test batch introspection reports each token's validity and user."""
+    tokens = [registered_user["access_token"], "not-a-token", registered_user["refresh_token"]]
+    response = await client.post(
+        "/api/v1/auth/introspect",
+        json={"tokens": tokens},
+        headers={"X-Service-Key": "test-service-key"},
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["active"] for r in results] == [True, False, True]
+    assert results[0]["type"] == "access"
+    assert results[0]["username"] == registered_user["username"]
+    assert results[2]["type"] == "refresh"
+    assert results[1]["error"]
+
+
+@pytest.mark.asyncio
+async def test_introspect_requires_service_key(client: AsyncClient) -> None:
+    """Test introspection rejects callers without the service key."""
+    response = await client.post("/api/v1/auth/introspect", json={"tokens": ["x"]})
+
+    assert response.status_code == 403
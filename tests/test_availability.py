@@ -0,0 +1,76 @@
+"""Tests for the email/username availability check."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.application.use_cases.auth import CheckAvailabilityUseCase
+from src.domain.models.user import User
+from src.infrastructure.db.query_stats import track_queries
+from src.infrastructure.db.repositories.user import UserRepository
+from src.infrastructure.external.availability_filter import UserAvailabilityFilter
+
+
+@pytest.mark.asyncio
+async def test_availability_endpoint(client: AsyncClient, registered_user: dict) -> None:
+    """Test taken and free emails and usernames are told apart."""
+    response = await client.get(
+        "/api/v1/auth/availability",
+        params={"email": registered_user["email"], "username": "someone_else"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"email": False, "username": True}
+
+    response = await client.get(
+        "/api/v1/auth/availability", params={"username": registered_user["username"]}
+    )
+    assert response.json() == {"email": None, "username": False}
+
+    response = await client.get("/api/v1/auth/availability")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_free_values_need_no_query_once_built(
+    test_session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test only probable hits reach the database after the filter is built."""
+    repository = UserRepository(test_session)
+    await repository.create_unique(
+        User(email="taken@example.com", username="taken", hashed_password="x")
+    )
+    await test_session.commit()
+
+    availability_filter = UserAvailabilityFilter(None, capacity=1000)
+    use_case = CheckAvailabilityUseCase(repository, availability_filter)
+    with track_queries("before build") as stats:
+        assert (await use_case.execute(email="free@example.com")).email is True
+    assert stats.count == 1
+
+    await availability_filter.build(session_factory)
+    await availability_filter.add("new@example.com", "new")
+
+    with track_queries("free") as stats:
+        result = await use_case.execute(email="free@example.com", username="free")
+    assert (result.email, result.username) == (True, True)
+    assert stats.count == 0
+
+    with track_queries("taken") as stats:
+        result = await use_case.execute(email="taken@example.com", username="new")
+    assert (result.email, result.username) == (False, True)
+    assert stats.count == 2
+
+
+@pytest.mark.asyncio
+async def test_build_counts_users_added_during_the_scan(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Test entries merged into a rebuilt filter are counted."""
+    availability_filter = UserAvailabilityFilter(None, capacity=1000)
+    await availability_filter.add_many([(f"u{i}@example.com", f"u{i}") for i in range(50)])
+
+    await availability_filter.build(session_factory)
+
+    assert "email:u7@example.com" in availability_filter.bloom
+    assert 95 <= availability_filter.bloom.count <= 105
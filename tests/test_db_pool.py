@@ -0,0 +1,139 @@
+"""Tests for connection pool configuration and telemetry."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.infrastructure.config import Settings
+from src.infrastructure.db.models.base import Base
+from src.infrastructure.db.models.user import UserModel
+from src.infrastructure.db.pool import (
+    POOL_CHECKOUT_TIMEOUTS,
+    POOL_CHECKOUT_WAIT,
+    POOL_CONNECTION_LIFETIME,
+    POOL_CONNECTS,
+    POOL_IN_USE,
+    InstrumentedAsyncQueuePool,
+    engine_options,
+    instrument_engine,
+)
+from src.infrastructure.db.routing import is_pinned_to_primary
+from src.infrastructure.db.sqlite import (
+    SQLiteSplitSession,
+    create_sqlite_engines,
+    is_sqlite_file,
+)
+from src.infrastructure.metrics import registry
+
+
+def test_engine_options_pgbouncer_mode() -> None:
+    """Test PgBouncer mode disables prepared statement caching for asyncpg."""
+    url = "postgresql+asyncpg://u:p@localhost/db"
+    settings = Settings(db_pool_size=3, db_max_overflow=0, db_pgbouncer_mode=True)
+
+    options = engine_options(settings, url, "primary")
+
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (3, 0)
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert options["connect_args"]["prepared_statement_cache_size"] == 0
+    name_func = options["connect_args"]["prepared_statement_name_func"]
+    assert name_func() != name_func()
+    assert "poolclass" not in engine_options(settings, "sqlite+aiosqlite:///x.db", "primary")
+
+
+@pytest.mark.asyncio
+async def test_pool_telemetry(tmp_path: Path) -> None:
+    """Test checkout waits, timeouts, usage and connection lifetimes are recorded."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name="test",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    instrument_engine(engine, "test")
+    waits_before = POOL_CHECKOUT_WAIT.value(pool="test")
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert POOL_IN_USE.value(pool="test") == 1
+
+        with pytest.raises(PoolTimeoutError):
+            async with engine.connect() as blocked:
+                await blocked.execute(text("SELECT 1"))
+
+    await asyncio.sleep(0)
+    assert POOL_IN_USE.value(pool="test") == 0
+    assert POOL_CHECKOUT_WAIT.value(pool="test") - waits_before == 2
+    assert POOL_CHECKOUT_TIMEOUTS.value(pool="test") >= 1
+    assert POOL_CONNECTS.value(pool="test") >= 1
+
+    lifetimes_before = POOL_CONNECTION_LIFETIME.value(pool="test")
+    await engine.dispose()
+    assert POOL_CONNECTION_LIFETIME.value(pool="test") - lifetimes_before == 1
+    assert 'db_pool_checkout_wait_seconds_bucket{pool="test",le="+Inf"}' in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_profile_engines(tmp_path: Path) -> None:
+    """Test the SQLite profile tunes connections, serializes writers and guards readers."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'app.db'}"
+    settings = Settings(sqlite_reader_pool_size=2, sqlite_busy_timeout_ms=1234)
+    assert is_sqlite_file(url)
+    assert not is_sqlite_file("sqlite+aiosqlite:///:memory:")
+    writer, reader = create_sqlite_engines(settings, url)
+    try:
+        assert writer.sync_engine.pool.size() == 1
+        async with writer.begin() as conn:
+            assert (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar() == "wal"
+            assert (await conn.exec_driver_sql("PRAGMA busy_timeout")).scalar() == 1234
+            assert (await conn.exec_driver_sql("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            await conn.exec_driver_sql("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+            await conn.exec_driver_sql("INSERT INTO items VALUES (1)")
+
+        async with reader.connect() as conn:
+            assert (await conn.exec_driver_sql("SELECT count(*) FROM items")).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                await conn.exec_driver_sql("INSERT INTO items VALUES (2)")
+    finally:
+        await writer.dispose()
+        await reader.dispose()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_split_session_routes_reads_until_first_write(tmp_path: Path) -> None:
+    """Test sessions read from the reader pool and switch to the writer for good on a write."""
+    writer, reader = create_sqlite_engines(Settings(), f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(
+        sync_session_class=SQLiteSplitSession,
+        info={"sqlite_writer": writer, "sqlite_reader": reader},
+        expire_on_commit=False,
+    )
+
+    async def in_request() -> None:
+        async with factory() as session:
+            assert await session.scalar(select(func.count(UserModel.id))) == 0
+            assert POOL_IN_USE.value(pool="primary") == 0
+
+            session.add(UserModel(email="w@example.com", username="w", hashed_password="x"))
+            await session.flush()
+            assert POOL_IN_USE.value(pool="primary") == 1
+            assert await session.scalar(select(func.count(UserModel.id))) == 1
+            await session.commit()
+
+    try:
+        # Each request runs in its own context, like under ASGI
+        await asyncio.create_task(in_request())
+        assert not is_pinned_to_primary()
+    finally:
+        await writer.dispose()
+        await reader.dispose()
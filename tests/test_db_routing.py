@@ -0,0 +1,112 @@
+"""Tests for read-replica routing."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.infrastructure.db.models.base import Base
+from src.infrastructure.db.models.user import UserModel
+from src.infrastructure.db.repositories.user import UserRepository
+from src.infrastructure.db.routing import (
+    ReplicaRouter,
+    RoutingSession,
+    is_pinned_to_primary,
+    pin_to_primary,
+)
+from src.infrastructure.db.session import ReadOnlyAsyncSession
+
+_NAMES = ("primary", "replica1", "replica2")
+
+
+@pytest.fixture
+async def engines(tmp_path: Path) -> AsyncGenerator[dict[str, AsyncEngine], None]:
+    """One SQLite database per role, each holding a user named after it."""
+    engines = {}
+    for name in _NAMES:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                UserModel.__table__.insert().values(
+                    email=f"{name}@example.com", username=name, hashed_password="x"
+                )
+            )
+        engines[name] = engine
+    yield engines
+    for engine in engines.values():
+        await engine.dispose()
+
+
+def _session_factory(router: ReplicaRouter) -> async_sessionmaker[ReadOnlyAsyncSession]:
+    return async_sessionmaker(
+        router.primary,
+        class_=ReadOnlyAsyncSession,
+        sync_session_class=RoutingSession,
+        info={"read_router": router},
+        expire_on_commit=False,
+    )
+
+
+async def _served_by(factory: async_sessionmaker[ReadOnlyAsyncSession]) -> str:
+    async with factory() as session:
+        return await session.scalar(select(UserModel.username))
+
+
+@pytest.mark.asyncio
+async def test_reads_round_robin_over_replicas(engines: dict[str, AsyncEngine]) -> None:
+    """Test reads alternate between replicas and pinned requests use the primary."""
+    router = ReplicaRouter(
+        engines["primary"], [engines["replica1"], engines["replica2"]], retry_seconds=30
+    )
+    factory = _session_factory(router)
+
+    assert [await _served_by(factory) for _ in range(4)] == [
+        "replica1",
+        "replica2",
+        "replica1",
+        "replica2",
+    ]
+
+    async def pinned_request() -> str:
+        pin_to_primary()
+        return await _served_by(factory)
+
+    assert await asyncio.create_task(pinned_request()) == "primary"
+    assert not is_pinned_to_primary()
+
+
+@pytest.mark.asyncio
+async def test_failed_replica_falls_back_to_primary(
+    engines: dict[str, AsyncEngine], tmp_path: Path
+) -> None:
+    """Test a failing replica is retried on the primary and taken out of rotation."""
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'db.db'}")
+    router = ReplicaRouter(engines["primary"], [broken, engines["replica1"]], retry_seconds=30)
+    factory = _session_factory(router)
+
+    try:
+        assert await _served_by(factory) == "primary"
+        assert [await _served_by(factory) for _ in range(2)] == ["replica1", "replica1"]
+    finally:
+        await broken.dispose()
+
+
+@pytest.mark.asyncio
+async def test_write_statement_pins_request(test_session: AsyncSession) -> None:
+    """Test executing a write through a session pins the request to the primary."""
+
+    async def write_request() -> bool:
+        await UserRepository(test_session).update_password(1, "x")
+        return is_pinned_to_primary()
+
+    assert await asyncio.create_task(write_request()) is True
+    assert not is_pinned_to_primary()
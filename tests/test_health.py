@@ -24,3 +24,13 @@ async def test_health_check(client: AsyncClient) -> None:
     assert response.status_code == 200
     assert response.json() == {"status": "healthy"}
 
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("registered_user")
+async def test_metrics(client: AsyncClient) -> None:
+    """Test metrics endpoint exposes the selected bcrypt cost."""
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "bcrypt_rounds 4" in response.text
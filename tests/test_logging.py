@@ -0,0 +1,105 @@
+"""Tests for structured, queued logging and the access log."""
+
+import io
+import json
+import logging
+import queue
+from collections.abc import Iterator
+
+import pytest
+from httpx import AsyncClient
+
+from src.infrastructure.config import get_settings
+from src.infrastructure.structured_logging import (
+    LOG_RECORDS_DROPPED,
+    DroppingQueueHandler,
+    configure_logging,
+    log_request,
+    stop_logging,
+)
+
+
+@pytest.fixture
+def log_output(monkeypatch: pytest.MonkeyPatch) -> Iterator[io.StringIO]:
+    """Route logging through the queue into a buffer; restore the root logger after."""
+    monkeypatch.setitem(get_settings().log_access_sample_rates, "/health", 0.0)
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    output = io.StringIO()
+    listener = configure_logging(get_settings(), stream=output)
+    try:
+        yield output
+    finally:
+        stop_logging(listener)
+        root.handlers[:] = handlers
+        root.setLevel(level)
+
+
+def _logged(output: io.StringIO, logger: str) -> list[dict]:
+    """Records of one logger written so far, once the writer has caught up."""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            handler.queue.join()
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    return [record for record in records if record["logger"] == logger]
+
+
+@pytest.mark.asyncio
+async def test_access_records_carry_request_details(
+    client: AsyncClient, auth_headers: dict, log_output: io.StringIO
+) -> None:
+    """Test access records carry request ID, route, status, timings and user."""
+    me = await client.get("/api/v1/auth/me", headers={**auth_headers, "X-Request-ID": "req-42"})
+    other = await client.post("/api/v1/math/primes-list", json={"limit": 10})
+    # Sampled at 0: successful health checks are never logged
+    await client.get("/health")
+
+    assert me.headers["x-request-id"] == "req-42"
+    assert len(other.headers["x-request-id"]) == 32
+    [record, anonymous] = _logged(log_output, "access")
+    assert record["request_id"] == "req-42"
+    assert record["route"] == "/api/v1/auth/me"
+    assert record["status"] == 200
+    assert record["user_id"] == me.json()["id"]
+    assert record["db_queries"] >= 1
+    assert record["db_time_ms"] > 0
+    assert record["latency_ms"] >= record["db_time_ms"]
+    assert anonymous["route"] == "/api/v1/math/primes-list"
+    assert anonymous["status"] == 401
+    assert anonymous["user_id"] is None
+
+
+def test_application_records_are_json_with_request_id(log_output: io.StringIO) -> None:
+    """Test application logs carry extra fields, tracebacks and the current request ID."""
+    logger = logging.getLogger("tests.logging")
+    with log_request("abc"):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Failed for %s", "alice", extra={"attempt": 2})
+    logger.info("Outside")
+    record, outside = _logged(log_output, "tests.logging")
+
+    assert record["message"] == "Failed for alice"
+    assert record["level"] == "ERROR"
+    assert record["request_id"] == "abc"
+    assert record["attempt"] == 2
+    assert "ValueError: boom" in record["exc_info"]
+    assert outside["request_id"] == "-"
+
+
+def test_full_queue_drops_instead_of_blocking() -> None:
+    """Test records beyond the queue size are counted and dropped."""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    logger = logging.getLogger("tests.logging.dropping")
+    logger.addHandler(handler)
+    logger.propagate = False
+    before = LOG_RECORDS_DROPPED.value()
+    try:
+        for i in range(5):
+            logger.warning("record %d", i)
+    finally:
+        logger.removeHandler(handler)
+
+    assert handler.queue.qsize() == 2
+    assert LOG_RECORDS_DROPPED.value() - before == 3
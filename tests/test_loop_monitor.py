@@ -0,0 +1,69 @@
+"""Tests for the event-loop lag monitor."""
+
+import asyncio
+import logging
+import sys
+import time
+
+import pytest
+
+from src.infrastructure.loop_monitor import (
+    _PROJECT_ROOT,
+    LOOP_BLOCKS,
+    LOOP_LAG,
+    EventLoopMonitor,
+    blocking_site,
+)
+
+SITE = "tests/test_loop_monitor.py:_hold_loop"
+
+
+def _hold_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_monitor_reports_blocking_call_once(caplog: pytest.LogCaptureFixture) -> None:
+    """Test a call holding the loop is logged with its stack and counted once."""
+    monitor = EventLoopMonitor(interval=0.01, threshold=0.05)
+    lag_before = LOOP_LAG.value()
+    blocks_before = LOOP_BLOCKS.value(site=SITE)
+
+    with caplog.at_level(logging.WARNING, logger="src.infrastructure.loop_monitor"):
+        monitor.start()
+        await asyncio.sleep(0.03)
+        _hold_loop(0.3)
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+    assert LOOP_BLOCKS.value(site=SITE) - blocks_before == 1
+    assert LOOP_LAG.value() - lag_before >= 3
+    assert LOOP_LAG.sum() >= 0.2
+    [record] = [r for r in caplog.records if "Event loop blocked" in r.getMessage()]
+    message = record.getMessage()
+    assert f"by {SITE} in tests/test_loop_monitor.py:test_monitor_reports" in message
+    assert "time.sleep(seconds)" in message
+
+
+@pytest.mark.asyncio
+async def test_monitor_stays_quiet_while_loop_is_free(caplog: pytest.LogCaptureFixture) -> None:
+    """Test awaiting code never counts as blocking."""
+    monitor = EventLoopMonitor(interval=0.01, threshold=0.05)
+
+    with caplog.at_level(logging.WARNING, logger="src.infrastructure.loop_monitor"):
+        monitor.start()
+        await asyncio.sleep(0.2)
+        await monitor.stop()
+
+    assert not caplog.records
+
+
+def test_blocking_site_outside_the_project_root() -> None:
+    """Test frames of a directory merely prefixed by the project root still get a site."""
+    sibling = f"{_PROJECT_ROOT}-other/worker.py"
+    namespace: dict = {"sys": sys}
+    exec(compile("def here():\n    return sys._getframe()\n", sibling, "exec"), namespace)
+
+    site, _ = blocking_site(namespace["here"]())
+
+    assert site == f"{sibling}:here"
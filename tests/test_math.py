@@ -3,6 +3,8 @@
 import pytest
 from httpx import AsyncClient
 
+from src.domain.models.math_operations import PrimeSieve, primes_up_to
+
 
 @pytest.mark.asyncio
 async def test_primes_list_success(client: AsyncClient, auth_headers: dict) -> None:
@@ -57,3 +59,27 @@ async def test_primes_list_unauthorized(client: AsyncClient) -> None:
     )
 
     assert response.status_code == 403
+
+
+def test_prime_sieve_answers_lower_limits_from_cache() -> None:
+    """Test the sieve keeps its largest result within the cap and slices it for lower limits."""
+    sieve = PrimeSieve(max_cached_limit=1000)
+
+    assert sieve.primes_up_to(500) == primes_up_to(500)
+    assert sieve.limit == 500
+    assert sieve.primes_up_to(97) == primes_up_to(97)
+    assert sieve.primes_up_to(1) == []
+    assert sieve.primes_up_to(2000) == primes_up_to(2000)
+    assert sieve.limit == 500
+    with pytest.raises(ValueError):
+        sieve.primes_up_to(0)
+
+
+def test_prime_sieve_results_do_not_share_the_cache() -> None:
+    """Test changing a returned list leaves the cached primes intact."""
+    sieve = PrimeSieve(max_cached_limit=1000)
+
+    sieve.primes_up_to(100).append(101)
+    sieve.primes_up_to(100).clear()
+
+    assert sieve.primes_up_to(100) == primes_up_to(100)
@@ -0,0 +1,93 @@
+"""Tests for HTTP, timing and multiprocess metrics."""
+
+import os
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from src.infrastructure.metrics import MetricsRegistry, MultiprocessCollector, merge_snapshots
+from src.infrastructure.prime_cache import SIEVE_DURATION, get_prime_sieve
+from src.presentation.api.middleware.http_metrics import (
+    HTTP_IN_FLIGHT,
+    HTTP_REQUESTS,
+    HTTP_RESPONSE_SIZE,
+    UNMATCHED_ROUTE,
+)
+
+# Above the kernel's PID limit, so never a running process
+DEAD_PID = 999_999_999
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_by_route_template(
+    client: AsyncClient, auth_headers: dict
+) -> None:
+    """Test request metrics use route templates, not raw paths."""
+    route = "/api/v1/math/primes-list"
+    before = HTTP_REQUESTS.value(method="POST", route=route, status="200")
+    unmatched_before = HTTP_REQUESTS.value(method="GET", route=UNMATCHED_ROUTE, status="404")
+    sieve_before = SIEVE_DURATION.value(limit_bucket="1e5", source="sieve")
+    get_prime_sieve.cache_clear()
+
+    response = await client.post(route, json={"limit": 12345}, headers=auth_headers)
+    assert response.status_code == 200
+    assert (await client.get("/no/such/path/42")).status_code == 404
+
+    assert HTTP_REQUESTS.value(method="POST", route=route, status="200") - before == 1
+    unmatched = HTTP_REQUESTS.value(method="GET", route=UNMATCHED_ROUTE, status="404")
+    assert unmatched - unmatched_before == 1
+    assert HTTP_RESPONSE_SIZE.sum(method="POST", route=route) >= len(response.content)
+    assert HTTP_IN_FLIGHT.value(method="POST") == 0
+    assert SIEVE_DURATION.value(limit_bucket="1e5", source="sieve") - sieve_before == 1
+
+    text = (await client.get("/metrics")).text
+    assert f'http_request_duration_seconds_bucket{{method="POST",route="{route}"' in text
+    assert 'bcrypt_duration_seconds_count{operation="hash"}' in text
+    assert 'jwt_duration_seconds_count{operation="decode"}' in text
+    assert "/no/such/path" not in text
+
+
+def test_merge_sums_totals_and_keeps_only_live_gauges() -> None:
+    """Test counters and histograms add up over all processes, gauges over running ones."""
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ["route"])
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    in_flight = registry.gauge("in_flight", "In flight", multiprocess_mode="sum")
+    rounds = registry.gauge("rounds", "Rounds")
+    requests.inc(route="/a")
+    latency.observe(0.05)
+    in_flight.set(2)
+    rounds.set(12)
+    mine = registry.snapshot()
+
+    requests.inc(2, route="/a")
+    latency.observe(5.0)
+    in_flight.set(7)
+    dead = registry.snapshot()
+
+    metrics = merge_snapshots({os.getpid(): mine, DEAD_PID: dead})
+    merged = {metric.name: metric for metric in metrics}
+
+    assert merged["requests_total"].value(route="/a") == 4
+    assert merged["latency_seconds"].value() == 3
+    assert merged["latency_seconds"].sum() == pytest.approx(5.1)
+    assert merged["in_flight"].value() == 2
+    assert merged["rounds"].value(pid=str(os.getpid())) == 12
+    assert merged["rounds"].value(pid=str(DEAD_PID)) == 0
+
+
+def test_collector_merges_files_of_other_processes(tmp_path: Path) -> None:
+    """Test rendering combines this process's live values with other workers' files."""
+    other = MetricsRegistry()
+    other.counter("jobs_total", "Jobs").inc(3)
+    MultiprocessCollector(other, tmp_path, interval=60).write()
+    (tmp_path / f"{DEAD_PID}.json").write_text((tmp_path / f"{os.getpid()}.json").read_text())
+
+    registry = MetricsRegistry()
+    jobs = registry.counter("jobs_total", "Jobs")
+    jobs.inc()
+    rendered = MultiprocessCollector(registry, tmp_path, interval=60).render()
+
+    # The file written under this PID is superseded by the live registry
+    assert "jobs_total 4.0" in rendered
@@ -0,0 +1,94 @@
+"""Tests for on-demand request profiling."""
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.infrastructure.config import get_settings
+from src.infrastructure.profiling import AWAITING_FRAME, SamplingProfiler, get_profile_store
+from src.presentation.api.middleware.profiling import ProfilingMiddleware
+from src.presentation.main import app
+
+ADMIN_HEADERS = {"X-Admin-Key": "test-admin-key"}
+
+
+def _spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_sampler_sees_only_its_task() -> None:
+    """Test samples cover the profiled task's CPU and waits, not other tasks."""
+
+    async def neighbour() -> None:
+        for _ in range(10):
+            _spin(0.01)
+            await asyncio.sleep(0)
+
+    async def profiled() -> dict[tuple[str, ...], float]:
+        profiler = SamplingProfiler(0.001, 10)
+        profiler.start()
+        _spin(0.05)
+        await asyncio.sleep(0.05)
+        return profiler.stop().stacks
+
+    stacks, _ = await asyncio.gather(profiled(), neighbour())
+
+    leaves = {stack[-1] for stack in stacks}
+    assert any(leaf.startswith("_spin ") for leaf in leaves)
+    assert AWAITING_FRAME in leaves
+    assert {stack[0].split(" ")[0] for stack in stacks} == {
+        "test_sampler_sees_only_its_task.<locals>.profiled"
+    }
+    assert not any("neighbour" in frame for stack in stacks for frame in stack)
+
+
+@pytest.mark.asyncio
+async def test_profiled_request_is_stored_for_admins(
+    client: AsyncClient,
+    auth_headers: dict,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test an admin's request is profiled once per rate-limit window and downloadable."""
+    monkeypatch.setattr(get_profile_store(), "directory", tmp_path)
+    settings = get_settings().model_copy(
+        update={"profiling_interval_ms": 1.0, "profiling_max_per_minute": 1}
+    )
+    profiled_app = ProfilingMiddleware(app, settings)
+    # Above the cached sieve, so every request computes primes
+    body = {"limit": get_settings().prime_cache_max_limit + 200_000}
+
+    async with AsyncClient(transport=ASGITransport(app=profiled_app), base_url="http://test") as ac:
+        url = "/api/v1/math/primes-list"
+        response = await ac.post(
+            url, json=body, headers={**auth_headers, **ADMIN_HEADERS, "X-Profile": "speedscope"}
+        )
+        refused = await ac.post(url, json=body, headers={**auth_headers, "X-Profile": "collapsed"})
+        limited = await ac.post(
+            url, json=body, headers={**auth_headers, **ADMIN_HEADERS, "X-Profile": "collapsed"}
+        )
+
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+    assert refused.status_code == 200
+    assert refused.headers["x-profile-status"] == "forbidden"
+    assert limited.headers["x-profile-status"] == "rate-limited"
+    assert "x-profile-id" not in limited.headers
+
+    assert (await client.get(f"/api/v1/admin/profiles/{profile_id}")).status_code == 403
+    download = await client.get(f"/api/v1/admin/profiles/{profile_id}", headers=ADMIN_HEADERS)
+    assert download.status_code == 200
+    profile = download.json()["profiles"][0]
+    frames = [frame["name"] for frame in download.json()["shared"]["frames"]]
+    assert profile["name"] == f"POST {url}"
+    assert len(profile["samples"]) == len(profile["weights"]) > 0
+    assert any(frame.startswith("get_primes_list ") for frame in frames)
+
+    missing = await client.get(f"/api/v1/admin/profiles/{'0' * 32}", headers=ADMIN_HEADERS)
+    assert missing.status_code == 404
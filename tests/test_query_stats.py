@@ -0,0 +1,77 @@
+"""Tests for per-request SQL accounting."""
+
+import logging
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.config import get_settings
+from src.infrastructure.db.query_stats import statement_shape, track_queries
+from src.infrastructure.db.repositories.user import UserRepository
+
+
+@pytest.mark.asyncio
+async def test_debug_headers(
+    client: AsyncClient, auth_headers: dict[str, str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test debug mode reports the request's query count and DB time."""
+    monkeypatch.setattr(get_settings(), "debug", True)
+
+    response = await client.get("/api/v1/auth/me", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert int(response.headers["x-db-query-count"]) >= 1
+    assert float(response.headers["x-db-time-ms"]) >= 0
+
+
+@pytest.mark.asyncio
+async def test_headers_hidden_outside_debug(client: AsyncClient) -> None:
+    """Test query stats are not exposed when debug is off."""
+    response = await client.get("/health")
+
+    assert "x-db-query-count" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_repeated_statement_warning(
+    test_session: AsyncSession, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a statement repeated beyond the threshold is reported once."""
+    repository = UserRepository(test_session)
+    threshold = get_settings().db_repeated_statement_threshold
+
+    with caplog.at_level(logging.WARNING), track_queries("GET /loop") as stats:
+        for user_id in range(threshold + 5):
+            await repository.get_profile_by_id(user_id)
+
+    assert stats.count == threshold + 5
+    warnings = [r for r in caplog.records if "possible N+1" in r.getMessage()]
+    assert len(warnings) == 1
+    assert "GET /loop" in warnings[0].getMessage()
+
+
+@pytest.mark.asyncio
+async def test_slow_query_log_redacts_parameters(
+    test_session: AsyncSession,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test slow statements are logged with redacted parameters and a plan."""
+    monkeypatch.setattr(get_settings(), "db_slow_query_ms", 0)
+    monkeypatch.setattr(get_settings(), "db_slow_query_explain", True)
+
+    with caplog.at_level(logging.WARNING):
+        await UserRepository(test_session).get_credentials_by_email("secret@example.com")
+
+    message = next(r.getMessage() for r in caplog.records if "Slow query" in r.getMessage())
+    assert "secret@example.com" not in message
+    assert "params=['str']" in message
+    assert "SEARCH users" in message
+
+
+def test_statement_shape_collapses_in_lists() -> None:
+    """Test expanded IN lists of different lengths share one shape."""
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?,\n ?)") == statement_shape(
+        "SELECT * FROM t WHERE id IN (?)"
+    )
@@ -0,0 +1,318 @@
+"""Tests for hash-sharded users."""
+
+from collections.abc import AsyncGenerator
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.application.dto.activity import ActivityEventDTO, ActivityEventType
+from src.domain.exceptions import UserAlreadyExistsError
+from src.domain.models.user import User
+from src.infrastructure.db.models.base import Base
+from src.infrastructure.db.models.user import UserModel
+from src.infrastructure.db.models.user_activity import UserActivityEventModel
+from src.infrastructure.db.models.user_directory import UserDirectoryModel
+from src.infrastructure.db.query_stats import track_queries
+from src.infrastructure.db.rebalance import rebalance_users, unplaced_users
+from src.infrastructure.db.repositories.activity_event import ActivityEventRepository
+from src.infrastructure.db.repositories.sharded_user import (
+    ShardedUserRepository,
+    user_repository_for,
+)
+from src.infrastructure.db.repositories.user import UserRepository
+from src.infrastructure.db.sharding import HashRing, sharded_sessionmaker
+
+
+@pytest.fixture
+async def engines(tmp_path: Path) -> AsyncGenerator[dict[str, AsyncEngine], None]:
+    """Directory plus two user shards, each a local SQLite database."""
+    engines = {}
+    for name in ("directory", "shard0", "shard1"):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        engines[name] = engine
+    yield engines
+    for engine in engines.values():
+        await engine.dispose()
+
+
+@pytest.fixture
+def sharded_factory(engines: dict[str, AsyncEngine]) -> async_sessionmaker[AsyncSession]:
+    """Session factory spanning the directory and both shards."""
+    shards = {"shard0": engines["shard0"], "shard1": engines["shard1"]}
+    return sharded_sessionmaker(
+        engines["directory"], shards, HashRing(shards), class_=AsyncSession, expire_on_commit=False
+    )
+
+
+def test_hash_ring_moves_few_users_when_growing() -> None:
+    """Test the ring spreads IDs over all shards and a new shard takes about 1/N."""
+    ring = HashRing(["shard0", "shard1"])
+    grown = HashRing(["shard0", "shard1", "shard2"])
+    user_ids = range(1, 3001)
+
+    assert {ring.shard_for(user_id) for user_id in user_ids} == {"shard0", "shard1"}
+    moved = [user_id for user_id in user_ids if ring.shard_for(user_id) != grown.shard_for(user_id)]
+    assert all(grown.shard_for(user_id) == "shard2" for user_id in moved)
+    assert 0.15 < len(moved) / len(user_ids) < 0.5
+
+
+@pytest.mark.asyncio
+async def test_users_are_placed_by_id_hash(
+    engines: dict[str, AsyncEngine], sharded_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test each user row lands only on the shard its ID hashes to."""
+    async with sharded_factory() as session:
+        repository = user_repository_for(session)
+        assert isinstance(repository, ShardedUserRepository)
+        users = [
+            await repository.create_unique(
+                User(email=f"s{i}@example.com", username=f"s{i}", hashed_password="x")
+            )
+            for i in range(20)
+        ]
+        await session.commit()
+
+    ring = HashRing(["shard0", "shard1"])
+    for shard_id in ("shard0", "shard1"):
+        async with engines[shard_id].connect() as conn:
+            stored = set((await conn.execute(select(UserModel.id))).scalars())
+        assert stored == {user.id for user in users if ring.shard_for(user.id) == shard_id}
+        assert stored
+
+
+@pytest.mark.asyncio
+async def test_unique_lookups_use_directory_and_one_shard(
+    sharded_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Test email/username lookups issue one directory and one shard query."""
+    async with sharded_factory() as session:
+        repository = user_repository_for(session)
+        alice = await repository.create_unique(
+            User(email="alice@example.com", username="alice", hashed_password="x")
+        )
+        bob = await repository.create_unique(
+            User(email="bob@example.com", username="bob", hashed_password="x")
+        )
+        await session.commit()
+
+        with track_queries("lookup") as stats:
+            assert (await repository.get_by_email("alice@example.com")).id == alice.id
+        assert stats.count == 2
+
+        assert (await repository.get_by_username("bob")).id == bob.id
+        assert (await repository.get_credentials_by_email("bob@example.com")).id == bob.id
+        assert await repository.get_by_email("nobody@example.com") is None
+        found = await repository.get_many_by_ids([alice.id, bob.id, 999_999])
+        assert {user.id for user in found} == {alice.id, bob.id}
+
+        with pytest.raises(UserAlreadyExistsError, match="alice@example.com"):
+            await repository.create_unique(
+                User(email="alice@example.com", username="other", hashed_password="x")
+            )
+        with pytest.raises(UserAlreadyExistsError, match="'bob'"):
+            await repository.create_unique(
+                User(email="other@example.com", username="bob", hashed_password="x")
+            )
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_keep_directory_in_sync(
+    sharded_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Test renames and deletes are reflected in directory lookups."""
+    async with sharded_factory() as session:
+        repository = user_repository_for(session)
+        user = await repository.create_unique(
+            User(email="old@example.com", username="old", hashed_password="x")
+        )
+
+        await repository.update(replace(user, email="new@example.com"))
+        assert await repository.get_by_email("old@example.com") is None
+        assert (await repository.get_by_email("new@example.com")).id == user.id
+
+        assert await repository.delete(user.id) is True
+        assert await repository.get_by_username("old") is None
+        with pytest.raises(ValueError):
+            await repository.update(user)
+
+
+def test_plain_sessions_get_unsharded_repository(test_session: AsyncSession) -> None:
+    """Test sessions without a shard ring keep the single-database repository."""
+    assert type(user_repository_for(test_session)) is UserRepository
+
+
+@pytest.mark.asyncio
+async def test_listing_merges_shards_in_key_order(
+    sharded_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Test keyset pages and exports cover users from every shard."""
+    async with sharded_factory() as session:
+        repository = user_repository_for(session)
+        for i in range(7):
+            await repository.create_unique(
+                User(email=f"p{i}@example.com", username=f"p{i}", hashed_password="x")
+            )
+        await session.commit()
+
+        first = await repository.list_profiles(4)
+        rest = await repository.list_profiles(4, (first[-1].created_at, first[-1].id))
+        exported = [profile.id async for profile in repository.stream_profiles(batch_size=2)]
+
+    keys = [(profile.created_at, profile.id) for profile in first + rest]
+    assert len(keys) == 7
+    assert keys == sorted(keys)
+    assert sorted(exported) == sorted(key[1] for key in keys)
+
+
+@pytest.mark.asyncio
+async def test_import_many_places_users_and_skips_taken(
+    engines: dict[str, AsyncEngine], sharded_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test bulk imports reserve directory IDs and leave out users already present."""
+    async with sharded_factory() as session:
+        repository = user_repository_for(session)
+        await repository.create_unique(
+            User(email="taken@example.com", username="taken", hashed_password="x")
+        )
+        users = [
+            User(email=f"b{i}@example.com", username=f"b{i}", hashed_password="x")
+            for i in range(10)
+        ]
+        users.append(User(email="other@example.com", username="taken", hashed_password="x"))
+
+        inserted = await repository.import_many(users)
+        await session.commit()
+
+        assert inserted == {f"b{i}@example.com" for i in range(10)}
+        assert (await repository.get_by_email("b3@example.com")).username == "b3"
+
+    stored = 0
+    for shard_id in ("shard0", "shard1"):
+        async with engines[shard_id].connect() as conn:
+            stored += len((await conn.execute(select(UserModel.id))).all())
+    assert stored == 11
+
+
+@pytest.mark.asyncio
+async def test_import_many_releases_directory_entries_the_shard_skipped(
+    engines: dict[str, AsyncEngine], sharded_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test a user skipped on its shard does not keep its email reserved."""
+    for shard_id in ("shard0", "shard1"):
+        async with engines[shard_id].begin() as conn:
+            await conn.execute(
+                insert(UserModel).values(
+                    email="stale@example.com", username=f"stale-{shard_id}", hashed_password="x"
+                )
+            )
+
+    async with sharded_factory() as session:
+        repository = user_repository_for(session)
+        inserted = await repository.import_many(
+            [User(email="stale@example.com", username="stale", hashed_password="x")]
+        )
+        await session.commit()
+
+    assert inserted == set()
+    async with engines["directory"].connect() as conn:
+        assert (await conn.execute(select(UserDirectoryModel.id))).all() == []
+
+
+@pytest.mark.asyncio
+async def test_search_resolves_directory_matches_on_shards(
+    sharded_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Test search runs on the directory and returns profiles from every shard."""
+    async with sharded_factory() as session:
+        repository = user_repository_for(session)
+        for i in range(6):
+            await repository.create_unique(
+                User(email=f"q{i}@example.com", username=f"quinn{i}", hashed_password="x")
+            )
+        await session.commit()
+
+        found = await repository.search_profiles("quinn", 4)
+
+    assert [profile.username for profile in found] == ["quinn0", "quinn1", "quinn2", "quinn3"]
+
+
+@pytest.mark.asyncio
+async def test_activity_goes_to_directory_and_last_logins_to_shards(
+    engines: dict[str, AsyncEngine], sharded_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test activity events land on the directory and login times on owning shards."""
+    async with sharded_factory() as session:
+        repository = user_repository_for(session)
+        users = [
+            await repository.create_unique(
+                User(email=f"a{i}@example.com", username=f"a{i}", hashed_password="x")
+            )
+            for i in range(4)
+        ]
+        logged_in_at = datetime(2026, 1, 1)
+        await ActivityEventRepository(session).add_many(
+            [ActivityEventDTO(user.id, ActivityEventType.LOGIN) for user in users]
+        )
+        await repository.update_last_login_many({user.id: logged_in_at for user in users})
+        await session.commit()
+
+    ring = HashRing(["shard0", "shard1"])
+    for user in users:
+        async with engines[ring.shard_for(user.id)].connect() as conn:
+            stmt = select(UserModel.last_login_at).where(UserModel.id == user.id)
+            assert (await conn.execute(stmt)).scalar_one() == logged_in_at
+
+    async with engines["directory"].connect() as conn:
+        events = (await conn.execute(select(UserActivityEventModel.user_id))).scalars().all()
+    assert sorted(events) == sorted(user.id for user in users)
+
+
+@pytest.mark.asyncio
+async def test_rebalance_moves_unsharded_users_to_their_shards(
+    engines: dict[str, AsyncEngine], sharded_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test the cut-over moves users off the former single database and rebuilds the directory."""
+    async with engines["directory"].begin() as conn:
+        await conn.execute(
+            insert(UserModel),
+            [
+                {"id": i, "email": f"u{i}@example.com", "username": f"u{i}", "hashed_password": "x"}
+                for i in range(1, 21)
+            ],
+        )
+        # Stale seed: a deleted user still holds its email, later users are missing
+        await conn.execute(
+            insert(UserDirectoryModel),
+            [{"id": 99, "email": "gone@example.com", "username": "gone"}]
+            + [{"id": i, "email": f"u{i}@example.com", "username": f"u{i}"} for i in range(1, 6)],
+        )
+    shards = {"shard0": engines["shard0"], "shard1": engines["shard1"]}
+
+    result = await rebalance_users(engines["directory"], shards, HashRing(shards), batch_size=7)
+
+    assert (result.directory_entries, result.moved, result.conflicts) == (20, 20, 0)
+    assert await unplaced_users(engines["directory"]) == 0
+    async with sharded_factory() as session:
+        repository = user_repository_for(session)
+        credentials = await repository.get_credentials_by_email("u17@example.com")
+        assert credentials is not None and credentials.id == 17
+        assert await repository.get_by_email("gone@example.com") is None
+        created = await repository.create_unique(
+            User(email="gone@example.com", username="gone", hashed_password="x")
+        )
+        assert created.id == 21
+        await session.commit()
+
+    rerun = await rebalance_users(engines["directory"], shards, HashRing(shards))
+    assert (rerun.directory_entries, rerun.moved) == (21, 0)
@@ -0,0 +1,53 @@
+"""Tests for the application factory, warm-up and start-up latency metrics."""
+
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.infrastructure.config import Settings, get_settings
+from src.infrastructure.db.models.base import Base
+from src.infrastructure.db.session import create_database
+from src.infrastructure.warmup import WARMUP_SECONDS, warm_up
+from src.presentation.api.middleware.startup_latency import (
+    EARLY_REQUEST_DURATION,
+    TIME_TO_FIRST_REQUEST,
+)
+from src.presentation.main import create_app
+
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_pools(tmp_path: Path) -> None:
+    """Test warm-up fills the reader and writer pools and runs the configured steps."""
+    settings = Settings(
+        database_url=f"sqlite+aiosqlite:///{tmp_path / 'app.db'}",
+        sqlite_reader_pool_size=3,
+        prime_cache_warm_limit=1000,
+    )
+    database = create_database(settings)
+    async with database.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        timings = await warm_up(settings, database)
+
+        assert {"database", "queries", "tokens", "primes"} <= set(timings)
+        assert database.readonly_engine.sync_engine.pool.checkedin() == 3
+        assert database.engine.sync_engine.pool.checkedin() == 1
+        assert WARMUP_SECONDS.value(step="queries") == timings["queries"]
+    finally:
+        await database.dispose()
+
+
+@pytest.mark.asyncio
+async def test_first_requests_are_timed(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test only the first N requests after start-up are recorded."""
+    monkeypatch.setattr(get_settings(), "startup_latency_requests", 2)
+    app = create_app()
+    before = EARLY_REQUEST_DURATION.value()
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        for _ in range(3):
+            assert (await client.get("/health")).status_code == 200
+
+    assert EARLY_REQUEST_DURATION.value() - before == 2
+    assert TIME_TO_FIRST_REQUEST.value() > 0
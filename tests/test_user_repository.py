@@ -0,0 +1,160 @@
+"""Tests for the SQLAlchemy user repository."""
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.domain.exceptions import UserAlreadyExistsError
+from src.domain.models.user import User
+from src.infrastructure.db.models.user import UserModel
+from src.infrastructure.db.query_stats import track_queries
+from src.infrastructure.db.repositories.loader import LOADER_QUERIES, UserLoader
+from src.infrastructure.db.repositories.user import UserRepository
+from src.infrastructure.db.routing import is_pinned_to_primary, pin_to_primary
+from src.infrastructure.db.session import ReadOnlyAsyncSession
+
+
+@pytest.mark.asyncio
+async def test_create_unique_returns_id(test_session: AsyncSession) -> None:
+    """Test create_unique assigns an ID in a single insert."""
+    repository = UserRepository(test_session)
+
+    user = await repository.create_unique(
+        User(email="repo@example.com", username="repouser", hashed_password="x")
+    )
+
+    assert user.id is not None
+    assert (await repository.get_by_id(user.id)).email == "repo@example.com"
+
+
+@pytest.mark.asyncio
+async def test_create_unique_conflict(test_session: AsyncSession) -> None:
+    """Test create_unique maps unique violations to UserAlreadyExistsError."""
+    repository = UserRepository(test_session)
+    await repository.create_unique(
+        User(email="taken@example.com", username="taken", hashed_password="x")
+    )
+
+    with pytest.raises(UserAlreadyExistsError, match="taken@example.com"):
+        await repository.create_unique(
+            User(email="taken@example.com", username="other", hashed_password="x")
+        )
+
+    with pytest.raises(UserAlreadyExistsError, match="'taken'"):
+        await repository.create_unique(
+            User(email="other@example.com", username="taken", hashed_password="x")
+        )
+
+
+@pytest.mark.asyncio
+async def test_loader_coalesces_concurrent_lookups(
+    test_session: AsyncSession, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test concurrent lookups in one tick share a single IN query per key type."""
+    repository = UserRepository(test_session)
+    users = [
+        await repository.create_unique(
+            User(email=f"load{i}@example.com", username=f"load{i}", hashed_password="x")
+        )
+        for i in range(3)
+    ]
+    await test_session.commit()
+    loader = UserLoader(session_factory)
+    queries_before = LOADER_QUERIES.value(field="id")
+
+    ids = [users[0].id, users[1].id, users[0].id, users[2].id, 999_999]
+    results = await asyncio.gather(
+        *(loader.load("id", user_id) for user_id in ids),
+        loader.load("email", "load1@example.com"),
+    )
+
+    assert LOADER_QUERIES.value(field="id") - queries_before == 1
+    assert [r.id if r else None for r in results[:5]] == ids[:4] + [None]
+    assert results[5].username == "load1"
+    # Coalesced callers get equal but separate copies
+    assert results[0] == results[2]
+    assert results[0] is not results[2]
+
+
+@pytest.mark.asyncio
+async def test_loader_batch_runs_outside_the_callers_context(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Test a shared batch is neither counted to its first caller nor pinned by it."""
+    batch_pins: list[bool] = []
+
+    def tracking_factory() -> AsyncSession:
+        batch_pins.append(is_pinned_to_primary())
+        return session_factory()
+
+    loader = UserLoader(tracking_factory)  # type: ignore[arg-type]
+
+    async def first_caller() -> int:
+        with track_queries("first") as stats:
+            pin_to_primary()
+            await loader.load("id", 1)
+            return stats.count
+
+    async def other_caller() -> None:
+        await loader.load("id", 2)
+
+    assert await asyncio.gather(first_caller(), other_caller()) == [0, None]
+    # The pinned caller's key sends its batch to the primary
+    assert batch_pins == [True]
+
+    await other_caller()
+    assert batch_pins == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_returning(test_session: AsyncSession) -> None:
+    """Test single-statement update/delete keep their not-found semantics."""
+    repository = UserRepository(test_session)
+    users = [
+        await repository.create_unique(
+            User(email=f"bulk{i}@example.com", username=f"bulk{i}", hashed_password="x")
+        )
+        for i in range(3)
+    ]
+
+    users[0].username = "renamed"
+    updated = await repository.update(users[0])
+    assert updated.username == "renamed"
+    assert updated.updated_at is not None
+
+    with pytest.raises(ValueError):
+        await repository.update(
+            User(id=999_999, email="no@example.com", username="no", hashed_password="x")
+        )
+
+    users[1].email = "bulk1-new@example.com"
+    users[2].email = "bulk2-new@example.com"
+    updated = await repository.update_many(users[1:])
+    assert sorted(u.email for u in updated) == ["bulk1-new@example.com", "bulk2-new@example.com"]
+
+    assert await repository.delete(users[0].id) is True
+    assert await repository.delete(users[0].id) is False
+    assert sorted(await repository.delete_many([u.id for u in users])) == [users[1].id, users[2].id]
+
+
+@pytest.mark.asyncio
+async def test_readonly_session_releases_connection(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    """Test read-only sessions give the connection back after each statement."""
+    async with session_factory() as session:
+        await UserRepository(session).create_unique(
+            User(email="ro@example.com", username="ro", hashed_password="x")
+        )
+        await session.commit()
+
+    readonly_session = ReadOnlyAsyncSession(bind=session_factory.kw["bind"])
+    user = await UserRepository(readonly_session).get_by_email("ro@example.com")
+
+    assert user.username == "ro"
+    assert not readonly_session.in_transaction()
+    readonly_session.add(UserModel(email="x@example.com", username="x", hashed_password="x"))
+    with pytest.raises(RuntimeError):
+        await readonly_session.flush()
+    await readonly_session.close()